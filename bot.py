@@ -15,6 +15,7 @@ import time
 import re
 import sys
 import signal
+from collections import OrderedDict
 from datetime import datetime
 from pyrogram import Client, filters, idle, ContinuePropagation
 from pyrogram.types import (Message, InlineKeyboardMarkup,
@@ -26,13 +27,14 @@ from pyrogram.errors import (FloodWait, UserNotParticipant, MessageNotModified,
 # --- Module Imports ---
 from config import config
 from modules.database import db  # v6.0
-from modules import bot_state, log_manager, processor, media_info
+from modules import bot_state, log_manager, processor, media_info, ffmpeg_tools
 from modules.downloader import download_from_tg, YTDLDownloader
 from modules.uploader import GofileUploader, upload_to_telegram
 from modules.helpers import force_subscribe_check, is_authorized_user, verify_user_complete
+from modules.ui_core import SSTheme
 from modules.utils import (cleanup_files, is_valid_url,
                            get_human_readable_size, format_duration,
-                           process_manager, parse_time_input)
+                           process_manager, parse_time_input, temp_dir_path)
 # MODIFIED: (v6.0) Imports granular menu functions
 from modules.ui_menus import (
     get_start_menu, get_user_settings_menu, get_video_tools_menu,
@@ -287,7 +289,7 @@ async def cancel_handler(client: Client, message: Message, reply: bool = True):
     task_id = None
     for tid, info in process_manager.active_processes.items():
         if info['user_id'] == user_id:
-            task_id = tid
+            task_id = info.get('owner', tid)
             break
 
     if not task_id:
@@ -309,10 +311,10 @@ async def cancel_handler(client: Client, message: Message, reply: bool = True):
             if reply: await message.reply_text(config.MSG_NO_ACTIVE_TASK)
             return
 
-    await process_manager.kill_process_async(task_id)
+    await process_manager.kill_task_async(task_id)
     user_download_dir = os.path.join(config.DOWNLOAD_DIR, str(user_id),
                                      task_id)
-    cleanup_files(user_download_dir)
+    await asyncio.to_thread(cleanup_files, user_download_dir)
 
     if reply:
         await message.reply_text(
@@ -424,7 +426,7 @@ async def file_handler(client: Client, message: Message):
                                             quote=True)
 
         # Import queue_manager
-        from modules.queue_manager import queue_manager
+        from modules.queue_manager import queue_manager, MAX_QUEUE_ITEMS
 
         # Add file to queue with metadata
         file_info = {
@@ -438,6 +440,11 @@ async def file_handler(client: Client, message: Message):
                     'file_size', 0)
         }
         count = queue_manager.add_to_queue(user_id, file_info)
+        if count is None:
+            return await message.reply_text(
+                f"❌ Queue full ({MAX_QUEUE_ITEMS} files). "
+                "Merge or clear it before adding more.",
+                quote=True)
 
         # Format queue message with visual display
         queue_msg = queue_manager.format_queue_message(
@@ -661,7 +668,8 @@ async def start_merge_task(client: Client, trigger_message: Message,
         })
 
     finally:
-        cleanup_files(user_download_dir)
+        await asyncio.to_thread(cleanup_files, user_download_dir,
+                                temp_dir_path(task_id))
 
 
 # --- END OF FUNCTION 1 ---
@@ -870,7 +878,8 @@ async def start_processing_task(client: Client, message: Message, user_id: int,
         })
 
     finally:
-        cleanup_files(user_download_dir)
+        await asyncio.to_thread(cleanup_files, user_download_dir,
+                                temp_dir_path(task_id))
 
 
 # --- END OF FUNCTION 2 ---
@@ -879,6 +888,17 @@ async def start_processing_task(client: Client, message: Message, user_id: int,
 # 6. CALLBACK HANDLER (v5.2 - Nested UI Logic)
 # ===================================================================
 
+# (chat_id, message_id) -> (image, caption, keyboard) last sent by refresh_panel.
+# Keyboards come from create_keyboard's cache, so an unchanged menu is the same
+# object and a repeated tap can skip the edit_media round-trip. LRU-ordered.
+_LAST_PANEL: "OrderedDict[tuple, tuple]" = OrderedDict()
+LAST_PANEL_MAX = 10_000
+
+
+def _forget_panel(message: Message):
+    """Call after editing a panel message outside refresh_panel."""
+    _LAST_PANEL.pop((message.chat.id, message.id), None)
+
 
 # Helper to refresh the panel
 async def refresh_panel(query: CallbackQuery, panel_type: str):
@@ -946,9 +966,18 @@ async def refresh_panel(query: CallbackQuery, panel_type: str):
             image, caption, keyboard = await get_admin_menu()
 
         if keyboard:
+            key = (query.message.chat.id, query.message.id)
+            last = _LAST_PANEL.get(key)
+            if (last is not None and last[2] is keyboard and last[0] == image
+                    and last[1] == caption):
+                return await query.answer()
             await query.message.edit_media(media=InputMediaPhoto(
                 image, caption=caption),
                                            reply_markup=keyboard)
+            _LAST_PANEL[key] = (image, caption, keyboard)
+            _LAST_PANEL.move_to_end(key)
+            while len(_LAST_PANEL) > LAST_PANEL_MAX:
+                _LAST_PANEL.popitem(last=False)
             await query.answer()
         else:
             await query.answer("Error: Panel not found.")
@@ -995,7 +1024,7 @@ async def callback_handler(client: Client, query: CallbackQuery):
         # ------------------- 3️⃣ Cancel Task -------------------
         if data.startswith("task_cancel:"):
             task_id = data.split(":", 1)[1]
-            info = process_manager.get_process_info(task_id)
+            info = process_manager.get_task_info(task_id)
             if not info:
                 db_task = await db.get_task(task_id)
                 if not db_task or db_task["user_id"] != user_id:
@@ -1013,12 +1042,14 @@ async def callback_handler(client: Client, query: CallbackQuery):
                 return await query.answer("❌ This is not your task.",
                                           show_alert=True)
 
-            await process_manager.kill_process_async(task_id)
-            cleanup_files(
+            await process_manager.kill_task_async(task_id)
+            await asyncio.to_thread(
+                cleanup_files,
                 os.path.join(config.DOWNLOAD_DIR, str(user_id), task_id))
             await query.answer("Task Cancelled!", show_alert=True)
             await query.message.edit_text(
                 config.MSG_TASK_CANCELLED.format(task_id=task_id))
+            _forget_panel(query.message)
             return
 
         # ------------------- 4️⃣ Queue Management -------------------
@@ -1084,6 +1115,7 @@ async def callback_handler(client: Client, query: CallbackQuery):
                         InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
                                              callback_data="open:start")
                     ]]))
+                _forget_panel(query.message)
                 return await query.answer()
             elif panel == "about":
                 caption = config.MSG_ABOUT.format(bot_name=config.BOT_NAME,
@@ -1094,6 +1126,7 @@ async def callback_handler(client: Client, query: CallbackQuery):
                         InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
                                              callback_data="open:start")
                     ]]))
+                _forget_panel(query.message)
                 return await query.answer()
 
         # ------------------- 5️⃣ Core Split Logic -------------------
@@ -1449,8 +1482,13 @@ if __name__ == "__main__":
         logger.info("Connecting to MongoDB...")
         db.connect(config.MONGO_URI, config.DATABASE_NAME)
 
+        # Detect VAAPI etc. once so ffmpeg tools can pick hardware paths
+        await asyncio.to_thread(ffmpeg_tools.probe_hw_support)
+        await processor.init_telegraph()
+
         # Start the bot
         await app.start()
+        SSTheme.start_stats_refresher()
 
         base_commands = [
             BotCommand("start", "Start the bot"),
@@ -59,6 +59,9 @@ class Config:
     DOWNLOAD_DIR = os.environ.get("DOWNLOAD_DIR", "downloads")
     PROCESS_POLL_INTERVAL_S = os.environ.get("PROCESS_POLL_INTERVAL_S", 3)
     PROCESS_CANCEL_TIMEOUT_S = os.environ.get("PROCESS_CANCEL_TIMEOUT_S", 3)
+    TASK_TIMEOUT_SEC = os.environ.get("TASK_TIMEOUT_SEC", 3600)
+    TASK_STALL_TIMEOUT_SEC = os.environ.get("TASK_STALL_TIMEOUT_SEC", 300)
+    MAX_CONCURRENT_FFMPEG = os.environ.get("MAX_CONCURRENT_FFMPEG", 0)  # 0 = half the CPU cores
 
     # ==================== BOT UI SETTINGS ====================
     BOT_NAME = os.environ.get("BOT_NAME", "SS Video Workstation")
@@ -718,6 +721,9 @@ def validate_config():
         
         Config.PROCESS_POLL_INTERVAL_S = int(Config.clean_value(str(Config.PROCESS_POLL_INTERVAL_S)))
         Config.PROCESS_CANCEL_TIMEOUT_S = int(Config.clean_value(str(Config.PROCESS_CANCEL_TIMEOUT_S)))
+        Config.TASK_TIMEOUT_SEC = int(Config.clean_value(str(Config.TASK_TIMEOUT_SEC)))
+        Config.TASK_STALL_TIMEOUT_SEC = int(Config.clean_value(str(Config.TASK_STALL_TIMEOUT_SEC)))
+        Config.MAX_CONCURRENT_FFMPEG = int(Config.clean_value(str(Config.MAX_CONCURRENT_FFMPEG)))
 
         def to_int_list(var_str):
             if var_str:
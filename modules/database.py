@@ -9,15 +9,25 @@
 import motor.motor_asyncio
 import logging
 import uuid
+import copy
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict, Any
 import logging
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Filled on first get_default_settings() call (config must be loaded by then)
+_DEFAULT_TEMPLATE: Optional[Dict[str, Any]] = None
+
+SETTINGS_CACHE_MAX_USERS = 10_000
+SETTINGS_CACHE_TTL_S = 30
+
 class Database:
     def __init__(self):
         self.client = None
@@ -26,6 +36,33 @@ class Database:
         self.authorized_chats = None
         self.tasks = None
         self._connected = False
+        # user_id -> (monotonic_ts, settings doc); LRU-ordered read-through cache
+        self._settings_cache: "OrderedDict[int, tuple]" = OrderedDict()
+    
+    def _patch_cached_settings(self, user_id: int, key: str, value: Any):
+        """
+        Mirrors a successful write into the cached doc so the menu redraw that
+        follows a change is served from memory. Dotted keys patch nested dicts;
+        anything that can't be patched just drops the entry.
+        Copy-on-write: docs already handed out with readonly=True never change
+        under their readers, so the dicts on the written path are copied and
+        the new doc replaces the cache entry.
+        """
+        entry = self._settings_cache.get(user_id)
+        if entry is None:
+            return
+        doc = dict(entry[1])
+        target = doc
+        *parents, leaf = key.split(".")
+        for part in parents:
+            child = target.get(part)
+            if not isinstance(child, dict):
+                self._settings_cache.pop(user_id, None)
+                return
+            target[part] = child = dict(child)
+            target = child
+        target[leaf] = copy.deepcopy(value)
+        self._settings_cache[user_id] = (entry[0], doc)
     
     def connect(self, mongo_uri: str, database_name: str):
         if self._connected:
@@ -46,15 +83,25 @@ class Database:
     # MODIFIED: (v6.0) - Granular Settings Structure
     def get_default_settings(self, user_id: int):
         """Returns the default settings dictionary for a new user (Granular v6.0)."""
+        global _DEFAULT_TEMPLATE
+        if _DEFAULT_TEMPLATE is None:
+            _DEFAULT_TEMPLATE = self._build_default_template()
+        
+        # Template is shared: copy the top level and each (flat) nested dict
+        settings = self._copy_settings(_DEFAULT_TEMPLATE)
+        now = datetime.utcnow()
+        settings.update(user_id=user_id, join_date=now, last_active=now)
+        return settings
+    
+    @staticmethod
+    def _build_default_template() -> Dict[str, Any]:
+        """User-independent part of the defaults; built once."""
         from config import config
         bot_name = config.BOT_NAME if hasattr(config, 'BOT_NAME') else "SSVideoWorkstation"
         
         return {
-            "user_id": user_id,
             "name": "",
             "username": "",
-            "join_date": datetime.utcnow(),
-            "last_active": datetime.utcnow(),
             "is_banned": False,
             "is_on_hold": False,
             
@@ -168,6 +215,7 @@ class Database:
                 },
                 upsert=True
             )
+            self._settings_cache.pop(user_id, None)
             return True
         except Exception as e:
             logger.error(f"Error adding/updating user {user_id}: {e}")
@@ -197,8 +245,34 @@ class Database:
         # ... (No Change)
         pass
 
-    async def get_user_settings(self, user_id: int) -> dict:
-        """Gets user settings, ensuring all new keys (like dicts) are present."""
+    async def get_user_settings(self, user_id: int, readonly: bool = False) -> dict:
+        """
+        Gets user settings, ensuring all new keys (like dicts) are present.
+        Served from memory for SETTINGS_CACHE_TTL_S; writes invalidate it.
+        With readonly=True the cached doc itself is returned (no copy) and
+        the caller must not modify it.
+        """
+        entry = self._settings_cache.get(user_id)
+        if entry is not None and time.monotonic() - entry[0] < SETTINGS_CACHE_TTL_S:
+            self._settings_cache.move_to_end(user_id)
+            return entry[1] if readonly else self._copy_settings(entry[1])
+        
+        settings = await self._load_user_settings(user_id)
+        if settings is not None:
+            self._settings_cache[user_id] = (time.monotonic(), settings)
+            self._settings_cache.move_to_end(user_id)
+            while len(self._settings_cache) > SETTINGS_CACHE_MAX_USERS:
+                self._settings_cache.popitem(last=False)
+            return settings if readonly else self._copy_settings(settings)
+        return self.get_default_settings(user_id)
+    
+    @staticmethod
+    def _copy_settings(settings: dict) -> dict:
+        # callers may edit what they get back; keep the cached doc pristine
+        return {k: (v.copy() if isinstance(v, dict) else v) for k, v in settings.items()}
+    
+    async def _load_user_settings(self, user_id: int) -> Optional[dict]:
+        """Mongo read behind get_user_settings; None if the read failed."""
         try:
             settings = await self.settings.find_one({"user_id": user_id})
             if not settings:
@@ -245,7 +319,7 @@ class Database:
             return settings
         except Exception as e:
             logger.error(f"Error getting settings for {user_id}: {e}")
-            return self.get_default_settings(user_id)
+            return None
 
     async def update_user_setting(self, user_id: int, key: str, value: any):
         """Updates a TOP-LEVEL setting for a user (e.g., 'active_tool')."""
@@ -255,6 +329,7 @@ class Database:
                 {"$set": {key: value, "last_active": datetime.utcnow()}},
                 upsert=True # Just in case
             )
+            self._patch_cached_settings(user_id, key, value)
             return True
         except Exception as e:
             logger.error(f"Error updating setting '{key}' for {user_id}: {e}")
@@ -271,6 +346,7 @@ class Database:
                 {"$set": {key: value, "last_active": datetime.utcnow()}}
                 # $set with dot notation updates only that field
             )
+            self._patch_cached_settings(user_id, key, value)
             logger.info(f"Updated nested setting for {user_id}: {key} = {value}")
             return True
         except Exception as e:
@@ -280,6 +356,18 @@ class Database:
     async def toggle_user_setting(self, user_id: int, key: str) -> bool:
         """Toggles a TOP-LEVEL boolean setting for a user."""
         try:
+            # One atomic round-trip; a missing field flips to True like before
+            doc = await self.settings.find_one_and_update(
+                {"user_id": user_id},
+                [{"$set": {key: {"$not": [f"${key}"]}, "last_active": "$$NOW"}}],
+                projection={key: 1},
+                return_document=ReturnDocument.AFTER
+            )
+            if doc is not None:
+                self._patch_cached_settings(user_id, key, doc[key])
+                return doc[key]
+            
+            # No settings doc yet: create it, then write the flipped value
             current_settings = await self.get_user_settings(user_id)
             new_value = not current_settings.get(key, False)
             await self.update_user_setting(user_id, key, new_value)
@@ -18,6 +18,7 @@ from config import config
 from modules.utils import get_human_readable_size, get_progress_bar, cleanup_files
 from modules.log_manager import update_task_log
 from modules.database import db
+from modules.progress_ui import ProgressUI
 from pyrogram.errors import FloodWait, MessageNotModified
 from yt_dlp import YoutubeDL, DownloadError
 
@@ -175,9 +176,10 @@ async def download_from_tg(
     
     start_time = time.time()
     last_update_time = 0
+    last_hash = None
 
     async def progress_callback(current, total):
-        nonlocal last_update_time
+        nonlocal last_update_time, last_hash
         
         if not await db.is_user_task_running(user_id):
             logger.warning(f"Task {task_id} not found, cancelling TG download.")
@@ -194,10 +196,10 @@ async def download_from_tg(
         speed = current / elapsed if elapsed > 0 else 0
         eta = ((total - current) / speed) if speed > 0 else 0
         
-        from modules.progress_ui import ProgressUI
         user = message.from_user
         
-        message_text = ProgressUI.format_progress_message(
+        message_text, last_hash = ProgressUI.format_progress_message_if_changed(
+            last_hash,
             title=file_name,
             status="Download from Telegram",
             processed=current,
@@ -222,10 +224,11 @@ async def download_from_tg(
         }
         
         try:
-            await status_message.edit_text(
-                message_text,
-                reply_markup=cancel_markup
-            )
+            if message_text:
+                await status_message.edit_text(
+                    message_text,
+                    reply_markup=cancel_markup
+                )
         except MessageNotModified:
             pass
             
@@ -260,7 +263,7 @@ async def download_from_tg(
         return await download_from_tg(client, message, user_id, task_id, status_message, log_manager, log_message_id, cancel_markup)
     except Exception as e:
         logger.error(f"Failed to download from TG: {e}", exc_info=True)
-        cleanup_files(user_download_dir)
+        await asyncio.to_thread(cleanup_files, user_download_dir)
         raise
 
 # --- URL Downloader (yt-dlp) - MODIFIED for Gofile ---
@@ -275,6 +278,7 @@ class YTDLDownloader:
         self.client = client
         self.start_time = time.time()
         self.last_update_time = 0
+        self.last_progress_hash = None
         self.user_download_dir = os.path.join(config.DOWNLOAD_DIR, str(user_id), task_id)
         self.cancel_markup = cancel_markup
         os.makedirs(self.user_download_dir, exist_ok=True)
@@ -324,12 +328,11 @@ class YTDLDownloader:
             
     async def update_progress_messages(self, filename: str, data: dict):
         """Async helper to edit messages from sync hook - Now uses ProgressUI theme."""
-        from modules.progress_ui import ProgressUI
-        
         user = self.status_message.from_user
         percentage = data['progress'] * 100
         
-        message_text = ProgressUI.format_progress_message(
+        message_text, self.last_progress_hash = ProgressUI.format_progress_message_if_changed(
+            self.last_progress_hash,
             title=filename,
             status="Download from URL",
             processed=data.get('downloaded_bytes', 0),
@@ -346,10 +349,11 @@ class YTDLDownloader:
         )
         
         try:
-            await self.status_message.edit_text(
-                message_text,
-                reply_markup=self.cancel_markup
-            )
+            if message_text:
+                await self.status_message.edit_text(
+                    message_text,
+                    reply_markup=self.cancel_markup
+                )
         except MessageNotModified:
             pass
             
@@ -454,5 +458,5 @@ class YTDLDownloader:
             raise Exception(f"Failed to download from URL: {e}")
         except Exception as e:
             logger.error(f"Failed to download from URL: {e}", exc_info=True)
-            cleanup_files(self.user_download_dir)
+            await asyncio.to_thread(cleanup_files, self.user_download_dir)
             raise
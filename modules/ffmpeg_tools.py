@@ -8,7 +8,9 @@
 # - uses run_ffmpeg_with_progress from modules.utils for progress reporting
 
 import os
+import asyncio
 import logging
+import subprocess
 from typing import Optional, Dict, Any, Tuple, List
 
 from modules.utils import (
@@ -16,7 +18,14 @@ from modules.utils import (
     get_video_info,
     get_temp_filename,
     validate_video_file,
-    format_duration
+    format_duration,
+    link_or_copy,
+    run_probe,
+    write_drawtext_file,
+    ffmpeg_cancelled,
+    FFMPEG_BIN,
+    FFPROBE_BIN,
+    SUBPROCESS_ENV
 )
 
 logger = logging.getLogger(__name__)
@@ -62,6 +71,122 @@ ENCODE_PRESETS = {
 }
 
 
+# ------------------------
+# Hardware acceleration (probed once at startup)
+# ------------------------
+VAAPI_DEVICE = os.environ.get("VAAPI_DEVICE", "/dev/dri/renderD128")
+_HW_ENCODERS = set()
+_HW_FILTERS = set()
+
+# rotate angle / flip direction -> transpose_vaapi dir
+_VAAPI_TRANSPOSE = {
+    90: "clock",
+    180: "reversal",
+    270: "cclock",
+    "horizontal": "hflip",
+    "vertical": "vflip",
+}
+
+NVENC_CODECS = {"h264_nvenc", "hevc_nvenc"}
+_NVENC_FALLBACK = {"h264_nvenc": "libx264", "hevc_nvenc": "libx265"}
+
+
+def _nvenc_usable(codec: str) -> bool:
+    try:
+        return subprocess.run([FFMPEG_BIN, "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i",
+                               "nullsrc=s=256x256:d=0.1", "-c:v", codec, "-f", "null", "-"],
+                              capture_output=True, timeout=15, env=SUBPROCESS_ENV).returncode == 0
+    except Exception:
+        return False
+
+
+def probe_hw_support() -> set:
+    """
+    Detect usable hardware encoders/filters and cache them in _HW_ENCODERS
+    and _HW_FILTERS. Blocking; call once at startup (e.g. via to_thread).
+    """
+    _HW_ENCODERS.clear()
+    _HW_FILTERS.clear()
+    try:
+        encoders = subprocess.run([FFMPEG_BIN, "-hide_banner", "-encoders"],
+                                  capture_output=True, text=True, timeout=15, env=SUBPROCESS_ENV).stdout
+        filters = subprocess.run([FFMPEG_BIN, "-hide_banner", "-filters"],
+                                 capture_output=True, text=True, timeout=15, env=SUBPROCESS_ENV).stdout
+    except Exception as e:
+        logger.warning(f"Hardware probe failed, using CPU only: {e}")
+        return _HW_ENCODERS
+    if " h264_vaapi " in encoders and os.path.exists(VAAPI_DEVICE):
+        _HW_ENCODERS.add("h264_vaapi")
+        if " transpose_vaapi " in filters:
+            _HW_FILTERS.add("transpose_vaapi")
+    # NVENC is listed whenever ffmpeg was built with it, so confirm a GPU
+    # is actually present with a tiny test encode.
+    for codec in ("h264_nvenc", "hevc_nvenc"):
+        if f" {codec} " in encoders and _nvenc_usable(codec):
+            _HW_ENCODERS.add(codec)
+    if _HW_ENCODERS & NVENC_CODECS and " scale_cuda " in filters:
+        _HW_FILTERS.add("scale_cuda")
+    logger.info(f"Hardware encoders: {sorted(_HW_ENCODERS) or 'none'}")
+    return _HW_ENCODERS
+
+
+def _hw_filter_args(filter_type: str, cpu_filter: str, param=None) -> Optional[Tuple[List[str], str, List[str]]]:
+    """
+    Returns (input_args, vf, video_codec_args) that keep frames in VAAPI
+    (or CUDA) surfaces for `filter_type`, or None when no hardware path is
+    available.
+    """
+    if "h264_vaapi" not in _HW_ENCODERS:
+        if "h264_nvenc" not in _HW_ENCODERS:
+            return None
+        input_args = ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+        codec_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23"]
+        if filter_type == "speed":
+            vf = cpu_filter
+        else:
+            vf = f"hwdownload,format=nv12,{cpu_filter},format=nv12,hwupload_cuda"
+        return input_args, vf, codec_args
+    input_args = ["-hwaccel", "vaapi", "-hwaccel_device", VAAPI_DEVICE, "-hwaccel_output_format", "vaapi"]
+    codec_args = ["-c:v", "h264_vaapi", "-qp", "23"]
+    if filter_type in ("rotate", "flip") and "transpose_vaapi" in _HW_FILTERS:
+        vf = f"transpose_vaapi=dir={_VAAPI_TRANSPOSE[param]}"
+    elif filter_type == "speed":
+        # setpts only rewrites timestamps, so it runs on hardware frames as-is
+        vf = cpu_filter
+    else:
+        vf = f"hwdownload,format=nv12,{cpu_filter},format=nv12,hwupload"
+    return input_args, vf, codec_args
+
+
+def _hw_decode_args() -> List[str]:
+    """Decode-only hwaccel args for tools whose output must be CPU frames."""
+    if "h264_vaapi" not in _HW_ENCODERS:
+        return ["-hwaccel", "cuda"] if "h264_nvenc" in _HW_ENCODERS else []
+    return ["-hwaccel", "vaapi", "-hwaccel_device", VAAPI_DEVICE]
+
+
+def _hw_filter_command(input_file: str, output_file: str, filter_type: str, cpu_filter: str,
+                       tail_args: List[str], param=None) -> Optional[List[str]]:
+    """Builds the VAAPI/CUDA variant of a single-input -vf command, or None."""
+    hw = _hw_filter_args(filter_type, cpu_filter, param)
+    if not hw:
+        return None
+    input_args, vf, codec_args = hw
+    return ["ffmpeg", *input_args, "-i", input_file, "-vf", vf, *codec_args, *tail_args, "-y", output_file]
+
+
+async def _run_with_hw_fallback(hw_cmd: Optional[List[str]], cpu_cmd: List[str], task_id: str,
+                                user_id: int, progress_callback=None, owner_id=None) -> Tuple[bool, str]:
+    """Runs hw_cmd when given, retrying with cpu_cmd if the hardware path fails."""
+    if hw_cmd:
+        ok, stderr = await run_ffmpeg_with_progress(hw_cmd, task_id, user_id, progress_callback, owner_id)
+        # a cancelled or killed run is not an encoder failure; don't redo it on CPU
+        if ok or ffmpeg_cancelled(stderr):
+            return ok, stderr
+        logger.warning(f"Hardware path failed for {task_id}, retrying on CPU")
+    return await run_ffmpeg_with_progress(cpu_cmd, task_id, user_id, progress_callback, owner_id)
+
+
 def _scale_filter_for_resolution(resolution: str, custom: Optional[str] = None) -> Optional[str]:
     """
     returns an ffmpeg -vf scale filter string for common resolutions.
@@ -144,6 +269,13 @@ async def encode_video(
         maxrate = preset.get("maxrate")  # e.g. '1500k'
         bufsize = preset.get("bufsize")  # e.g. '3000k'
 
+        # NVENC is opted into per user via the vcodec setting
+        use_nvenc = vcodec in NVENC_CODECS
+        if use_nvenc and vcodec not in _HW_ENCODERS:
+            logger.warning(f"{vcodec} not available, falling back to {_NVENC_FALLBACK[vcodec]}")
+            vcodec = _NVENC_FALLBACK[vcodec]
+            use_nvenc = False
+
         # Try to decide whether we can copy audio stream
         can_copy_audio = False
         try:
@@ -156,18 +288,33 @@ async def encode_video(
             can_copy_audio = False
 
         # Build video codec part
-        base_vparams = ["-c:v", vcodec, "-crf", str(crf), "-preset", preset_flag]
-        if tune:
-            base_vparams += ["-tune", tune]
-        # Only apply profile for libx264 (libx265 doesn't support -profile:v flag)
-        if profile and vcodec == "libx264":
-            base_vparams += ["-profile:v", profile]
-        elif profile and vcodec == "libx265":
-            # libx265 doesn't use -profile:v, skip it (profile is controlled via x265-params)
-            logger.debug(f"Skipping profile '{profile}' for libx265 codec (not supported)")
-
-        # pix_fmt explicitly for compatibility
-        base_vparams += ["-pix_fmt", pix_fmt]
+        input_args = []
+        if use_nvenc:
+            # x264 tunes/presets don't map onto NVENC; CRF becomes constant quality
+            base_vparams = ["-c:v", vcodec, "-preset", "p4", "-rc", "vbr", "-cq", str(crf)]
+            if profile and vcodec == "h264_nvenc":
+                base_vparams += ["-profile:v", profile]
+            input_args = ["-hwaccel", "cuda"]
+            if not scale_filter or (scale_filter.startswith("scale=-2:") and "scale_cuda" in _HW_FILTERS):
+                # decode, scale and encode without leaving GPU memory
+                input_args += ["-hwaccel_output_format", "cuda"]
+                if scale_filter:
+                    scale_filter = scale_filter.replace("scale=", "scale_cuda=", 1)
+            else:
+                base_vparams += ["-pix_fmt", pix_fmt]
+        else:
+            base_vparams = ["-c:v", vcodec, "-crf", str(crf), "-preset", preset_flag]
+            if tune:
+                base_vparams += ["-tune", tune]
+            # Only apply profile for libx264 (libx265 doesn't support -profile:v flag)
+            if profile and vcodec == "libx264":
+                base_vparams += ["-profile:v", profile]
+            elif profile and vcodec == "libx265":
+                # libx265 doesn't use -profile:v, skip it (profile is controlled via x265-params)
+                logger.debug(f"Skipping profile '{profile}' for libx265 codec (not supported)")
+
+            # pix_fmt explicitly for compatibility
+            base_vparams += ["-pix_fmt", pix_fmt]
 
         # scale filter
         vf_args = []
@@ -188,8 +335,8 @@ async def encode_video(
         # add movflags
         final_common = ["-movflags", movflags, "-y"]
 
-        # two-pass workflow
-        if two_pass and maxrate and bufsize:
+        # two-pass workflow (NVENC rate control is single-pass)
+        if two_pass and maxrate and bufsize and not use_nvenc:
             # First pass
             passlog = get_temp_filename(task_id, ".log")
             first_cmd = ["ffmpeg", "-y"]
@@ -200,7 +347,10 @@ async def encode_video(
             first_cmd += base_vparams + ["-b:v", maxrate, "-maxrate", maxrate, "-bufsize", bufsize,
                                         "-pass", "1", "-an", "-f", "mp4", os.devnull]
             logger.info(f"Encoding two-pass first pass: {' '.join(first_cmd[:10])} ...")
-            ok1, stderr1 = await run_ffmpeg_with_progress(first_cmd, task_id + "_pass1", user_id, progress_callback)
+            ok1, stderr1 = await run_ffmpeg_with_progress(first_cmd, task_id + "_pass1", user_id, progress_callback,
+                                                          owner_id=task_id)
+            if ffmpeg_cancelled(stderr1):
+                return False, stderr1
             # proceed even if first pass had warnings — check ok1
             if not ok1:
                 logger.warning(f"First pass failed for {task_id}: {stderr1}")
@@ -214,12 +364,13 @@ async def encode_video(
             second_cmd += base_vparams + ["-b:v", maxrate, "-maxrate", maxrate, "-bufsize", bufsize,
                                          "-pass", "2"] + audio_params + final_common + [output_file]
             logger.info(f"Encoding two-pass second pass: {' '.join(second_cmd[:10])} ...")
-            ok2, stderr2 = await run_ffmpeg_with_progress(second_cmd, task_id + "_pass2", user_id, progress_callback)
+            ok2, stderr2 = await run_ffmpeg_with_progress(second_cmd, task_id + "_pass2", user_id, progress_callback,
+                                                          owner_id=task_id)
             # cleanup pass logs may be created by ffmpeg in CWD; we won't rely on passlog variable
             return ok2, (stderr2 if not ok2 else "Encoded (two-pass)")
         else:
             # single-pass encode (recommended)
-            cmd = ["ffmpeg", "-i", input_file]
+            cmd = ["ffmpeg", *input_args, "-i", input_file]
             if vf_full:
                 cmd += ["-vf", vf_full]
             cmd += base_vparams
@@ -239,6 +390,11 @@ async def encode_video(
             ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
             if ok:
                 return True, "Encoded"
+            if use_nvenc and not ffmpeg_cancelled(stderr):
+                logger.warning(f"NVENC encode failed for {task_id}, retrying on CPU")
+                fallback = dict(preset, vcodec=_NVENC_FALLBACK[vcodec])
+                return await encode_video(input_file, output_file, preset_name, task_id, user_id,
+                                          progress_callback, fallback)
             return False, stderr
 
     except FileNotFoundError:
@@ -271,11 +427,13 @@ async def add_text_watermark(
             "center": "x=(w-tw)/2:y=(h-th)/2",
         }
         pos = positions.get(position, positions["bottom_right"])
-        # escape single quotes in text
-        safe_text = text.replace("'", r"\'")
-        draw = f"drawtext=text='{safe_text}':fontsize={font_size}:fontcolor={font_color}:{pos}:box=1:boxcolor=black@0.5:boxborderw=5"
+        # text goes through a file so quotes, colons and % need no escaping
+        text_file = os.path.splitext(output_file)[0] + ".wm.txt"
+        text_opt = await asyncio.to_thread(write_drawtext_file, text, text_file)
+        draw = f"drawtext={text_opt}:fontsize={font_size}:fontcolor={font_color}:{pos}:box=1:boxcolor=black@0.5:boxborderw=5"
         cmd = ["ffmpeg", "-i", input_file, "-vf", draw, "-c:v", "libx264", "-crf", "23", "-preset", "medium", "-c:a", "copy", "-y", output_file]
-        ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
+        hw_cmd = _hw_filter_command(input_file, output_file, "watermark", draw, ["-c:a", "copy"])
+        ok, stderr = await _run_with_hw_fallback(hw_cmd, cmd, task_id, user_id, progress_callback)
         if ok:
             return True, "Watermark added", output_file
         return False, stderr, None
@@ -345,9 +503,12 @@ async def trim_video(
         ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
         if ok and os.path.exists(output_file) and os.path.getsize(output_file) > 0:
             return True, f"Trimmed {format_duration(tdur)}"
+        if ffmpeg_cancelled(stderr):
+            return False, stderr
         # fallback re-encode
         cmd = ["ffmpeg", "-ss", str(start_time), "-i", input_file, "-t", str(tdur), "-c:v", "libx264", "-preset", "medium", "-crf", "23", "-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart", "-y", output_file]
-        ok2, stderr2 = await run_ffmpeg_with_progress(cmd, task_id + "_reencode", user_id, progress_callback)
+        ok2, stderr2 = await run_ffmpeg_with_progress(cmd, task_id + "_reencode", user_id, progress_callback,
+                                                   owner_id=task_id)
         if ok2:
             return True, f"Trimmed (re-encoded) {format_duration(tdur)}"
         return False, stderr2
@@ -404,8 +565,7 @@ async def convert_to_video(input_file: str, output_file: str, task_id: str, user
 
 async def convert_to_document(input_file: str, output_file: str, task_id: str, user_id: int, progress_callback=None) -> Tuple[bool, str]:
     try:
-        import shutil
-        shutil.copy2(input_file, output_file)
+        await asyncio.to_thread(link_or_copy, input_file, output_file)
         return True, "Prepared as document"
     except Exception as e:
         logger.exception("convert_to_document error")
@@ -460,9 +620,28 @@ async def merge_videos_complex(input_files: List[str], output_file: str, task_id
         return False, str(e)
 
 
+# Audio codecs MP4 can carry as-is, so merges stream-copy them
+MP4_AUDIO_CODECS = {"aac", "mp3", "alac"}
+
+
+def _audio_codec(path: str) -> Optional[str]:
+    """codec_name of the first audio stream (works for audio-only files)."""
+    try:
+        out = subprocess.run([FFPROBE_BIN, "-v", "error", "-select_streams", "a:0", "-show_entries",
+                              "stream=codec_name", "-of", "csv=p=0", path],
+                             capture_output=True, text=True, timeout=30, env=SUBPROCESS_ENV).stdout
+        return out.strip() or None
+    except Exception:
+        return None
+
+
 async def merge_video_audio(video_file: str, audio_file: str, output_file: str, task_id: str, user_id: int, progress_callback=None) -> Tuple[bool, str]:
     try:
-        cmd = ["ffmpeg", "-i", video_file, "-i", audio_file, "-c:v", "copy", "-map", "0:v:0", "-map", "1:a:0", "-c:a", "aac", "-b:a", "128k", "-shortest", "-movflags", "+faststart", "-y", output_file]
+        if await run_probe(_audio_codec, audio_file) in MP4_AUDIO_CODECS:
+            audio_args = ["-c:a", "copy"]
+        else:
+            audio_args = ["-c:a", "aac", "-b:a", "128k"]
+        cmd = ["ffmpeg", "-i", video_file, "-i", audio_file, "-c:v", "copy", "-map", "0:v:0", "-map", "1:a:0", *audio_args, "-shortest", "-movflags", "+faststart", "-y", output_file]
         ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
         return ok, stderr
     except Exception as e:
@@ -509,8 +688,10 @@ async def rotate_video(
         
         transpose_filter = f"transpose={transpose_map[angle]}"
         
-        cmd = ["ffmpeg", "-i", input_file, "-vf", transpose_filter, "-c:a", "copy", "-movflags", "+faststart", "-y", output_file]
-        ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
+        tail = ["-c:a", "copy", "-movflags", "+faststart"]
+        cmd = ["ffmpeg", "-i", input_file, "-vf", transpose_filter, *tail, "-y", output_file]
+        hw_cmd = _hw_filter_command(input_file, output_file, "rotate", transpose_filter, tail, angle)
+        ok, stderr = await _run_with_hw_fallback(hw_cmd, cmd, task_id, user_id, progress_callback)
         return (True, f"Rotated {angle}°") if ok else (False, stderr or "Rotation failed")
     except Exception as e:
         logger.exception("rotate_video error")
@@ -540,8 +721,10 @@ async def flip_video(
             return False, f"Invalid flip direction: {direction}. Must be 'horizontal' or 'vertical'."
         
         vf = flip_filters[direction]
-        cmd = ["ffmpeg", "-i", input_file, "-vf", vf, "-c:a", "copy", "-movflags", "+faststart", "-y", output_file]
-        ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
+        tail = ["-c:a", "copy", "-movflags", "+faststart"]
+        cmd = ["ffmpeg", "-i", input_file, "-vf", vf, *tail, "-y", output_file]
+        hw_cmd = _hw_filter_command(input_file, output_file, "flip", vf, tail, direction)
+        ok, stderr = await _run_with_hw_fallback(hw_cmd, cmd, task_id, user_id, progress_callback)
         return (True, f"Flipped {direction}") if ok else (False, stderr or "Flip failed")
     except Exception as e:
         logger.exception("flip_video error")
@@ -580,7 +763,9 @@ async def adjust_video_speed(
             af = f"atempo=2.0,atempo={audio_speed/2.0}" if audio_speed > 2.0 else f"atempo=0.5,atempo={audio_speed*2.0}"
         
         cmd = ["ffmpeg", "-i", input_file, "-vf", vf, "-af", af, "-c:v", "libx264", "-preset", "medium", "-crf", "23", "-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart", "-y", output_file]
-        ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
+        hw_cmd = _hw_filter_command(input_file, output_file, "speed", vf,
+                                    ["-af", af, "-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart"])
+        ok, stderr = await _run_with_hw_fallback(hw_cmd, cmd, task_id, user_id, progress_callback)
         return (True, f"Speed adjusted to {speed}x") if ok else (False, stderr or "Speed adjustment failed")
     except Exception as e:
         logger.exception("adjust_video_speed error")
@@ -669,7 +854,9 @@ async def crop_video(
         
         crop_filter = f"crop={new_width}:{new_height}:{x_offset}:{y_offset}"
         cmd = ["ffmpeg", "-i", input_file, "-vf", crop_filter, "-c:a", "copy", "-c:v", "libx264", "-preset", "medium", "-crf", "23", "-movflags", "+faststart", "-y", output_file]
-        ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
+        hw_cmd = _hw_filter_command(input_file, output_file, "crop", crop_filter,
+                                    ["-c:a", "copy", "-movflags", "+faststart"])
+        ok, stderr = await _run_with_hw_fallback(hw_cmd, cmd, task_id, user_id, progress_callback)
         return (True, f"Cropped to {aspect_ratio}") if ok else (False, stderr or "Crop failed")
     except Exception as e:
         logger.exception("crop_video error")
@@ -708,14 +895,20 @@ async def convert_to_gif(
         palette_file = get_temp_filename(task_id, "_palette.png")
         
         filters = f"fps={fps},scale={scale}:-1:flags=lanczos"
-        palette_cmd = ["ffmpeg", "-i", input_file, "-vf", f"{filters},palettegen=max_colors={max_colors}", "-y", palette_file]
+        hw_in = _hw_decode_args()
+        palette_args = ["-i", input_file, "-vf", f"{filters},palettegen=max_colors={max_colors}", "-y", palette_file]
+        palette_cmd = ["ffmpeg", *palette_args]
+        hw_palette_cmd = ["ffmpeg", *hw_in, *palette_args] if hw_in else None
         
-        ok1, stderr1 = await run_ffmpeg_with_progress(palette_cmd, task_id + "_palette", user_id, None)
+        ok1, stderr1 = await _run_with_hw_fallback(hw_palette_cmd, palette_cmd, task_id + "_palette", user_id,
+                                                   progress_callback, owner_id=task_id)
         if not ok1:
             return False, f"Palette generation failed: {stderr1}"
         
-        gif_cmd = ["ffmpeg", "-i", input_file, "-i", palette_file, "-filter_complex", f"{filters}[x];[x][1:v]paletteuse", "-y", output_file]
-        ok2, stderr2 = await run_ffmpeg_with_progress(gif_cmd, task_id, user_id, progress_callback)
+        gif_args = ["-i", input_file, "-i", palette_file, "-filter_complex", f"{filters}[x];[x][1:v]paletteuse", "-y", output_file]
+        gif_cmd = ["ffmpeg", *gif_args]
+        hw_gif_cmd = ["ffmpeg", *hw_in, *gif_args] if hw_in else None
+        ok2, stderr2 = await _run_with_hw_fallback(hw_gif_cmd, gif_cmd, task_id, user_id, progress_callback)
         
         try:
             if os.path.exists(palette_file):
@@ -742,14 +935,37 @@ async def reverse_video(
         if not ok:
             return False, ferr or "Invalid video file"
         
-        cmd = ["ffmpeg", "-i", input_file, "-vf", "reverse", "-af", "areverse", "-c:v", "libx264", "-preset", "medium", "-crf", "23", "-c:a", "aac", "-b:a", "128k", "-avoid_negative_ts", "make_zero", "-movflags", "+faststart", "-y", output_file]
-        ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
+        reverse_args = ["-i", input_file, "-vf", "reverse", "-af", "areverse", "-c:v", "libx264", "-preset", "medium", "-crf", "23", "-c:a", "aac", "-b:a", "128k", "-avoid_negative_ts", "make_zero", "-movflags", "+faststart", "-y", output_file]
+        cmd = ["ffmpeg", *reverse_args]
+        # reverse buffers every frame, so decode on hardware but filter in RAM
+        hw_in = _hw_decode_args()
+        hw_cmd = ["ffmpeg", *hw_in, *reverse_args] if hw_in else None
+        ok, stderr = await _run_with_hw_fallback(hw_cmd, cmd, task_id, user_id, progress_callback)
         return (True, "Video reversed") if ok else (False, stderr or "Reverse failed")
     except Exception as e:
         logger.exception("reverse_video error")
         return False, str(e)
 
 
+async def extract_single_thumbnail(
+    input_file: str,
+    output_file: str,
+    timestamp: float,
+    task_id: str,
+    user_id: int,
+    progress_callback=None,
+    owner_id: Optional[str] = None
+) -> Tuple[bool, str]:
+    """Extract one JPEG frame at `timestamp` seconds."""
+    try:
+        cmd = ["ffmpeg", "-ss", str(timestamp), "-i", input_file, "-vframes", "1", "-q:v", "2", "-y", output_file]
+        ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback, owner_id)
+        return (True, f"Extracted thumbnail at {format_duration(timestamp)}") if ok else (False, stderr or "Thumbnail extraction failed")
+    except Exception as e:
+        logger.exception("extract_single_thumbnail error")
+        return False, str(e)
+
+
 async def extract_thumbnails(
     input_file: str,
     output_dir: str,
@@ -781,9 +997,7 @@ async def extract_thumbnails(
                 ts = duration / 2
             
             output_file = os.path.join(output_dir, f"thumb_{task_id}.jpg")
-            cmd = ["ffmpeg", "-ss", str(ts), "-i", input_file, "-vframes", "1", "-q:v", "2", "-y", output_file]
-            ok, stderr = await run_ffmpeg_with_progress(cmd, task_id, user_id, progress_callback)
-            return (True, f"Extracted thumbnail at {format_duration(ts)}") if ok else (False, stderr or "Thumbnail extraction failed")
+            return await extract_single_thumbnail(input_file, output_file, ts, task_id, user_id, progress_callback)
         
         elif mode == "interval":
             if count < 1 or count > 20:
@@ -809,6 +1023,7 @@ async def extract_thumbnails(
 # ------------------------
 __all__ = [
     "ENCODE_PRESETS",
+    "probe_hw_support",
     "encode_video",
     "add_text_watermark",
     "add_image_watermark",
@@ -827,5 +1042,6 @@ __all__ = [
     "crop_video",
     "convert_to_gif",
     "reverse_video",
+    "extract_single_thumbnail",
     "extract_thumbnails",
 ]
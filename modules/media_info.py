@@ -7,12 +7,12 @@
 # 5. Kept existing `get_media_info` and `format_media_info` for text-based output.
 
 import os
-import json
 import asyncio
 import logging
 import time
 from typing import Optional, Dict, Any
-from modules.utils import get_human_readable_size, format_duration
+from modules.utils import (FFPROBE_BIN, SUBPROCESS_ENV, get_human_readable_size,
+                           format_duration, json_loads)
 
 # Try to import matplotlib for graph generation
 try:
@@ -38,7 +38,7 @@ async def get_media_info(file_path: str) -> (Optional[Dict], Optional[str]):
     """
     try:
         command = [
-            "ffprobe",
+            FFPROBE_BIN,
             "-v", "quiet",
             "-print_format", "json",
             "-show_format",
@@ -49,7 +49,8 @@ async def get_media_info(file_path: str) -> (Optional[Dict], Optional[str]):
         process = await asyncio.create_subprocess_exec(
             *command,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            env=SUBPROCESS_ENV
         )
         stdout, stderr = await process.communicate()
 
@@ -57,7 +58,7 @@ async def get_media_info(file_path: str) -> (Optional[Dict], Optional[str]):
             logger.error(f"ffprobe failed: {stderr.decode()}")
             return None, None
             
-        data = json.loads(stdout)
+        data = json_loads(stdout)
         formatted_info = await format_media_info(data)
         
         return data, formatted_info
@@ -80,14 +81,16 @@ async def format_media_info(data: dict) -> str:
         duration = format_duration(duration_sec) # Use util function
         bitrate = int(format_data.get("bit_rate", 0))
 
-        info = f"**File:** `{filename}`\n"
-        info += f"**Size:** `{get_human_readable_size(size)}`\n"
-        info += f"**Duration:** `{duration}`\n"
-        info += f"**Overall Bitrate:** `{get_human_readable_size(bitrate)}/s`\n"
-        info += f"**Format:** `{format_data.get('format_long_name', 'N/A')}`\n\n"
+        parts = [
+            f"**File:** `{filename}`",
+            f"**Size:** `{get_human_readable_size(size)}`",
+            f"**Duration:** `{duration}`",
+            f"**Overall Bitrate:** `{get_human_readable_size(bitrate)}/s`",
+            f"**Format:** `{format_data.get('format_long_name', 'N/A')}`",
+        ]
 
         if video_streams:
-            info += "**Video Stream**\n"
+            parts.append("\n**Video Stream**")
             vs = video_streams[0]
             width = vs.get('width', 'N/A')
             height = vs.get('height', 'N/A')
@@ -109,28 +112,29 @@ async def format_media_info(data: dict) -> str:
             else:
                 fps = fps_str
             
-            info += f"  `Codec:` {codec} ({profile})\n"
-            info += f"  `Resolution:` {width}x{height}\n"
-            info += f"  `Frame Rate:` {fps} fps\n"
+            parts.append(f"  `Codec:` {codec} ({profile})")
+            parts.append(f"  `Resolution:` {width}x{height}")
+            parts.append(f"  `Frame Rate:` {fps} fps")
 
         if audio_streams:
-            info += f"\n**Audio Stream(s):** `{len(audio_streams)}`\n"
+            parts.append(f"\n**Audio Stream(s):** `{len(audio_streams)}`")
             for i, aus in enumerate(audio_streams):
                 lang = aus.get('tags', {}).get('language', 'N/A')
                 codec = aus.get('codec_name', 'N/A')
                 channels = aus.get('channels', 'N/A')
                 layout = aus.get('channel_layout', 'N/A')
-                info += f"  `Stream {i+1}:` {codec} ({lang}, {channels}ch, {layout})\n"
+                parts.append(f"  `Stream {i+1}:` {codec} ({lang}, {channels}ch, {layout})")
 
         if subtitle_streams:
-            info += f"\n**Subtitle Stream(s):** `{len(subtitle_streams)}`\n"
+            parts.append(f"\n**Subtitle Stream(s):** `{len(subtitle_streams)}`")
             for i, sus in enumerate(subtitle_streams):
                 lang = sus.get('tags', {}).get('language', 'N/A')
                 title = sus.get('tags', {}).get('title', 'N/A')
                 codec = sus.get('codec_name', 'N/A')
-                info += f"  `Stream {i+1}:` {codec} ({lang}, {title})\n"
+                parts.append(f"  `Stream {i+1}:` {codec} ({lang}, {title})")
 
-        return info.strip()
+        # Built as a list and joined once instead of repeated `+=`
+        return "\n".join(parts)
     except Exception as e:
         logger.error(f"Error formatting media info: {e}")
         return "Could not format media info."
@@ -5,12 +5,12 @@ import os
 import logging
 import asyncio
 import tempfile
-import json
 from typing import Optional, Dict
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from pymediainfo import MediaInfo
+from modules.utils import FFPROBE_BIN, SUBPROCESS_ENV, json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +46,7 @@ class MediaInfoGraphGenerator:
         """
         try:
             cmd = [
-                "ffprobe",
+                FFPROBE_BIN,
                 "-v", "quiet",
                 "-print_format", "json",
                 "-show_format",
@@ -57,14 +57,15 @@ class MediaInfoGraphGenerator:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                env=SUBPROCESS_ENV
             )
             stdout, _ = await proc.communicate()
             
             if proc.returncode != 0:
                 return None
             
-            data = json.loads(stdout.decode())
+            data = json_loads(stdout)
             
             # Format output
             info_text = "\n" + "="*50 + "\n"
@@ -110,7 +111,7 @@ class MediaInfoGraphGenerator:
             
             # Get frame bitrate data
             cmd = [
-                "ffprobe",
+                FFPROBE_BIN,
                 "-v", "quiet",
                 "-select_streams", "v:0",
                 "-show_entries", "packet=pts_time,size",
@@ -121,11 +122,12 @@ class MediaInfoGraphGenerator:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                env=SUBPROCESS_ENV
             )
             stdout, _ = await proc.communicate()
             
-            data = json.loads(stdout.decode())
+            data = json_loads(stdout)
             packets = data.get('packets', [])
             
             if len(packets) < 10:
@@ -6,26 +6,31 @@
 # ✅ Async-safe and 100% functional
 
 import os
+import time
 import asyncio
 import logging
 import json
-from typing import Dict, List
+import html
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List
 from pyrogram.types import Message
 from pyrogram.errors import MessageNotModified
 
 from config import config
 from modules.database import db
-from modules.utils import (run_ffmpeg_with_progress, get_video_info,
-                           parse_time_input, get_temp_filename,
-                           check_video_compatibility)
+from modules.utils import (FFPROBE_BIN, SUBPROCESS_ENV, ffmpeg_activity,
+                           ffmpeg_queue_time, queued_seconds, json_loads,
+                           run_ffmpeg_with_progress, run_probe, get_video_info,
+                           parse_time_input, get_temp_dir, link_or_copy,
+                           check_video_compatibility, validate_video_file)
 import modules.ffmpeg_tools as ffmpeg
 import modules.log_manager as log_manager
 import modules.media_info as media_info  # <-- ADD THIS
 import modules.mediainfo_graph as mediainfo_graph
 import shlex  # <-- यह जोड़ें
-import os  # <-- यह पहले से होना चाहिए, सुनिश्चित करें
 from telegraph.aio import Telegraph  # <-- यह जोड़ें
-from telegraph.exceptions import TelegraphException  # <-- Error handling के लिए
 
 logger = logging.getLogger(__name__)
 
@@ -36,42 +41,104 @@ section_dict = {
     "Text": "箱",
     "Menu": "翼"
 }
+# ffprobe codec_type -> section_dict key; other stream types are skipped
+_STREAM_SECTIONS = {"video": "Video", "audio": "Audio", "subtitle": "Text"}
+# section -> "<h4>emoji heading" prefix, built once instead of per page;
+# 'Text' को 'Subtitle' से बदलें जैसा कि WZML-X करता है
+_SECTION_HEADINGS = {
+    name: f"<h4>{emoji} {'Subtitle' if name == 'Text' else name}"
+    for name, emoji in section_dict.items()
+}
 
 
-def parseinfo(out, size):
-    tc, trigger = "", False
-    size_line = (
-        f"File size                                 : {size / (1024 * 1024):.2f} MiB"
-    )
-    for line in out.split("\n"):
-        for section, emoji in section_dict.items():
-            if line.startswith(section):
-                trigger = True
-                if not line.startswith("General"):
-                    tc += "</pre><br>"
-                # 'Text' को 'Subtitle' से बदलें जैसा कि WZML-X करता है
-                tc += f"<h4>{emoji} {line.replace('Text', 'Subtitle')}</h4>"
-                break
-        if line.startswith("File size"):
-            line = size_line
-        if trigger:
-            tc += "<br><pre>"
-            trigger = False
-        else:
-            tc += line + "\n"
-    tc += "</pre><br>"
-    return tc
+@lru_cache(maxsize=512)
+def _field_label(key):
+    """ffprobe key -> padded mediainfo-style label ('bit_rate' -> 'Bit rate')."""
+    return f"{key.replace('_', ' ').capitalize():<41} : "
+
+
+def _info_lines(fields):
+    lines = [
+        _field_label(key) + str(value) for key, value in fields.items()
+        if not isinstance(value, (dict, list))
+    ]
+    for key, value in fields.get("tags", {}).items():
+        lines.append(_field_label(key) + str(value))
+    return lines
+
+
+def parseinfo(data, size):
+    """Render ffprobe JSON (-show_format -show_streams) as Telegraph HTML."""
+    general = dict(data.get("format", {}))
+    general.pop("filename", None)
+    general["size"] = f"{size / (1024 * 1024):.2f} MiB"
+    sections = [("General", general)]
+    sections += [(_STREAM_SECTIONS.get(stream.get("codec_type")), stream)
+                 for stream in data.get("streams", [])]
+
+    counts = {}
+    for name, _ in sections:
+        counts[name] = counts.get(name, 0) + 1
+    seen = {}
+    parts = []
+    for name, fields in sections:
+        if name is None:
+            continue
+        seen[name] = seen.get(name, 0) + 1
+        heading = _SECTION_HEADINGS[name]
+        if counts[name] > 1:
+            heading += f" #{seen[name]}"
+        parts.append(f"{heading}</h4><br><pre>"
+                     f"{html.escape(chr(10).join(_info_lines(fields)))}"
+                     "</pre><br>")
+    return "".join(parts)
 
 
 # --- एंड WZML-X लॉजिक ---
 
 
+# ---------------------- TASK CONTEXT ---------------------- #
+@dataclass(slots=True)
+class TaskContext:
+    """Per-task state shared by every _process_* handler."""
+    user_id: int
+    task_id: str
+    settings: dict
+    cb: Callable
+    temp_dir: str
+    client: Any
+    status_message: Message
+    log_message_id: int
+
+
 # ---------------------- PROGRESS CALLBACK ---------------------- #
+# task_id -> (monotonic_ts, progress_bucket, stage) of the last edit sent
+_last_edit: Dict[str, tuple] = {}
+PROGRESS_EDIT_INTERVAL_S = 1.0
+# task_id -> monotonic_ts of the last progress tick; the watchdog also
+# reads utils.ffmpeg_activity
+_last_heartbeat: Dict[str, float] = {}
+MEDIAINFO_TIMEOUT_S = 60
+WATCHDOG_POLL_S = 5
+
+
 async def _progress_callback(task_id: str, status_message: Message,
                              log_message_id: int, client, stage: str,
                              **kwargs):
     try:
         progress = kwargs.get('progress', 0)
+        now = time.monotonic()
+        _last_heartbeat[task_id] = now
+        # Telegram flood-waits on rapid edits; skip ticks that change nothing
+        bucket = int(progress * 100)
+        prev = _last_edit.get(task_id)
+        if prev is not None:
+            prev_ts, prev_bucket, prev_stage = prev
+            if (stage == prev_stage and bucket == prev_bucket
+                    and now - prev_ts < PROGRESS_EDIT_INTERVAL_S):
+                return
+        _last_edit[task_id] = (now, bucket, stage)
+
         speed = kwargs.get('speed', 'N/A')
         eta = kwargs.get('eta', 'N/A')
         text = (f"**⏳ Task `{task_id}`: {stage}...**\n\n"
@@ -89,58 +156,107 @@ async def _progress_callback(task_id: str, status_message: Message,
         logger.warning(f"Error updating progress for {task_id}: {e}")
 
 
+def _log_errors(tool):
+    """
+    Turns an exception escaping a _process_* handler into the usual
+    (False, msg, None) result, logging it once here.
+    """
+
+    def deco(fn):
+
+        @wraps(fn)
+        async def wrap(ctx, downloaded_files):
+            try:
+                return await fn(ctx, downloaded_files)
+            except Exception as e:
+                logger.error(f"{tool} error ({ctx.task_id}): {e}",
+                             exc_info=True)
+                return False, f"{tool} failed: {e}", None
+
+        return wrap
+
+    return deco
+
+
 # ---------------------- MERGE ---------------------- #
-async def _process_merge(user_id, task_id, downloaded_files, settings,
-                         progress_cb):
-    output_file = get_temp_filename(task_id, ".mp4")
-    mode = settings.get("merge_mode", "video+video")
-    logger.info(f"Task {task_id}: Starting merge mode '{mode}'")
-    await progress_cb(stage="Merging")
+@_log_errors("Merge")
+async def _process_merge(ctx: TaskContext, downloaded_files):
+    output_file = os.path.join(ctx.temp_dir, f"output_{ctx.task_id}.mp4")
+    mode = ctx.settings.get("merge_mode", "video+video")
+    logger.info(f"Task {ctx.task_id}: Starting merge mode '{mode}'")
+    await ctx.cb(stage="Merging")
 
     if mode == "video+video":
-        infos = [get_video_info(f) for f in downloaded_files]
+        # ffprobe is a blocking subprocess; keep it off the event loop
+        infos = await asyncio.gather(*(run_probe(get_video_info, f)
+                                       for f in downloaded_files))
         compatible, reason = check_video_compatibility(infos)
         if compatible:
             success, msg = await ffmpeg.merge_videos_simple(
-                downloaded_files, output_file, task_id, user_id, progress_cb)
+                downloaded_files, output_file, ctx.task_id, ctx.user_id,
+                ctx.cb)
         else:
             logger.warning(f"Incompatible ({reason}), using re-encode.")
             success, msg = await ffmpeg.merge_videos_complex(
-                downloaded_files, output_file, task_id, user_id, progress_cb)
+                downloaded_files, output_file, ctx.task_id, ctx.user_id,
+                ctx.cb)
         return success, msg, output_file if success else None
 
     elif mode == "video+audio":
         success, msg = await ffmpeg.merge_video_audio(downloaded_files[0],
                                                       downloaded_files[1],
-                                                      output_file, task_id,
-                                                      user_id, progress_cb)
+                                                      output_file, ctx.task_id,
+                                                      ctx.user_id, ctx.cb)
         return success, msg, output_file if success else None
 
     elif mode == "video+subtitle":
         success, msg = await ffmpeg.merge_video_subtitle(
-            downloaded_files[0], downloaded_files[1], output_file, task_id,
-            user_id, progress_cb)
+            downloaded_files[0], downloaded_files[1], output_file, ctx.task_id,
+            ctx.user_id, ctx.cb)
         return success, msg, output_file if success else None
 
     else:
         return False, f"Unknown merge mode: {mode}", None
 
 
+async def _run_tool(ctx: TaskContext,
+                    downloaded_files,
+                    stage,
+                    tool_fn,
+                    *args,
+                    ext="mp4"):
+    """
+    Shared shape of the single-input tools: report `stage`, then call
+    tool_fn(input, output, *args, task_id, user_id, progress_callback).
+    """
+    output_file = os.path.join(ctx.temp_dir, f"output_{ctx.task_id}.{ext}")
+    await ctx.cb(stage=stage)
+    success, msg = await tool_fn(downloaded_files[0], output_file, *args,
+                                 ctx.task_id, ctx.user_id, ctx.cb)
+    return success, msg, output_file if success else None
+
+
+async def _passthrough(ctx: TaskContext, downloaded_files, msg):
+    """Hands the source on unchanged for settings that are a no-op."""
+    input_file = downloaded_files[0]
+    ext = os.path.splitext(input_file)[1]
+    output_file = os.path.join(ctx.temp_dir, f"output_{ctx.task_id}{ext}")
+    await asyncio.to_thread(link_or_copy, input_file, output_file)
+    return True, msg, output_file
+
+
 # ---------------------- ENCODE ---------------------- #
-async def _process_encode(user_id, task_id, downloaded_files, settings,
-                          progress_cb):
+@_log_errors("Encoding")
+async def _process_encode(ctx: TaskContext, downloaded_files):
     """
     Modern VE-based encoding pipeline
     Uses ffmpeg.encode_video() for consistent CRF, preset, resolution logic.
     """
     input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
+    output_file = os.path.join(ctx.temp_dir, f"output_{ctx.task_id}.mp4")
 
-    # Load user or default encoding settings
-    user_defaults = db.get_default_settings(user_id) if hasattr(
-        db, "get_default_settings") else {}
-    encode_settings = settings.get("encode_settings",
-                                   user_defaults.get('encode_settings', {}))
+    # get_user_settings backfills missing keys from the defaults
+    encode_settings = ctx.settings["encode_settings"]
 
     preset_name = encode_settings.get("preset_name", "default_h264")
 
@@ -159,137 +275,203 @@ async def _process_encode(user_id, task_id, downloaded_files, settings,
     }
 
     logger.info(
-        f"[ENCODE] Task {task_id}: Using preset={preset_name} custom={custom_settings}"
+        f"[ENCODE] Task {ctx.task_id}: Using preset={preset_name} custom={custom_settings}"
     )
-    await progress_cb(stage="Encoding")
+    await ctx.cb(stage="Encoding")
 
     try:
         success, msg = await ffmpeg.encode_video(
             input_file=input_file,
             output_file=output_file,
             preset_name=preset_name,
-            task_id=task_id,
-            user_id=user_id,
-            progress_callback=progress_cb,
+            task_id=ctx.task_id,
+            user_id=ctx.user_id,
+            progress_callback=ctx.cb,
             custom_settings=custom_settings)
         return success, msg, output_file if success else None
     except FileNotFoundError:
         return False, "FFmpeg not found on system", None
-    except Exception as e:
-        logger.error(f"Encoding error ({task_id}): {e}", exc_info=True)
-        return False, str(e), None
 
 
 # ---------------------- TRIM ---------------------- #
-async def _process_trim(user_id, task_id, downloaded_files, settings,
-                        progress_cb):
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    trim = settings.get("trim_settings",
-                        db.get_default_settings(user_id)['trim_settings'])
+@_log_errors("Trim")
+async def _process_trim(ctx: TaskContext, downloaded_files):
+    trim = ctx.settings["trim_settings"]
     start = parse_time_input(trim.get('start', '00:00:00'))
     end = parse_time_input(trim.get('end', '00:00:30'))
-    await progress_cb(stage="Trimming")
-    success, msg = await ffmpeg.trim_video(input_file, output_file, start, end,
-                                           task_id, user_id, progress_cb)
-    return success, msg, output_file if success else None
+    if start is None or end is None:
+        return False, "Invalid trim time", None
+    if start >= end:
+        return False, "Start must be before end", None
+    return await _run_tool(ctx, downloaded_files, "Trimming",
+                           ffmpeg.trim_video, start, end)
 
 
 # ---------------------- SAMPLE ---------------------- #
-async def _process_sample(user_id, task_id, downloaded_files, settings,
-                          progress_cb):
+@_log_errors("Sample")
+async def _process_sample(ctx: TaskContext, downloaded_files):
     input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    sample = settings.get("sample_settings",
-                          db.get_default_settings(user_id)['sample_settings'])
+    output_file = os.path.join(ctx.temp_dir, f"output_{ctx.task_id}.mp4")
+    sample = ctx.settings["sample_settings"]
     duration = sample.get('duration', 30)
     if isinstance(duration, str):
         try:
             duration = int(duration)
         except:
             duration = 30
-    await progress_cb(stage="Generating Sample")
+    await ctx.cb(stage="Generating Sample")
     success, msg = await ffmpeg.generate_sample(
-        input_file, output_file, duration, task_id, user_id,
-        sample.get('from_point', 'start'), progress_cb)
+        input_file, output_file, duration, ctx.task_id, ctx.user_id,
+        sample.get('from_point', 'start'), ctx.cb)
     return success, msg, output_file if success else None
 
 
-# ---------------------- MEDIA INFO ---------------------- #
-# ---------------------- MEDIA INFO ---------------------- #
-async def _process_mediainfo(status_message, task_id, downloaded_files):
-    input_file = downloaded_files[0]
-    await status_message.edit_text(f"📊 Generating MediaInfo for `{task_id}`..."
-                                   )
+# ---------------------- TELEGRAPH ---------------------- #
+TELEGRAPH_TIMEOUT_S = 5
+TELEGRAPH_TOKEN_FILE = os.path.join(config.DOWNLOAD_DIR, ".telegraph.json")
+_telegraph = None
+
 
+def _load_telegraph_token():
     try:
-        # 1. 'mediainfo' कमांड-लाइन टूल चलाएँ
-        command = ['mediainfo', input_file]
-        proc = await asyncio.create_subprocess_exec(
-            *command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE)
-        stdout, stderr = await proc.communicate()
-
-        if proc.returncode != 0:
-            logger.error(f"MediaInfo CLI failed: {stderr.decode()}")
-            raise Exception(f"MediaInfo CLI Error: {stderr.decode()}")
-
-        stdout = stdout.decode().strip()
-        if not stdout:
-            raise Exception("MediaInfo returned empty output.")
-
-        # 2. फ़ाइल साइज़ प्राप्त करें (WZML-X की तरह)
-        file_size = os.path.getsize(input_file)
-
-        # 3. WZML-X के पार्सर का उपयोग करके HTML कंटेंट बनाएँ
-        file_name = os.path.basename(input_file)
-        html_content = f"<h4>東 {file_name}</h4><br><br>"
-        html_content += parseinfo(stdout, file_size)  #
-
-        # 4. Telegraph पेज बनाएँ (telegraph_helper.py की तरह)
-        telegraph_obj = Telegraph(domain="graph.org")
-
-        # एक रैंडम अकाउंट बनाएँ, जैसा WZML-X करता है
-        try:
-            await telegraph_obj.create_account(
-                short_name=f"task-{task_id[:8]}", author_name="MediaInfo Bot")
-        except Exception as e:
-            logger.warning(
-                f"Failed to create telegraph account, proceeding: {e}")
-
-        # पेज बनाएँ
-        page = await telegraph_obj.create_page(title="MediaInfo X",
-                                               html_content=html_content)
-        page_url = page['url']
-
-        # 5. यूज़र को फ़ाइनल लिंक भेजें (WZML-X फॉर्मेट)
-        final_text = (f"**MediaInfo:**\n\n"
-                      f"筐ｲ **Link :** {page_url}")
-        await status_message.edit_text(final_text,
-                                       disable_web_page_preview=False)
-
-        # यह ज़रूरी है
-        return True, "Displayed", None
-
-    except TelegraphException as e:
-        logger.error(f"Telegraph error: {e}")
-        await status_message.edit_text(f"❌ Telegraph Error: {e}")
-        return False, f"Telegraph error: {e}", None
+        with open(TELEGRAPH_TOKEN_FILE) as f:
+            return json.load(f).get("access_token")
+    except (OSError, ValueError):
+        return None
+
+
+def _save_telegraph_token(token):
+    try:
+        os.makedirs(os.path.dirname(TELEGRAPH_TOKEN_FILE), exist_ok=True)
+        # owner-only: the token grants full control of the graph.org account
+        fd = os.open(TELEGRAPH_TOKEN_FILE,
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            # O_CREAT's mode doesn't apply to a file left by an older version
+            os.fchmod(f.fileno(), 0o600)
+            json.dump({"access_token": token}, f)
+    except OSError as e:
+        logger.warning(f"Could not save telegraph token: {e}")
+
+
+async def init_telegraph():
+    """
+    Returns the shared graph.org client, creating its account on first use.
+    Called once at bot startup; one client keeps its HTTP connections alive.
+    The account token is kept on disk so restarts reuse the same account.
+    """
+    global _telegraph
+    if _telegraph is not None:
+        return _telegraph
+    token = _load_telegraph_token()
+    if token:
+        _telegraph = Telegraph(access_token=token, domain="graph.org")
+        return _telegraph
+    telegraph_obj = Telegraph(domain="graph.org")
+    try:
+        account = await telegraph_obj.create_account(
+            short_name="MediaInfoBot", author_name="MediaInfo Bot")
+        _save_telegraph_token(account["access_token"])
+        _telegraph = telegraph_obj
     except Exception as e:
-        logger.error(f"MediaInfo error: {e}", exc_info=True)
-        await status_message.edit_text(f"❌ MediaInfo (Graph) failed: {e}")
-        return False, f"MediaInfo failed: {e}", None
+        # not cached, so the next call retries the account
+        logger.warning(f"Failed to create telegraph account, proceeding: {e}")
+    return telegraph_obj
+
+
+# user_id -> Lock; one Telegraph upload in flight per user
+_telegraph_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = (
+    weakref.WeakValueDictionary())
+# strong refs so pending fire-and-forget tasks aren't garbage collected
+_background_tasks = set()
+
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _push_telegraph(user_id, info_message, summary, html_content):
+    """Publishes the full MediaInfo page and appends its link to the summary."""
+    lock = _telegraph_locks.setdefault(user_id, asyncio.Lock())
+    try:
+        async with lock:
+            telegraph_obj = await init_telegraph()
+            create_page = telegraph_obj.create_page(title="MediaInfo X",
+                                                    html_content=html_content)
+            page = await asyncio.wait_for(create_page, TELEGRAPH_TIMEOUT_S)
+        # WZML-X फॉर्मेट
+        await info_message.edit_text(
+            f"{summary}\n\n筐ｲ **Link :** {page['url']}",
+            disable_web_page_preview=False)
+    except Exception as e:
+        logger.warning(f"Telegraph upload failed for user {user_id}: {e}")
+
+
+# ---------------------- MEDIA INFO ---------------------- #
+@_log_errors("MediaInfo")
+async def _process_mediainfo(ctx: TaskContext, downloaded_files):
+    input_file = downloaded_files[0]
+    await ctx.status_message.edit_text(
+        f"📊 Generating MediaInfo for `{ctx.task_id}`...")
+
+    # 1. ffprobe JSON चलाएँ (एक बार parse, line-by-line scan नहीं)
+    command = [
+        FFPROBE_BIN, '-v', 'error', '-print_format', 'json', '-show_format',
+        '-show_streams', input_file
+    ]
+    proc = await asyncio.create_subprocess_exec(*command,
+                                                stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.PIPE,
+                                                env=SUBPROCESS_ENV)
+    stdout, stderr = await proc.communicate()
+
+    # -v error keeps stderr empty on success but names the cause on failure
+    reason = stderr.decode("utf-8", "ignore").strip()
+    if proc.returncode != 0:
+        reason = reason or f"exit code {proc.returncode}"
+        logger.error(f"ffprobe failed: {reason}")
+        raise Exception(f"ffprobe Error: {reason}")
+
+    if not stdout.strip():
+        raise Exception("ffprobe returned empty output." +
+                        (f" {reason}" if reason else ""))
+    probe = json_loads(stdout)
+
+    # 2. फ़ाइल साइज़ ffprobe JSON से लें; stat सिर्फ़ fallback है
+    file_size = int(probe.get("format", {}).get("size") or 0)
+    if not file_size:
+        file_size = (await run_probe(os.stat, input_file)).st_size
+
+    # 3. WZML-X के पार्सर का उपयोग करके HTML कंटेंट बनाएँ
+    file_name = os.path.basename(input_file)
+    html_content = (f"<h4>東 {html.escape(file_name)}</h4><br><br>" +
+                    parseinfo(probe, file_size))
+
+    # 4. Local summary तुरंत भेजें; Telegraph पेज background में बनेगा
+    summary = await media_info.format_media_info(probe)
+    info_message = await ctx.status_message.reply_text(summary)
+    _spawn(_push_telegraph(ctx.user_id, info_message, summary, html_content))
+
+    # यह ज़रूरी है
+    return True, "Displayed", None
 
 
 # ---------------------- WATERMARK ---------------------- #
-async def _process_watermark(user_id, task_id, downloaded_files, settings,
-                             progress_cb):
+@_log_errors("Watermark")
+async def _process_watermark(ctx: TaskContext, downloaded_files):
     input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    wm_settings = settings.get("watermark_settings", {})
+    output_file = os.path.join(ctx.temp_dir, f"output_{ctx.task_id}.mp4")
+    wm_settings = ctx.settings["watermark_settings"]
     wtype = wm_settings.get("type", "none")
-    await progress_cb(stage="Adding Watermark")
+    # Bail out before touching Telegram or ffmpeg when there is nothing to do
+    if wtype not in ("text", "image"):
+        return False, "Watermark type not set or is 'none'", None
+    if wtype == "image" and not wm_settings.get("image_id"):
+        return False, "No watermark image set", None
+    await ctx.cb(stage="Adding Watermark")
 
     if wtype == "text":
         text = wm_settings.get("text", "")
@@ -297,214 +479,261 @@ async def _process_watermark(user_id, task_id, downloaded_files, settings,
         return await ffmpeg.add_text_watermark(input_file,
                                                output_file,
                                                text,
-                                               task_id,
-                                               user_id,
+                                               ctx.task_id,
+                                               ctx.user_id,
                                                position,
-                                               progress_callback=progress_cb)
-    elif wtype == "image":
+                                               progress_callback=ctx.cb)
+    else:
         image_path = wm_settings.get("image_id")
-        if not image_path:
-            return False, "No watermark image set", None
         position = wm_settings.get("position", "bottom_right")
         opacity = wm_settings.get("opacity", 0.7)
         return await ffmpeg.add_image_watermark(input_file,
                                                 output_file,
                                                 image_path,
-                                                task_id,
-                                                user_id,
+                                                ctx.task_id,
+                                                ctx.user_id,
                                                 position,
                                                 opacity,
-                                                progress_callback=progress_cb)
-    else:
-        return False, "Watermark type not set or is 'none'", None
+                                                progress_callback=ctx.cb)
 
 
 # ---------------------- CONVERT ---------------------- #
-async def _process_convert(user_id, task_id, downloaded_files, settings,
-                           progress_cb):
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    upload_mode = settings.get("upload_mode", "telegram")
-    await progress_cb(stage="Converting")
-
-    if upload_mode == "telegram":
-        success, msg = await ffmpeg.convert_to_video(input_file, output_file,
-                                                     task_id, user_id,
-                                                     progress_cb)
+@_log_errors("Convert")
+async def _process_convert(ctx: TaskContext, downloaded_files):
+    if ctx.settings.get("upload_mode", "telegram") == "telegram":
+        convert = ffmpeg.convert_to_video
     else:
-        success, msg = await ffmpeg.convert_to_document(
-            input_file, output_file, task_id, user_id, progress_cb)
-    return success, msg, output_file if success else None
+        convert = ffmpeg.convert_to_document
+    return await _run_tool(ctx, downloaded_files, "Converting", convert)
 
 
 # ---------------------- RENAME ---------------------- #
-async def _process_rename(user_id, task_id, downloaded_files, settings,
-                          progress_cb):
-    import shutil
+@_log_errors("Rename")
+async def _process_rename(ctx: TaskContext, downloaded_files):
     input_file = downloaded_files[0]
-    new_name = settings.get("custom_filename",
-                            "renamed").strip().replace('/',
-                                                       '_').replace('\\', '_')
+    new_name = ctx.settings.get("custom_filename", "renamed").strip().replace(
+        '/', '_').replace('\\', '_')
+    if not new_name:
+        return False, "Filename is empty", None
     ext = os.path.splitext(input_file)[1]
-    temp_dir = os.path.dirname(get_temp_filename(task_id, ext))
-    output_file = os.path.join(temp_dir, f"{new_name}{ext}")
-    try:
-        shutil.copy2(input_file, output_file)
-        return True, f"File renamed to {new_name}{ext}", output_file
-    except Exception as e:
-        logger.error(f"Rename error: {e}")
-        return False, f"Rename failed: {e}", None
+    output_file = os.path.join(ctx.temp_dir, f"{new_name}{ext}")
+    await asyncio.to_thread(link_or_copy, input_file, output_file)
+    return True, f"File renamed to {new_name}{ext}", output_file
 
 
 # ---------------------- NEW TOOLS ---------------------- #
 
 
-async def _process_rotate(user_id, task_id, downloaded_files, settings,
-                          progress_cb):
+@_log_errors("Rotate")
+async def _process_rotate(ctx: TaskContext, downloaded_files):
     """Rotate video by specified angle."""
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    rotate_settings = settings.get(
-        "rotate_settings",
-        db.get_default_settings(user_id)['rotate_settings'])
-    angle = rotate_settings.get('angle', 90)
-
-    await progress_cb(stage="Rotating Video")
-    success, msg = await ffmpeg.rotate_video(input_file, output_file, angle,
-                                             task_id, user_id, progress_cb)
-    return success, msg, output_file if success else None
+    angle = ctx.settings["rotate_settings"].get('angle', 90)
+    return await _run_tool(ctx, downloaded_files, "Rotating Video",
+                           ffmpeg.rotate_video, angle)
 
 
-async def _process_flip(user_id, task_id, downloaded_files, settings,
-                        progress_cb):
+@_log_errors("Flip")
+async def _process_flip(ctx: TaskContext, downloaded_files):
     """Flip video horizontally or vertically."""
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    flip_settings = settings.get(
-        "flip_settings",
-        db.get_default_settings(user_id)['flip_settings'])
-    direction = flip_settings.get('direction', 'horizontal')
-
-    await progress_cb(stage="Flipping Video")
-    success, msg = await ffmpeg.flip_video(input_file, output_file, direction,
-                                           task_id, user_id, progress_cb)
-    return success, msg, output_file if success else None
+    direction = ctx.settings["flip_settings"].get('direction', 'horizontal')
+    return await _run_tool(ctx, downloaded_files, "Flipping Video",
+                           ffmpeg.flip_video, direction)
 
 
-async def _process_speed(user_id, task_id, downloaded_files, settings,
-                         progress_cb):
+@_log_errors("Speed")
+async def _process_speed(ctx: TaskContext, downloaded_files):
     """Adjust video playback speed."""
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    speed_settings = settings.get(
-        "speed_settings",
-        db.get_default_settings(user_id)['speed_settings'])
-    speed = float(speed_settings.get('speed', 1.0))
-
-    await progress_cb(stage="Adjusting Speed")
-    success, msg = await ffmpeg.adjust_video_speed(input_file, output_file,
-                                                   speed, task_id, user_id,
-                                                   progress_cb)
-    return success, msg, output_file if success else None
+    speed = float(ctx.settings["speed_settings"].get('speed', 1.0))
+    if abs(speed - 1.0) < 0.001:
+        return await _passthrough(ctx, downloaded_files,
+                                  "Speed is 1.0x, file unchanged")
+    return await _run_tool(ctx, downloaded_files, "Adjusting Speed",
+                           ffmpeg.adjust_video_speed, speed)
 
 
-async def _process_volume(user_id, task_id, downloaded_files, settings,
-                          progress_cb):
+@_log_errors("Volume")
+async def _process_volume(ctx: TaskContext, downloaded_files):
     """Adjust audio volume."""
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    volume_settings = settings.get(
-        "volume_settings",
-        db.get_default_settings(user_id)['volume_settings'])
-    volume = int(volume_settings.get('volume', 100))
-
-    await progress_cb(stage="Adjusting Volume")
-    success, msg = await ffmpeg.adjust_audio_volume(input_file, output_file,
-                                                    volume, task_id, user_id,
-                                                    progress_cb)
-    return success, msg, output_file if success else None
+    volume = int(ctx.settings["volume_settings"].get('volume', 100))
+    if volume == 100:
+        return await _passthrough(ctx, downloaded_files,
+                                  "Volume is 100%, file unchanged")
+    return await _run_tool(ctx, downloaded_files, "Adjusting Volume",
+                           ffmpeg.adjust_audio_volume, volume)
 
 
-async def _process_crop(user_id, task_id, downloaded_files, settings,
-                        progress_cb):
+@_log_errors("Crop")
+async def _process_crop(ctx: TaskContext, downloaded_files):
     """Crop video to specified aspect ratio."""
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-    crop_settings = settings.get(
-        "crop_settings",
-        db.get_default_settings(user_id)['crop_settings'])
-    aspect_ratio = crop_settings.get('aspect_ratio', '16:9')
-
-    await progress_cb(stage="Cropping Video")
-    success, msg = await ffmpeg.crop_video(input_file, output_file,
-                                           aspect_ratio, task_id, user_id,
-                                           progress_cb)
-    return success, msg, output_file if success else None
+    aspect_ratio = ctx.settings["crop_settings"].get('aspect_ratio', '16:9')
+    return await _run_tool(ctx, downloaded_files, "Cropping Video",
+                           ffmpeg.crop_video, aspect_ratio)
 
 
-async def _process_gif(user_id, task_id, downloaded_files, settings,
-                       progress_cb):
+@_log_errors("GIF")
+async def _process_gif(ctx: TaskContext, downloaded_files):
     """Convert video to GIF."""
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".gif")
-    gif_settings = settings.get(
-        "gif_settings",
-        db.get_default_settings(user_id)['gif_settings'])
+    gif_settings = ctx.settings["gif_settings"]
     fps = int(gif_settings.get('fps', 10))
     scale = int(gif_settings.get('scale', 480))
     quality = gif_settings.get('quality', 'medium')
-
-    await progress_cb(stage="Converting to GIF")
-    success, msg = await ffmpeg.convert_to_gif(input_file, output_file, fps,
-                                               scale, quality, task_id,
-                                               user_id, progress_cb)
-    return success, msg, output_file if success else None
-
-
-async def _process_reverse(user_id, task_id, downloaded_files, settings,
-                           progress_cb):
+    return await _run_tool(ctx,
+                           downloaded_files,
+                           "Converting to GIF",
+                           ffmpeg.convert_to_gif,
+                           fps,
+                           scale,
+                           quality,
+                           ext="gif")
+
+
+@_log_errors("Reverse")
+async def _process_reverse(ctx: TaskContext, downloaded_files):
     """Reverse video playback."""
-    input_file = downloaded_files[0]
-    output_file = get_temp_filename(task_id, ".mp4")
-
-    await progress_cb(stage="Reversing Video")
-    success, msg = await ffmpeg.reverse_video(input_file, output_file, task_id,
-                                              user_id, progress_cb)
-    return success, msg, output_file if success else None
-
-
-async def _process_extract_thumb(user_id, task_id, downloaded_files, settings,
-                                 progress_cb):
+    return await _run_tool(ctx, downloaded_files, "Reversing Video",
+                           ffmpeg.reverse_video)
+
+
+async def _extract_interval_thumbs(input_file, output_dir, count, task_id,
+                                   user_id):
+    """Extract `count` evenly spaced thumbnails with concurrent seeks."""
+    if count < 1 or count > 20:
+        return False, "Count must be between 1 and 20"
+    ok, ferr = await run_probe(validate_video_file, input_file)
+    if not ok:
+        return False, ferr or "Invalid video file"
+    info = await run_probe(get_video_info, input_file)
+    if not info:
+        return False, "Cannot get video duration"
+    duration = info.get("duration", 0.0)
+    if duration <= 0:
+        duration = 10.0
+    interval = duration / (count + 1)
+
+    # run_ffmpeg_with_progress bounds how many of these run at once
+    async def _extract(i):
+        output_file = os.path.join(output_dir, f"thumb_{task_id}_{i:03d}.jpg")
+        return await ffmpeg.extract_single_thumbnail(input_file,
+                                                     output_file,
+                                                     interval * i,
+                                                     f"{task_id}_thumb{i}",
+                                                     user_id,
+                                                     owner_id=task_id)
+
+    # stop the remaining seeks, queued ones included, on the first failure
+    # or cancel
+    seeks = [asyncio.create_task(_extract(i)) for i in range(1, count + 1)]
+    try:
+        for seek in asyncio.as_completed(seeks):
+            ok, msg = await seek
+            if not ok:
+                return False, msg
+    finally:
+        for seek in seeks:
+            seek.cancel()
+        await asyncio.gather(*seeks, return_exceptions=True)
+    return True, f"Extracted {count} thumbnails"
+
+
+@_log_errors("Thumbnail")
+async def _process_extract_thumb(ctx: TaskContext, downloaded_files):
     """Extract thumbnail(s) from video."""
     input_file = downloaded_files[0]
-    output_dir = os.path.dirname(get_temp_filename(task_id, ""))
-    thumb_settings = settings.get(
-        "extract_thumb_settings",
-        db.get_default_settings(user_id)['extract_thumb_settings'])
+    output_dir = ctx.temp_dir
+    thumb_settings = ctx.settings["extract_thumb_settings"]
     mode = thumb_settings.get('mode', 'single')
     timestamp = thumb_settings.get('timestamp', '00:00:05')
     count = int(thumb_settings.get('count', 5))
 
-    await progress_cb(stage="Extracting Thumbnails")
-    success, msg = await ffmpeg.extract_thumbnails(input_file, output_dir,
-                                                   mode, timestamp, count,
-                                                   task_id, user_id,
-                                                   progress_cb)
+    await ctx.cb(stage="Extracting Thumbnails")
+    if mode == "interval" and count > 1:
+        success, msg = await _extract_interval_thumbs(input_file, output_dir,
+                                                      count, ctx.task_id,
+                                                      ctx.user_id)
+    else:
+        success, msg = await ffmpeg.extract_thumbnails(input_file, output_dir,
+                                                       mode, timestamp, count,
+                                                       ctx.task_id,
+                                                       ctx.user_id, ctx.cb)
 
     if success and mode == "single":
-        output_file = os.path.join(output_dir, f"thumb_{task_id}.jpg")
+        output_file = os.path.join(output_dir, f"thumb_{ctx.task_id}.jpg")
         return success, msg, output_file
     elif success and mode == "interval":
-        output_file = os.path.join(output_dir, f"thumb_{task_id}_001.jpg")
+        output_file = os.path.join(output_dir, f"thumb_{ctx.task_id}_001.jpg")
         return success, msg, output_file
     else:
         return success, msg, None
 
 
+# ---------------------- WATCHDOG ---------------------- #
+async def _run_with_watchdog(task_id, coro, timeout):
+    """
+    Await a tool coroutine, cancelling it when it exceeds `timeout` seconds
+    overall or shows no activity for TASK_STALL_TIMEOUT_SEC (0 disables).
+    Activity is any progress callback or any output from the task's ffmpeg
+    process, so inputs without a known duration never look stalled. Time
+    spent queued for an ffmpeg slot does not count towards `timeout`.
+    """
+    stall_timeout = int(getattr(config, "TASK_STALL_TIMEOUT_SEC", 300))
+    task = asyncio.ensure_future(coro)
+    started = time.monotonic()
+    _last_heartbeat[task_id] = started
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=WATCHDOG_POLL_S)
+            if done:
+                return task.result()
+            now = time.monotonic()
+            if now - started - queued_seconds(task_id) >= timeout:
+                reason = f"Task timed out after {timeout}s"
+            elif stall_timeout and now - max(
+                    _last_heartbeat.get(task_id, now),
+                    ffmpeg_activity.get(task_id, 0.0)) >= stall_timeout:
+                reason = f"Task stalled (no progress for {stall_timeout}s)"
+            else:
+                continue
+            logger.error(f"Task {task_id}: {reason}")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise asyncio.TimeoutError(reason)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        _last_heartbeat.pop(task_id, None)
+        ffmpeg_activity.pop(task_id, None)
+        ffmpeg_queue_time.pop(task_id, None)
+
+
 # ---------------------- MAIN ROUTER ---------------------- #
+# active_tool -> handler; every handler takes (ctx, downloaded_files)
+_TOOL_HANDLERS: Dict[str, Callable] = {
+    "merge": _process_merge,
+    "encode": _process_encode,
+    "trim": _process_trim,
+    "sample": _process_sample,
+    "mediainfo": _process_mediainfo,
+    "watermark": _process_watermark,
+    "convert": _process_convert,
+    "rename": _process_rename,
+    "rotate": _process_rotate,
+    "flip": _process_flip,
+    "speed": _process_speed,
+    "volume": _process_volume,
+    "crop": _process_crop,
+    "gif": _process_gif,
+    "reverse": _process_reverse,
+    "extract_thumb": _process_extract_thumb,
+}
+# tools that never call get_video_info on their inputs
+_PROBELESS_TOOLS = {"mediainfo", "rename"}
+
+
 async def process_task(client, user_id, task_id, downloaded_files,
                        status_message, log_message_id):
     try:
+        # a private copy: tasks run concurrently and must not share one dict
         settings = await db.get_user_settings(user_id)
         tool = settings.get("active_tool", "none")
         logger.info(f"Task {task_id}: Processing tool '{tool}'")
@@ -512,70 +741,28 @@ async def process_task(client, user_id, task_id, downloaded_files,
         from functools import partial
         cb = partial(_progress_callback, task_id, status_message,
                      log_message_id, client)
-
-        if tool == "merge":
-            success, msg, out = await _process_merge(user_id, task_id,
-                                                     downloaded_files,
-                                                     settings, cb)
-        elif tool == "encode":
-            success, msg, out = await _process_encode(user_id, task_id,
-                                                      downloaded_files,
-                                                      settings, cb)
-        elif tool == "trim":
-            success, msg, out = await _process_trim(user_id, task_id,
-                                                    downloaded_files, settings,
-                                                    cb)
-        elif tool == "sample":
-            success, msg, out = await _process_sample(user_id, task_id,
-                                                      downloaded_files,
-                                                      settings, cb)
-        elif tool == "mediainfo":
-            success, msg, out = await _process_mediainfo(
-                status_message, task_id, downloaded_files)
-        elif tool == "watermark":
-            success, msg, out = await _process_watermark(
-                user_id, task_id, downloaded_files, settings, cb)
-        elif tool == "convert":
-            success, msg, out = await _process_convert(user_id, task_id,
-                                                       downloaded_files,
-                                                       settings, cb)
-        elif tool == "rename":
-            success, msg, out = await _process_rename(user_id, task_id,
-                                                      downloaded_files,
-                                                      settings, cb)
-        elif tool == "rotate":
-            success, msg, out = await _process_rotate(user_id, task_id,
-                                                      downloaded_files,
-                                                      settings, cb)
-        elif tool == "flip":
-            success, msg, out = await _process_flip(user_id, task_id,
-                                                    downloaded_files, settings,
-                                                    cb)
-        elif tool == "speed":
-            success, msg, out = await _process_speed(user_id, task_id,
-                                                     downloaded_files,
-                                                     settings, cb)
-        elif tool == "volume":
-            success, msg, out = await _process_volume(user_id, task_id,
-                                                      downloaded_files,
-                                                      settings, cb)
-        elif tool == "crop":
-            success, msg, out = await _process_crop(user_id, task_id,
-                                                    downloaded_files, settings,
-                                                    cb)
-        elif tool == "gif":
-            success, msg, out = await _process_gif(user_id, task_id,
-                                                   downloaded_files, settings,
-                                                   cb)
-        elif tool == "reverse":
-            success, msg, out = await _process_reverse(user_id, task_id,
-                                                       downloaded_files,
-                                                       settings, cb)
-        elif tool == "extract_thumb":
-            success, msg, out = await _process_extract_thumb(
-                user_id, task_id, downloaded_files, settings, cb)
-        else:
+        ctx = TaskContext(user_id=user_id,
+                          task_id=task_id,
+                          settings=settings,
+                          cb=cb,
+                          temp_dir=get_temp_dir(task_id),
+                          client=client,
+                          status_message=status_message,
+                          log_message_id=log_message_id)
+
+        handler = _TOOL_HANDLERS.get(tool)
+        if handler is None:
             return None
+        if tool not in _PROBELESS_TOOLS:
+            # Probe every input once off the event loop; the ffmpeg_tools
+            # calls below then hit get_video_info's cache instead of ffprobe
+            await asyncio.gather(*(run_probe(get_video_info, f)
+                                   for f in downloaded_files))
+        coro = handler(ctx, downloaded_files)
+
+        timeout = (MEDIAINFO_TIMEOUT_S if tool == "mediainfo" else int(
+            getattr(config, "TASK_TIMEOUT_SEC", 3600)))
+        success, msg, out = await _run_with_watchdog(task_id, coro, timeout)
 
         # ✅ FIX SECTION
         if not success:
@@ -598,3 +785,5 @@ async def process_task(client, user_id, task_id, downloaded_files,
             error_msg = error_msg[:3500] + "\n\n... (error message truncated)"
         await status_message.edit_text(f"❌ Error: {error_msg}")
         return None
+    finally:
+        _last_edit.pop(task_id, None)
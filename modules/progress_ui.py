@@ -2,9 +2,29 @@
 # Professional progress UI - Now a thin wrapper around centralized SSTheme
 # All formatting logic delegated to modules/ui_core.SSTheme
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from modules.ui_core import SSTheme
-from modules.utils import format_duration
+from modules.utils import format_duration, get_human_readable_size
+
+# Queue message header, shared with QueueManager.format_queue_message
+QUEUE_HEADER_TMPL = (
+    "<b>{title}</b> <i>{user}</i>\n"
+    "✅ <b>Video Added to Queue!</b>\n"
+    "📊 <b>Queue: {count} item(s)</b>\n"
+)
+
+# Constant panel lines, built once instead of on every completion message
+_POWERED_BY_FOOTER = (
+    f"{SSTheme.BORDER_LINE}✦ |̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅| <b>𝐏ᴏᴡᴇʀᴇᴅ 𝐁ʏ : 𝐒𝐒 𝐁ᴏᴛs</b> ✌️|̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅|",
+)
+_UPLOAD_COMPLETE_HEAD = (
+    f"{SSTheme.BORDER_LINE}✅ <b>𝐔ᴘʟᴏᴀᴅ 𝐂ᴏᴍᴘʟᴇᴛᴇ</b>",
+    f"{SSTheme.BORDER_LINE}",
+)
+_TASK_COMPLETE_HEAD = (
+    f"{SSTheme.BORDER_LINE}🎉 <b>𝐓ᴀsᴋ 𝐂ᴏᴍᴘʟᴇᴛᴇᴅ 𝐒ᴜᴄᴄᴇssꜰᴜʟʟʏ</b>",
+    f"{SSTheme.BORDER_LINE}",
+)
 
 class ProgressUI:
     """
@@ -57,8 +77,6 @@ class ProgressUI:
         Returns:
             Complete formatted message with decorative borders and stats footer
         """
-        from modules.utils import get_human_readable_size
-        
         # Convert numeric speed/eta to strings
         speed_str = f"{get_human_readable_size(speed)}/s" if speed > 0 else "0B/s"
         eta_str = format_duration(eta) if eta > 0 else "Calculating..."
@@ -81,6 +99,31 @@ class ProgressUI:
             cancel_data=cancel_data
         )
     
+    @staticmethod
+    def format_progress_message_if_changed(
+        last_hash: Optional[int] = None,
+        **fields
+    ) -> Tuple[Optional[str], int]:
+        """
+        format_progress_message that skips work when nothing visible moved
+        
+        Fields are compared at display precision (MiB processed, whole
+        percent, KiB/s speed, ETA seconds). Returns (None, last_hash) when
+        they match last_hash so the caller can skip the Telegram edit;
+        otherwise (message, new_hash).
+        """
+        h = hash((
+            fields.get("title"),
+            fields.get("status"),
+            int(fields.get("processed", 0)) >> 20,
+            int(fields.get("percentage", 0)),
+            int(fields.get("speed", 0)) >> 10,
+            fields.get("eta"),
+        ))
+        if h == last_hash:
+            return None, last_hash
+        return ProgressUI.format_progress_message(**fields), h
+    
     @staticmethod
     def get_bot_stats() -> str:
         """
@@ -99,13 +142,9 @@ class ProgressUI:
         Format queue display message
         Simple queue notification for merge operations
         """
-        count = len(queue_items)
-        
-        msg = f"<b>{title}</b> <i>{admin_name}</i>\n"
-        msg += f"✅ <b>Video Added to Queue!</b>\n"
-        msg += f"📊 <b>Queue: {count} item(s)</b>\n"
-        
-        return msg
+        return QUEUE_HEADER_TMPL.format(
+            title=title, user=admin_name, count=len(queue_items)
+        )
     
     @staticmethod
     def format_upload_complete_message(
@@ -118,25 +157,18 @@ class ProgressUI:
         """
         Format upload completion message with decorative styling
         """
-        from modules.utils import get_human_readable_size
-        
         body_lines = [
-            f"{SSTheme.BORDER_LINE}✅ <b>𝐔ᴘʟᴏᴀᴅ 𝐂ᴏᴍᴘʟᴇᴛᴇ</b>",
-            f"{SSTheme.BORDER_LINE}",
+            *_UPLOAD_COMPLETE_HEAD,
             SSTheme.format_field('processed', '𝐒ɪᴢᴇ', get_human_readable_size(file_size)),
             SSTheme.format_field('elapsed', '𝐓ɪᴍᴇ', format_duration(upload_time)),
             SSTheme.format_field('mode', '𝐌ᴏᴅᴇ', mode),
             SSTheme.format_field('user', '𝐔ᴘʟᴏᴀᴅᴇᴅ 𝐁ʏ', user_name),
         ]
         
-        footer_lines = [
-            f"{SSTheme.BORDER_LINE}✦ |̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅| <b>𝐏ᴏᴡᴇʀᴇᴅ 𝐁ʏ : 𝐒𝐒 𝐁ᴏᴛs</b> ✌️|̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅|",
-        ]
-        
         return SSTheme.render_panel(
             title=title,
             body_lines=body_lines,
-            footer_lines=footer_lines,
+            footer_lines=_POWERED_BY_FOOTER,
             include_stats=False
         )
     
@@ -151,24 +183,17 @@ class ProgressUI:
         """
         Format task completion message with professional styling
         """
-        from modules.utils import get_human_readable_size
-        
         body_lines = [
-            f"{SSTheme.BORDER_LINE}🎉 <b>𝐓ᴀsᴋ 𝐂ᴏᴍᴘʟᴇᴛᴇᴅ 𝐒ᴜᴄᴄᴇssꜰᴜʟʟʏ</b>",
-            f"{SSTheme.BORDER_LINE}",
+            *_TASK_COMPLETE_HEAD,
             SSTheme.format_field('engine', '𝐓ᴏᴏʟ', task_type.upper()),
             SSTheme.format_field('processed', '𝐎ᴜᴛᴘᴜᴛ 𝐒ɪᴢᴇ', get_human_readable_size(file_size)),
             SSTheme.format_field('elapsed', '𝐓ᴏᴛᴀʟ 𝐓ɪᴍᴇ', format_duration(duration)),
             SSTheme.format_field('user', '𝐏ʀᴏᴄᴇssᴇᴅ 𝐁ʏ', user_name),
         ]
         
-        footer_lines = [
-            f"{SSTheme.BORDER_LINE}✦ |̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅| <b>𝐏ᴏᴡᴇʀᴇᴅ 𝐁ʏ : 𝐒𝐒 𝐁ᴏᴛs</b> ✌️|̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅|",
-        ]
-        
         return SSTheme.render_panel(
             title=title,
             body_lines=body_lines,
-            footer_lines=footer_lines,
+            footer_lines=_POWERED_BY_FOOTER,
             include_stats=True
         )
@@ -5,24 +5,49 @@ import logging
 from typing import Dict, List, Optional
 from datetime import datetime
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from modules.utils import get_human_readable_size
+from modules.progress_ui import QUEUE_HEADER_TMPL
 
 logger = logging.getLogger(__name__)
 
+# add_to_queue refuses files once a user's merge queue reaches this size
+MAX_QUEUE_ITEMS = 50
+
+_QUEUE_FILES_HEADING = "\n<b>Files in queue:</b>\n"
+
+_BTN_ADD_MORE = InlineKeyboardButton("➕ Add More", callback_data="queue:add_more")
+_BTN_MERGE_NOW = InlineKeyboardButton("🔀 Merge Now", callback_data="queue:merge_now")
+_BTN_CLEAR = InlineKeyboardButton("🗑️ Clear", callback_data="queue:clear")
+
+# The keyboard only depends on whether a merge is possible yet
+_KEYBOARD_SINGLE = InlineKeyboardMarkup([[_BTN_ADD_MORE, _BTN_CLEAR]])
+_KEYBOARD_READY = InlineKeyboardMarkup([[_BTN_ADD_MORE, _BTN_MERGE_NOW], [_BTN_CLEAR]])
+
 class QueueManager:
     """Manage user file queues for merge operations with visual display"""
     
     def __init__(self):
         self.user_queues: Dict[int, List[dict]] = {}
     
-    def add_to_queue(self, user_id: int, file_info: dict) -> int:
-        """Add file to user's queue"""
-        if user_id not in self.user_queues:
-            self.user_queues[user_id] = []
+    def add_to_queue(self, user_id: int, file_info: dict) -> Optional[int]:
+        """Add file to user's queue; None (queue unchanged) if it is full"""
+        queue = self.user_queues.setdefault(user_id, [])
+        if len(queue) >= MAX_QUEUE_ITEMS:
+            return None
         
         file_info['added_at'] = datetime.now()
-        self.user_queues[user_id].append(file_info)
+        # Formatted once here; the queue message is re-rendered on every add
+        file_size = file_info.get('file_size') or 0
+        file_info['_size_str'] = get_human_readable_size(file_size) if file_size > 0 else "Unknown"
+        # Items are only ever appended or cleared, so the index is stable
+        file_info['_line'] = self._format_line(len(queue) + 1, file_info)
+        queue.append(file_info)
         
-        return len(self.user_queues[user_id])
+        return len(queue)
+    
+    @staticmethod
+    def _format_line(position: int, file_info: dict) -> str:
+        return f"{position}. {file_info.get('filename', 'Unknown')} ({file_info['_size_str']})"
     
     def get_queue(self, user_id: int) -> List[dict]:
         """Get user's current queue"""
@@ -49,33 +74,13 @@ class QueueManager:
         count = self.get_queue_count(user_id)
         queue_items = self.get_queue(user_id)
         
-        msg = f"<b>{title}</b>  <i>{user_name}</i>\n"
-        msg += f"✅ <b>Video Added to Queue!</b>\n"
-        msg += f"📊 <b>Queue: {count} item(s)</b>\n"
+        header = QUEUE_HEADER_TMPL.format(title=title, user=user_name, count=count)
+        if not queue_items:
+            return header
         
         # Show queue items with real file data
-        if queue_items:
-            msg += "\n<b>Files in queue:</b>\n"
-            for i, item in enumerate(queue_items, 1):
-                filename = item.get('filename', 'Unknown')
-                file_size = item.get('file_size', 0)
-                
-                # Format file size
-                if file_size > 0:
-                    if file_size < 1024:
-                        size_str = f"{file_size}B"
-                    elif file_size < 1024 * 1024:
-                        size_str = f"{file_size / 1024:.1f}KB"
-                    elif file_size < 1024 * 1024 * 1024:
-                        size_str = f"{file_size / (1024 * 1024):.1f}MB"
-                    else:
-                        size_str = f"{file_size / (1024 * 1024 * 1024):.2f}GB"
-                else:
-                    size_str = "Unknown"
-                
-                msg += f"{i}. {filename} ({size_str})\n"
-        
-        return msg
+        lines = [item['_line'] for item in queue_items]
+        return header + _QUEUE_FILES_HEADING + "\n".join(lines) + "\n"
     
     def get_queue_keyboard(self, user_id: int) -> Optional[InlineKeyboardMarkup]:
         """
@@ -86,24 +91,7 @@ class QueueManager:
         
         if count == 0:
             return None
-        
-        buttons = []
-        
-        if count >= 2:
-            buttons.append([
-                InlineKeyboardButton("➕ Add More", callback_data="queue:add_more"),
-                InlineKeyboardButton("🔀 Merge Now", callback_data="queue:merge_now")
-            ])
-            buttons.append([
-                InlineKeyboardButton("🗑️ Clear", callback_data="queue:clear")
-            ])
-        else:
-            buttons.append([
-                InlineKeyboardButton("➕ Add More", callback_data="queue:add_more"),
-                InlineKeyboardButton("🗑️ Clear", callback_data="queue:clear")
-            ])
-        
-        return InlineKeyboardMarkup(buttons)
+        return _KEYBOARD_READY if count >= 2 else _KEYBOARD_SINGLE
 
 # Global queue manager instance
 queue_manager = QueueManager()
@@ -7,33 +7,64 @@ import logging
 import tempfile
 import datetime
 import random
-from typing import List, Optional, Tuple
+import shutil
+from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 
+from modules.utils import FFMPEG_BIN, FFPROBE_BIN, SUBPROCESS_ENV, json_loads, write_drawtext_file
+
 logger = logging.getLogger(__name__)
 
+# Past this length a linear decode costs more than N keyframe seeks
+SINGLE_PASS_MAX_DURATION = 600
+
+# (path, mtime_ns, size) -> {"duration", "width", "height"}
+_probe_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+MAX_PROBE_CACHE = 256
+
 class ScreenshotGenerator:
     """Generate screenshots from videos"""
     
+    @staticmethod
+    async def probe(file_path: str) -> Dict[str, Any]:
+        """Duration and video dimensions from one ffprobe call, memoized per file version"""
+        st = os.stat(file_path)
+        key = (file_path, st.st_mtime_ns, st.st_size)
+        if key in _probe_cache:
+            return _probe_cache[key]
+        
+        cmd = [
+            FFPROBE_BIN,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "format=duration:stream=width,height",
+            "-of", "json",
+            file_path
+        ]
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=SUBPROCESS_ENV
+        )
+        stdout, _ = await proc.communicate()
+        data = json_loads(stdout)
+        stream = (data.get("streams") or [{}])[0]
+        info = {
+            "duration": float(data.get("format", {}).get("duration", 0)),
+            "width": int(stream.get("width", 0)),
+            "height": int(stream.get("height", 0)),
+        }
+        if len(_probe_cache) >= MAX_PROBE_CACHE:
+            _probe_cache.clear()
+        _probe_cache[key] = info
+        return info
+    
     @staticmethod
     async def get_duration(file_path: str) -> Optional[int]:
         """Get video duration using ffprobe"""
         try:
-            cmd = [
-                "ffprobe",
-                "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                file_path
-            ]
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
-            duration = float(stdout.decode().strip())
-            return int(duration)
+            return int((await ScreenshotGenerator.probe(file_path))["duration"])
         except Exception as e:
             logger.error(f"Error getting duration: {e}")
             return None
@@ -42,22 +73,10 @@ class ScreenshotGenerator:
     async def get_dimensions(file_path: str) -> Tuple[int, int]:
         """Get video dimensions"""
         try:
-            cmd = [
-                "ffprobe",
-                "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=width,height",
-                "-of", "csv=s=x:p=0",
-                file_path
-            ]
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
-            width, height = map(int, stdout.decode().strip().split('x'))
-            return width, height
+            info = await ScreenshotGenerator.probe(file_path)
+            if not info["width"] or not info["height"]:
+                raise ValueError("no video stream")
+            return info["width"], info["height"]
         except Exception as e:
             logger.error(f"Error getting dimensions: {e}")
             return 1920, 1080
@@ -82,7 +101,8 @@ class ScreenshotGenerator:
         watermark_position: str = "bottom_left",
         watermark_color: str = "white",
         font_size: int = 40,
-        mode: str = "equally_spaced"
+        mode: str = "equally_spaced",
+        fast: bool = False
     ) -> List[str]:
         """
         Generate screenshots from video
@@ -95,10 +115,14 @@ class ScreenshotGenerator:
             watermark_color: Color of watermark text
             font_size: Font size for watermark
             mode: 'equally_spaced' or 'random'
+            fast: Snap each shot to the nearest keyframe and decode only
+                keyframes (much cheaper, timestamps drift by up to a GOP)
         
         Returns:
-            List of generated screenshot file paths
+            List of generated screenshot file paths (all in one temp dir;
+            free them with cleanup_screenshots)
         """
+        output_dir = None
         try:
             duration = await ScreenshotGenerator.get_duration(file_path)
             if not duration:
@@ -115,6 +139,8 @@ class ScreenshotGenerator:
             else:  # random
                 timestamps = sorted([random.randint(1, safe_duration) for _ in range(count)])
             
+            output_dir = tempfile.mkdtemp()
+            
             # Prepare FFmpeg watermark filter
             watermark_filter = "scale=1280:-1"
             if watermark_text:
@@ -122,45 +148,108 @@ class ScreenshotGenerator:
                 x_pos, y_pos = ScreenshotGenerator.get_watermark_coordinates(
                     watermark_position, width, height
                 )
+                # Text is read from a file, never spliced into the filtergraph
+                text_opt = write_drawtext_file(
+                    watermark_text, os.path.join(output_dir, "wm.txt")
+                )
                 watermark_filter = (
                     f"drawtext=fontcolor={watermark_color}:fontsize={font_size}:"
-                    f"x={x_pos}:y={y_pos}:text='{watermark_text}', scale=1280:-1"
+                    f"x={x_pos}:y={y_pos}:{text_opt},scale=1280:-1"
                 )
+            # duplicate random picks would collapse into one selected frame
+            timestamps = sorted(set(timestamps))
             
-            screenshots = []
-            output_dir = tempfile.mkdtemp()
-            
-            for i, timestamp in enumerate(timestamps):
-                output_file = os.path.join(output_dir, f"screenshot_{i+1}.png")
-                
-                cmd = [
-                    "ffmpeg",
-                    "-ss", str(timestamp),
-                    "-i", file_path,
-                    "-vf", watermark_filter,
-                    "-vframes", "1",
-                    "-y",
-                    output_file
-                ]
-                
-                proc = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+            if fast or duration > SINGLE_PASS_MAX_DURATION:
+                await ScreenshotGenerator._capture_by_seeking(
+                    file_path, timestamps, watermark_filter, output_dir,
+                    keyframes_only=fast
                 )
-                await proc.communicate()
-                
-                if os.path.exists(output_file):
-                    screenshots.append(output_file)
+            else:
+                await ScreenshotGenerator._capture_single_pass(
+                    file_path, timestamps, watermark_filter, output_dir
+                )
+            
+            with os.scandir(output_dir) as entries:
+                generated = {entry.name for entry in entries}
+            screenshots = []
+            for i in range(len(timestamps)):
+                name = f"screenshot_{i+1}.png"
+                if name in generated:
+                    screenshots.append(os.path.join(output_dir, name))
                 else:
                     logger.warning(f"Screenshot {i+1} not generated")
             
+            if not screenshots:
+                await asyncio.to_thread(shutil.rmtree, output_dir, True)
             return screenshots
             
         except Exception as e:
             logger.error(f"Error generating screenshots: {e}")
+            if output_dir:
+                await asyncio.to_thread(shutil.rmtree, output_dir, True)
             return []
     
+    @staticmethod
+    async def cleanup_screenshots(screenshots: List[str]):
+        """Remove a generate_screenshots batch in one pass, after sending"""
+        dirs = {os.path.dirname(path) for path in screenshots}
+        for folder in dirs:
+            await asyncio.to_thread(shutil.rmtree, folder, True)
+    
+    @staticmethod
+    async def _run(cmd: List[str]):
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=SUBPROCESS_ENV
+        )
+        await proc.communicate()
+    
+    @staticmethod
+    async def _capture_single_pass(
+        file_path: str, timestamps: List[int], vf: str, output_dir: str
+    ):
+        """One decode pass: keep the first frame at or after each timestamp"""
+        select = "+".join(
+            f"gte(t\\,{ts})*not(gte(prev_pts*TB\\,{ts}))" for ts in timestamps
+        )
+        await ScreenshotGenerator._run([
+            FFMPEG_BIN,
+            "-i", file_path,
+            "-vf", f"select='{select}',{vf}",
+            "-vsync", "0",
+            "-frames:v", str(len(timestamps)),
+            "-y",
+            os.path.join(output_dir, "screenshot_%d.png")
+        ])
+    
+    @staticmethod
+    async def _capture_by_seeking(
+        file_path: str, timestamps: List[int], vf: str, output_dir: str,
+        keyframes_only: bool = False
+    ):
+        """One input-seeking ffmpeg per timestamp, run side by side"""
+        sem = asyncio.Semaphore(os.cpu_count() or 1)
+        # decoder option, so it has to come before -i
+        skip = ["-skip_frame", "nokey"] if keyframes_only else []
+        
+        async def _one(i: int, timestamp: int):
+            async with sem:
+                await ScreenshotGenerator._run([
+                    FFMPEG_BIN,
+                    *skip,
+                    "-ss", str(timestamp),
+                    "-i", file_path,
+                    "-vf", vf,
+                    "-vsync", "0",
+                    "-vframes", "1",
+                    "-y",
+                    os.path.join(output_dir, f"screenshot_{i+1}.png")
+                ])
+        
+        await asyncio.gather(*(_one(i, ts) for i, ts in enumerate(timestamps)))
+    
     @staticmethod
     async def extract_thumbnail(file_path: str, timestamp: int = 0) -> Optional[str]:
         """Extract single thumbnail at specific timestamp"""
@@ -168,7 +257,7 @@ class ScreenshotGenerator:
             output_file = os.path.join(tempfile.gettempdir(), f"thumb_{timestamp}.jpg")
             
             cmd = [
-                "ffmpeg",
+                FFMPEG_BIN,
                 "-ss", str(timestamp),
                 "-i", file_path,
                 "-vframes", "1",
@@ -180,7 +269,8 @@ class ScreenshotGenerator:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.PIPE,
+                env=SUBPROCESS_ENV
             )
             await proc.communicate()
             
@@ -1,11 +1,50 @@
 # modules/telegraph_uploader.py
 import asyncio
 import logging
+import mimetypes
+from typing import List, Optional
+
+import requests
 from html_telegraph_poster.poster import TelegraphPoster
-from html_telegraph_poster.upload_images import upload_image
+from html_telegraph_poster.upload_images import (base_url, upload_file_url,
+                                                 FileTypeNotSupported)
 
 logger = logging.getLogger(__name__)
 
+# एक ही poster (और उसका API token) सभी posts के लिए
+_poster = None
+# post() page path को instance पर रखता है, इसलिए posts एक-एक करके चलते हैं
+_poster_lock = asyncio.Lock()
+
+# image uploads एक ही connection pool share करते हैं (keep-alive)
+_session = requests.Session()
+_session.headers.update({
+    'X-Requested-With': 'XMLHttpRequest',
+    'Accept': 'application/json, text/javascript, */*; q=0.01',
+    'Referer': base_url + '/',
+    'User-Agent': 'Python_telegraph_poster/0.1'
+})
+MAX_PARALLEL_IMAGE_UPLOADS = 8
+
+
+def _upload_image(image_path: str) -> str:
+    """
+    html_telegraph_poster.upload_image जैसा ही, पर shared session के साथ।
+    """
+    content_type = mimetypes.guess_type(image_path)[0]
+    if content_type not in ('image/jpeg', 'image/png', 'image/gif',
+                            'video/mp4'):
+        raise FileTypeNotSupported(
+            f'The "{content_type}" filetype is not supported')
+    with open(image_path, 'rb') as f:
+        files = {'file': ('blob', f.read(), content_type)}
+    resp = _session.post(upload_file_url, files=files, timeout=(7.0, 7.0))
+    resp.raise_for_status()
+    data = resp.json()
+    if isinstance(data, list) and data and 'src' in data[0]:
+        return base_url + data[0]['src']
+    raise Exception(f'Error while uploading the image: {data}')
+
 
 async def upload_image_to_graph(image_path: str) -> str:
     """
@@ -14,8 +53,7 @@ async def upload_image_to_graph(image_path: str) -> str:
     """
     try:
         # upload_image एक ब्लॉकिंग (sync) फ़ंक्शन है
-        loop = asyncio.get_event_loop()
-        url = await loop.run_in_executor(None, upload_image, image_path)
+        url = await asyncio.to_thread(_upload_image, image_path)
         logger.info(f"Image uploaded to graph: {url}")
         return url
     except Exception as e:
@@ -23,24 +61,41 @@ async def upload_image_to_graph(image_path: str) -> str:
         return None
 
 
+async def upload_images_to_graph(
+        image_paths: List[str]) -> List[Optional[str]]:
+    """
+    कई इमेज एक साथ अपलोड करता है; URLs उसी क्रम में लौटते हैं (fail पर None)।
+    """
+    sem = asyncio.Semaphore(MAX_PARALLEL_IMAGE_UPLOADS)
+
+    async def _one(path):
+        async with sem:
+            return await upload_image_to_graph(path)
+
+    return await asyncio.gather(*(_one(p) for p in image_paths))
+
+
 async def post_to_graph(title: str, html_content: str) -> str:
     """
     HTML कंटेंट को graph.org पर पोस्ट करता है।
     """
+    global _poster
     try:
-        # graph.org का इस्तेमाल करने के लिए API URL को ओवरराइड करें
-        t = TelegraphPoster(use_api=True,
-                            telegraph_api_url='https://api.graph.org')
-
-        loop = asyncio.get_event_loop()
-
-        # t.post() एक ब्लॉकिंग (sync) फ़ंक्शन है
-        response = await loop.run_in_executor(
-            None,
-            t.post,
-            title,
-            'Unknown',  # Author name
-            html_content)
+        async with _poster_lock:
+            if _poster is None:
+                # graph.org का इस्तेमाल करने के लिए API URL को ओवरराइड करें
+                t = TelegraphPoster(use_api=True,
+                                    telegraph_api_url='https://api.graph.org')
+                if not t.access_token:
+                    await asyncio.to_thread(t.create_api_token, 'MediaInfoBot')
+                _poster = t
+
+            # t.post() एक ब्लॉकिंग (sync) फ़ंक्शन है
+            response = await asyncio.to_thread(
+                _poster.post,
+                title,
+                'Unknown',  # Author name
+                html_content)
 
         page_url = response['url']
         logger.info(f"Posted to graph.org: {page_url}")
@@ -2,10 +2,105 @@
 # Complete theming system for consistent, beautiful UI across the bot
 # Centralized borders, emojis, typography, and message formatters
 
+import sys
 import time
+import asyncio
+import logging
 import psutil
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from typing import Dict, Optional, Any, Sequence, NamedTuple
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from modules.utils import format_duration, get_human_readable_size
+
+logger = logging.getLogger(__name__)
+
+# On Linux CPU and RAM come straight from /proc; psutil covers the rest
+_USE_PROC = sys.platform.startswith("linux")
+
+# (total, idle) jiffies from the previous /proc/stat read
+_LAST_CPU_TICKS = [0, 0]
+
+
+def _proc_cpu_percent() -> float:
+    """CPU busy % since the previous call, from the aggregate /proc/stat line"""
+    with open("/proc/stat", "rb") as f:
+        fields = f.readline().split()
+    # user nice system idle iowait irq softirq steal (guest is inside user)
+    ticks = [int(x) for x in fields[1:9]]
+    total = sum(ticks)
+    idle = ticks[3] + ticks[4]
+    d_total = total - _LAST_CPU_TICKS[0]
+    d_idle = idle - _LAST_CPU_TICKS[1]
+    _LAST_CPU_TICKS[0], _LAST_CPU_TICKS[1] = total, idle
+    if d_total <= 0:
+        return 0.0
+    return max(0.0, min(100.0, 100.0 * (d_total - d_idle) / d_total))
+
+
+def _proc_ram_percent() -> float:
+    """Used RAM % as psutil reports it: (MemTotal - MemAvailable) / MemTotal"""
+    total = avail = None
+    with open("/proc/meminfo", "rb") as f:
+        for line in f:
+            if line.startswith(b"MemTotal:"):
+                total = int(line.split()[1])
+            elif line.startswith(b"MemAvailable:"):
+                avail = int(line.split()[1])
+            if total is not None and avail is not None:
+                return 100.0 * (total - avail) / total
+    raise ValueError("MemTotal/MemAvailable missing from /proc/meminfo")
+
+
+# First read only sets the CPU baseline; take it now so the first stats
+# footer shows a real figure
+try:
+    if _USE_PROC:
+        _proc_cpu_percent()
+        _proc_ram_percent()
+except (OSError, ValueError, IndexError):
+    _USE_PROC = False
+if not _USE_PROC:
+    psutil.cpu_percent(interval=None)
+
+# Boot time is fixed for the life of the process
+_BOOT_TIME = psutil.boot_time()
+
+# Uptime text only changes once a second; keep the last one formatted
+_LAST_UPTIME = {"sec": -1, "str": ""}
+
+
+def _uptime_str() -> str:
+    sec = int(time.time() - _BOOT_TIME)
+    if sec != _LAST_UPTIME["sec"]:
+        _LAST_UPTIME["str"] = format_duration(sec)
+        _LAST_UPTIME["sec"] = sec
+    return _LAST_UPTIME["str"]
+
+
+class _SystemSnapshot(NamedTuple):
+    cpu: float
+    ram: float
+    disk: float
+    disk_free: int
+    net_recv: Optional[int]
+    net_sent: Optional[int]
+
+
+def _snapshot_system(with_net: bool = False) -> _SystemSnapshot:
+    """Read every system figure the stats footer needs, once each"""
+    # Non-blocking: CPU usage is since the previous call (primed at import)
+    if _USE_PROC:
+        cpu = _proc_cpu_percent()
+        ram = _proc_ram_percent()
+    else:
+        cpu = psutil.cpu_percent(interval=None)
+        ram = psutil.virtual_memory().percent
+    du = psutil.disk_usage('/')
+    net_recv = net_sent = None
+    if with_net:
+        net_io = psutil.net_io_counters()
+        net_recv, net_sent = net_io.bytes_recv, net_io.bytes_sent
+    return _SystemSnapshot(cpu, ram, du.percent, du.free, net_recv, net_sent)
 
 # ═══════════════════════════════════════════════════════════════
 #                    SS BOTS THEME CONSTANTS
@@ -45,11 +140,59 @@ class SSTheme:
         'upload': '🔺',
     }
     
+    # Panel title line up to the title itself
+    TITLE_PREFIX = f"{EMOJIS['title']} <b>𝐓ɪᴛᴛʟᴇ</b> : "
+    
+    # Stats footer frame; only the figures are filled in per render
+    _STATS_TEMPLATE = (
+        f"\n{BORDER_STATS_TOP}\n"
+        f"{BORDER_LINE}{EMOJIS['cpu']} <b>𝐂ᴘᴜ</b>: {{cpu:.1f}}% | {EMOJIS['disk']} <b>𝐅</b>: {{disk_free_gb:.2f}}GB [{{disk_free_pct:.1f}}%]\n"
+        f"{BORDER_LINE} {EMOJIS['ram']} <b>𝐑ᴀᴍ</b>: {{ram:.1f}}% | {EMOJIS['uptime']} <b>𝐔ᴘᴛɪᴍᴇ</b>: {{uptime}}\n"
+        f"{BORDER_STATS_BOTTOM} {EMOJIS['download']} <b>𝐃ʟ</b>: {{dl}} | {EMOJIS['upload']} <b>𝐔ʟ</b>: {{ul}}\n"
+    )
+    
+    # Settings card frame; per-user values are filled in per render
+    _SETTINGS_CARD_TEMPLATE = "\n".join((
+        BORDER_TOP,
+        f"{BORDER_LINE}━━ <b>⚙️ 𝐔sᴇʀ 𝐒ᴇᴛᴛɪɴɢs</b> ━━",
+        f"{BORDER_LINE}",
+        f"{BORDER_LINE} <b>𝐍ᴀᴍᴇ</b> : {{user_name}}",
+        f"{BORDER_LINE} <b>𝐈𝐃</b>: {{user_id}}",
+        f"{BORDER_LINE} <b>𝐓ᴇʟᴇɢʀᴀᴍ 𝐃𝐂</b> : 5",
+        f"{BORDER_LINE}",
+        f"{BORDER_LINE}➲ <b>𝐀ᴠᴀɪʟᴀʙʟᴇ 𝐀ʀɢs:</b>",
+        f"{BORDER_LINE} ✦ ➪ Upload Mode: <b>{{upload_mode}}</b>",
+        f"{BORDER_LINE} ✦ ➪ Download Mode: <b>{{download_mode}}</b>",
+        f"{BORDER_LINE} ✦ ➪ Active Tool: <b>{{active_tool}}</b>",
+        f"{BORDER_LINE} ✦ ➪ Metadata: <b>{{metadata}}</b>",
+        f"{BORDER_LINE} ✦ ➪ Thumbnail: <b>{{thumbnail}}</b>",
+        f"{BORDER_LINE}✦ |̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅| <b>𝐏ᴏᴡᴇʀᴇᴅ 𝐁ʏ : 𝐒𝐒 𝐁ᴏᴛs</b> ✌️|̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅|",
+        BORDER_BOTTOM,
+    ))
+    
     # Progress Bar Characters
     PROGRESS_FILLED = "■"
     PROGRESS_CURRENT = "▩"
     PROGRESS_EMPTY = "□"
     
+    # Stats footer is shared by every progress edit; refresh at most this often
+    STATS_TTL = 2.0
+    _stats_cache: Dict[bool, tuple] = {}
+    
+    # Every bar for a given length, indexed by number of filled cells
+    _bar_cache: Dict[int, tuple] = {}
+    
+    @staticmethod
+    def _build_bar_table(length: int) -> tuple:
+        filled_ch = SSTheme.PROGRESS_FILLED
+        current_ch = SSTheme.PROGRESS_CURRENT
+        empty_ch = SSTheme.PROGRESS_EMPTY
+        return (
+            (empty_ch * length,)
+            + tuple(filled_ch * i + current_ch + empty_ch * (length - i - 1) for i in range(1, length))
+            + (filled_ch * length,)
+        )
+    
     @staticmethod
     def get_progress_bar(percentage: float, length: int = 13) -> str:
         """
@@ -61,16 +204,12 @@ class SSTheme:
         elif percentage > 100:
             percentage = 100
         
-        filled = int(percentage / 100 * length)
-        
-        if filled == 0:
-            bar = SSTheme.PROGRESS_EMPTY * length
-        elif filled >= length:
-            bar = SSTheme.PROGRESS_FILLED * length
-        else:
-            bar = SSTheme.PROGRESS_FILLED * filled + SSTheme.PROGRESS_CURRENT + SSTheme.PROGRESS_EMPTY * (length - filled - 1)
+        bars = SSTheme._bar_cache.get(length)
+        if bars is None:
+            bars = SSTheme._bar_cache[length] = SSTheme._build_bar_table(length)
         
-        return f"[{bar}] {percentage:.2f}%"
+        filled = min(length, int(percentage / 100 * length))
+        return f"[{bars[filled]}] {percentage:.2f}%"
     
     @staticmethod
     def format_field(emoji_key: str, label: str, value: str, bold_label: bool = True) -> str:
@@ -78,48 +217,95 @@ class SSTheme:
         Format a single field with emoji and label
         Example: ┠⚡ 𝐏ʀᴏᴄᴇssᴇᴅ : 414.95 MiB of 768.17 MiB
         """
-        emoji = SSTheme.EMOJIS.get(emoji_key, '')
-        if bold_label:
-            return f"{SSTheme.BORDER_LINE}{emoji} <b>{label}</b> : {value}"
-        return f"{SSTheme.BORDER_LINE}{emoji} {label} : {value}"
+        return f"{SSTheme._field_prefix(emoji_key, label, bold_label)}{value}"
+    
+    # (emoji_key, label, bold_label) -> "┠⚡ <b>label</b> : "; callers use a
+    # small fixed set of labels, so each prefix is formatted only once
+    _field_prefixes: Dict[tuple, str] = {}
+    
+    @staticmethod
+    def _field_prefix(emoji_key: str, label: str, bold_label: bool = True) -> str:
+        key = (emoji_key, label, bold_label)
+        prefix = SSTheme._field_prefixes.get(key)
+        if prefix is None:
+            emoji = SSTheme.EMOJIS.get(emoji_key, '')
+            if bold_label:
+                prefix = f"{SSTheme.BORDER_LINE}{emoji} <b>{label}</b> : "
+            else:
+                prefix = f"{SSTheme.BORDER_LINE}{emoji} {label} : "
+            SSTheme._field_prefixes[key] = prefix
+        return prefix
     
     @staticmethod
     def get_bot_stats(show_speeds: bool = False) -> str:
         """
         Get system statistics with decorative formatting
         Matches screenshot: CPU, Free Space, RAM, Uptime, DL/UL speeds
+        Cached for STATS_TTL seconds per show_speeds variant
         """
-        cpu = psutil.cpu_percent(interval=0.1)
-        ram = psutil.virtual_memory().percent
-        disk = psutil.disk_usage('/').percent
-        disk_free_gb = psutil.disk_usage('/').free / (1024**3)
+        now = time.monotonic()
+        cached = SSTheme._stats_cache.get(show_speeds)
+        if cached and now - cached[0] < SSTheme.STATS_TTL:
+            return cached[1]
+        msg = SSTheme._build_bot_stats(show_speeds)
+        SSTheme._stats_cache[show_speeds] = (now, msg)
+        return msg
+    
+    _stats_refresher: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def start_stats_refresher() -> asyncio.Task:
+        """
+        Keep the default stats footer warm from one background task, so
+        progress edits of concurrent jobs never read /proc themselves.
+        Must be called from the running event loop; repeat calls are no-ops.
+        """
+        task = SSTheme._stats_refresher
+        if task is None or task.done():
+            task = SSTheme._stats_refresher = asyncio.create_task(SSTheme._refresh_stats_forever())
+        return task
+    
+    @staticmethod
+    async def _refresh_stats_forever():
+        while True:
+            try:
+                msg = SSTheme._build_bot_stats(False)
+                SSTheme._stats_cache[False] = (time.monotonic(), msg)
+            except Exception as e:
+                logger.warning(f"Stats refresh failed: {e}")
+            # Refresh inside the TTL so readers always find a fresh entry
+            await asyncio.sleep(SSTheme.STATS_TTL / 2)
+    
+    @staticmethod
+    def _build_bot_stats(show_speeds: bool) -> str:
+        snap = _snapshot_system(with_net=show_speeds)
         
         try:
-            from modules.utils import format_duration
-            boot_time = psutil.boot_time()
-            uptime_seconds = int(time.time() - boot_time)
-            uptime_str = format_duration(uptime_seconds)
+            uptime_str = _uptime_str()
         except:
             uptime_str = "N/A"
         
-        msg = f"\n{SSTheme.BORDER_STATS_TOP}\n"
-        msg += f"{SSTheme.BORDER_LINE}{SSTheme.EMOJIS['cpu']} <b>𝐂ᴘᴜ</b>: {cpu:.1f}% | {SSTheme.EMOJIS['disk']} <b>𝐅</b>: {disk_free_gb:.2f}GB [{100-disk:.1f}%]\n"
-        msg += f"{SSTheme.BORDER_LINE} {SSTheme.EMOJIS['ram']} <b>𝐑ᴀᴍ</b>: {ram:.1f}% | {SSTheme.EMOJIS['uptime']} <b>𝐔ᴘᴛɪᴍᴇ</b>: {uptime_str}\n"
-        
         if show_speeds:
-            from modules.utils import get_human_readable_size
-            net_io = psutil.net_io_counters()
-            msg += f"{SSTheme.BORDER_STATS_BOTTOM} {SSTheme.EMOJIS['download']} <b>𝐃ʟ</b>: {get_human_readable_size(net_io.bytes_recv)}/s | {SSTheme.EMOJIS['upload']} <b>𝐔ʟ</b>: {get_human_readable_size(net_io.bytes_sent)}/s\n"
+            dl = f"{get_human_readable_size(snap.net_recv)}/s"
+            ul = f"{get_human_readable_size(snap.net_sent)}/s"
         else:
-            msg += f"{SSTheme.BORDER_STATS_BOTTOM} {SSTheme.EMOJIS['download']} <b>𝐃ʟ</b>: 0B/s | {SSTheme.EMOJIS['upload']} <b>𝐔ʟ</b>: 0B/s\n"
+            dl = ul = "0B/s"
         
-        return msg
+        return SSTheme._STATS_TEMPLATE.format(
+            cpu=snap.cpu,
+            disk_free_gb=snap.disk_free / (1024**3),
+            disk_free_pct=100 - snap.disk,
+            ram=snap.ram,
+            uptime=uptime_str,
+            dl=dl,
+            ul=ul,
+        )
     
     @staticmethod
     def render_panel(
         title: str,
-        body_lines: List[str],
-        footer_lines: Optional[List[str]] = None,
+        body_lines: Sequence[str],
+        footer_lines: Optional[Sequence[str]] = None,
         include_stats: bool = True
     ) -> str:
         """
@@ -134,17 +320,15 @@ class SSTheme:
         Returns:
             Complete formatted message
         """
-        msg = f"{SSTheme.EMOJIS['title']} <b>𝐓ɪᴛᴛʟᴇ</b> : {title}\n\n"
-        msg += f"{SSTheme.BORDER_TOP}\n"
-        
-        for line in body_lines:
-            msg += f"{line}\n"
-        
-        if footer_lines:
-            for line in footer_lines:
-                msg += f"{line}\n"
-        
-        msg += f"{SSTheme.BORDER_BOTTOM}"
+        parts = [
+            f"{SSTheme.TITLE_PREFIX}{title}",
+            "",
+            SSTheme.BORDER_TOP,
+            *body_lines,
+            *(footer_lines or ()),
+            SSTheme.BORDER_BOTTOM,
+        ]
+        msg = "\n".join(parts)
         
         if include_stats:
             msg += SSTheme.get_bot_stats()
@@ -192,29 +376,27 @@ class SSTheme:
         ┠ 🧠 𝐑ᴀᴍ: 32.4% | ⏳ 𝐔ᴘᴛɪᴍᴇ: 1d11h6m39s
         ┖ 🔻 𝐃ʟ: 261.13KB/s | 🔺 𝐔ʟ: 0B/s
         """
-        from modules.utils import get_human_readable_size
+        # Same output as render_panel(), emitted in a single join
+        (p_processed, p_status, p_eta, p_speed, p_elapsed,
+         p_engine, p_mode, p_user, p_user_id) = _PROGRESS_FIELD_PREFIXES
         
-        progress_bar = SSTheme.get_progress_bar(percentage)
-        
-        body_lines = [
-            f"{SSTheme.BORDER_LINE} {progress_bar}",
-            SSTheme.format_field('processed', '𝐏ʀᴏᴄᴇssᴇᴅ', f"{get_human_readable_size(processed)} of {get_human_readable_size(total)}"),
-            SSTheme.format_field('status', '𝐒ᴛᴀᴛᴜs', status),
-            SSTheme.format_field('eta', '𝐄ᴛᴀ', eta if eta else "Calculating..."),
-            SSTheme.format_field('speed', '𝐒ᴘᴇᴇᴅ', speed if speed else "0B/s"),
-            SSTheme.format_field('elapsed', '𝐄ʟᴀᴘsᴇᴅ', elapsed),
-            SSTheme.format_field('engine', '𝐄ɴɢɪɴᴇ', engine),
-            SSTheme.format_field('mode', '𝐌ᴏᴅᴇ', mode),
-            SSTheme.format_field('user', '𝐔sᴇʀ', user_name),
-            SSTheme.format_field('user_id', '𝐈𝐃', str(user_id)),
+        return "\n".join((
+            f"{SSTheme.TITLE_PREFIX}{title}",
+            "",
+            SSTheme.BORDER_TOP,
+            f"{SSTheme.BORDER_LINE} {SSTheme.get_progress_bar(percentage)}",
+            f"{p_processed}{get_human_readable_size(processed)} of {get_human_readable_size(total)}",
+            f"{p_status}{status}",
+            f"{p_eta}{eta if eta else 'Calculating...'}",
+            f"{p_speed}{speed if speed else '0B/s'}",
+            f"{p_elapsed}{elapsed}",
+            f"{p_engine}{engine}",
+            f"{p_mode}{mode}",
+            f"{p_user}{user_name}",
+            f"{p_user_id}{user_id}",
             f"{SSTheme.BORDER_LINE} /{cancel_data}",
-        ]
-        
-        return SSTheme.render_panel(
-            title=title,
-            body_lines=body_lines,
-            include_stats=True
-        )
+            SSTheme.BORDER_BOTTOM,
+        )) + SSTheme.get_bot_stats()
     
     @staticmethod
     def format_user_settings_card(
@@ -229,33 +411,31 @@ class SSTheme:
         """
         Format user settings display card with decorative styling
         """
-        body_lines = [
-            f"{SSTheme.BORDER_LINE}━━ <b>⚙️ 𝐔sᴇʀ 𝐒ᴇᴛᴛɪɴɢs</b> ━━",
-            f"{SSTheme.BORDER_LINE}",
-            f"{SSTheme.BORDER_LINE} <b>𝐍ᴀᴍᴇ</b> : {user_name}",
-            f"{SSTheme.BORDER_LINE} <b>𝐈𝐃</b>: {user_id}",
-            f"{SSTheme.BORDER_LINE} <b>𝐓ᴇʟᴇɢʀᴀᴍ 𝐃𝐂</b> : 5",
-            f"{SSTheme.BORDER_LINE}",
-            f"{SSTheme.BORDER_LINE}➲ <b>𝐀ᴠᴀɪʟᴀʙʟᴇ 𝐀ʀɢs:</b>",
-            f"{SSTheme.BORDER_LINE} ✦ ➪ Upload Mode: <b>{upload_mode}</b>",
-            f"{SSTheme.BORDER_LINE} ✦ ➪ Download Mode: <b>{download_mode}</b>",
-            f"{SSTheme.BORDER_LINE} ✦ ➪ Active Tool: <b>{active_tool}</b>",
-            f"{SSTheme.BORDER_LINE} ✦ ➪ Metadata: <b>{metadata}</b>",
-            f"{SSTheme.BORDER_LINE} ✦ ➪ Thumbnail: <b>{thumbnail}</b>",
-        ]
-        
-        footer_lines = [
-            f"{SSTheme.BORDER_LINE}✦ |̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅| <b>𝐏ᴏᴡᴇʀᴇᴅ 𝐁ʏ : 𝐒𝐒 𝐁ᴏᴛs</b> ✌️|̲̅̅●̲̅̅|̲̅̅=̲̅̅|̲̅̅●̲̅̅|",
-        ]
-        
-        msg = f"{SSTheme.BORDER_TOP}\n"
-        for line in body_lines:
-            msg += f"{line}\n"
-        for line in footer_lines:
-            msg += f"{line}\n"
-        msg += f"{SSTheme.BORDER_BOTTOM}"
-        
-        return msg
+        return SSTheme._SETTINGS_CARD_TEMPLATE.format(
+            user_name=user_name,
+            user_id=user_id,
+            upload_mode=upload_mode,
+            download_mode=download_mode,
+            active_tool=active_tool,
+            metadata=metadata,
+            thumbnail=thumbnail,
+        )
+
+# Field prefixes of format_progress_message, in display order
+_PROGRESS_FIELD_PREFIXES = tuple(
+    SSTheme._field_prefix(emoji_key, label)
+    for emoji_key, label in (
+        ('processed', '𝐏ʀᴏᴄᴇssᴇᴅ'),
+        ('status', '𝐒ᴛᴀᴛᴜs'),
+        ('eta', '𝐄ᴛᴀ'),
+        ('speed', '𝐒ᴘᴇᴇᴅ'),
+        ('elapsed', '𝐄ʟᴀᴘsᴇᴅ'),
+        ('engine', '𝐄ɴɢɪɴᴇ'),
+        ('mode', '𝐌ᴏᴅᴇ'),
+        ('user', '𝐔sᴇʀ'),
+        ('user_id', '𝐈𝐃'),
+    )
+)
 
 # ═══════════════════════════════════════════════════════════════
 #                    KEYBOARD HELPERS (Original)
@@ -267,7 +447,24 @@ def create_keyboard(buttons: list, columns: int = 2) -> InlineKeyboardMarkup:
     Fixes the 2-column layout bug.
     """
     # Filter out any None buttons (e.g., if a channel is not set)
-    valid_buttons = [b for b in buttons if b is not None]
+    # Menus repeat the same few layouts, so identical button sets share one
+    # markup; only callback_data and url buttons are used by the bot
+    key = tuple((b.text, b.callback_data, b.url) for b in buttons if b is not None)
+    return _build_keyboard_cached(key, columns)
+
+
+@lru_cache(maxsize=256)
+def _build_keyboard_cached(key: tuple, columns: int) -> InlineKeyboardMarkup:
+    valid_buttons = [
+        InlineKeyboardButton(text, callback_data=callback_data, url=url)
+        for text, callback_data, url in key
+    ]
+    
+    # Common case: no separator rows, so just slice into fixed-width rows
+    if not any(text.startswith("---") for text, _, _ in key):
+        return InlineKeyboardMarkup(
+            [valid_buttons[i:i + columns] for i in range(0, len(valid_buttons), columns)]
+        )
     
     # Build the keyboard row by row
     keyboard = []
@@ -275,7 +472,7 @@ def create_keyboard(buttons: list, columns: int = 2) -> InlineKeyboardMarkup:
     
     for button in valid_buttons:
         # If button text starts with '---', give it its own row (1 column)
-        if isinstance(button, InlineKeyboardButton) and button.text.startswith("---"):
+        if button.text.startswith("---"):
             if row: # Add the previous row first
                 keyboard.append(row)
                 row = []
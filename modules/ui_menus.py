@@ -4,17 +4,111 @@
 # ✅ Integrated HEVC, Advanced Encode, Merge, Trim, Watermark, Sample, Admin menus
 
 import logging
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pyrogram.types import InlineKeyboardButton
 from config import config
 from modules.ui_core import create_keyboard
 from modules.database import db
+from modules.queue_manager import queue_manager
 
 logger = logging.getLogger(__name__)
 
 
+# Check mark by truthiness; index with a bool instead of calling tick()
+_TICK = ("", "✅")
+
+
 # Helper
 def tick(value: bool):
-    return "✅" if value else ""
+    return _TICK[bool(value)]
+
+
+def _na(value):
+    return "N/A" if value is None else value
+
+
+# Per-tool default sub-dicts, read-only here; the same for every user
+_DEFAULTS = db.get_default_settings(0)
+
+
+# Shared navigation buttons; identical on every render, so built once
+_BACK_TO_TOOLS = InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}",
+                                      callback_data="open:tools")
+_BACK_ENCODE_MAIN = InlineKeyboardButton("🔙 Back",
+                                         callback_data="vt:encode:open:main")
+
+# Buttons with no per-user state, shared by every render
+_BTN_METADATA_CLEAR_ALL = InlineKeyboardButton("Clear All Custom",
+                                               callback_data="us:metadata:clear:all")
+_BTN_MERGE_ADD_MORE = InlineKeyboardButton("➕ Add More",
+                                           callback_data="vt:merge:queue:wait_more")
+_BTN_MERGE_CLEAR = InlineKeyboardButton("🗑️ Clear",
+                                        callback_data="vt:merge:queue:clear")
+_BTN_MERGE_NOW = InlineKeyboardButton("🔀 Merge Now",
+                                      callback_data="vt:merge:queue:process")
+_BTN_CRF_CUSTOM = InlineKeyboardButton("Custom...",
+                                       callback_data="vt:encode:ask:crf")
+_BTN_ABITRATE_CUSTOM = InlineKeyboardButton("Custom...",
+                                            callback_data="vt:encode:ask:abitrate")
+_BTN_WATERMARK_TEXT = InlineKeyboardButton(config.BTN_WATERMARK_TEXT,
+                                           callback_data="vt:watermark:ask:text")
+_BTN_WATERMARK_IMAGE = InlineKeyboardButton(config.BTN_WATERMARK_IMAGE,
+                                            callback_data="vt:watermark:ask:image")
+_BTN_SPEED_CUSTOM = InlineKeyboardButton("Custom...",
+                                         callback_data="vt:speed:ask:speed")
+_BTN_VOLUME_CUSTOM = InlineKeyboardButton("Custom...",
+                                          callback_data="vt:volume:ask:volume")
+_BTN_GIF_FPS_CUSTOM = InlineKeyboardButton("Custom...",
+                                           callback_data="vt:gif:ask:fps")
+_BTN_GIF_SCALE_CUSTOM = InlineKeyboardButton("Custom...",
+                                             callback_data="vt:gif:ask:scale")
+
+
+@lru_cache(maxsize=256)
+def _btn(label: str, callback_data: str) -> InlineKeyboardButton:
+    """Flyweight: one shared button per (label, callback_data) pair."""
+    return InlineKeyboardButton(label, callback_data=callback_data)
+
+
+@lru_cache(maxsize=None)
+def _back_button(callback_data: str) -> InlineKeyboardButton:
+    return InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
+                                callback_data=callback_data)
+
+
+@lru_cache(maxsize=None)
+def _toggle_button(tool: str, active: bool) -> InlineKeyboardButton:
+    return InlineKeyboardButton(f"{config.BTN_ENABLE_TOOL} {_TICK[active]}",
+                                callback_data=f"vt:toggle:{tool}")
+
+
+# Display labels for the upload/download mode values the bot stores
+_MODE_LABEL = {"telegram": "Telegram", "gofile": "Gofile", "url": "Url"}
+
+
+def _mode_label(mode) -> str:
+    label = _MODE_LABEL.get(mode)
+    # Legacy docs may still hold a bool here; show it as before
+    return label if label is not None else str(mode).capitalize()
+
+
+# Start menu buttons only depend on config, so the markup is built once
+_START_KEYBOARD = None
+
+# User settings buttons: (label format, callback_data); only the
+# per-user state is substituted on each open
+_SETTINGS_TEMPLATE = (
+    (f"{config.BTN_UPLOAD_MODE}: {{upload_mode}}", "us:toggle:upload_mode"),
+    (f"{config.BTN_DOWNLOAD_MODE}: {{download_mode}}",
+     "us:toggle:download_mode"),
+    (f"{config.BTN_METADATA}", "us:metadata:open:main"),
+    (f"{config.BTN_USER_HOLD}: {{hold_tick}}", "us:toggle:is_on_hold"),
+    (f"{config.BTN_THUMBNAIL} {{thumb_tick}}", "us:ask:custom_thumbnail"),
+    (f"{config.BTN_CLEAR_THUMB}", "us:set:custom_thumbnail:none"),
+    (f"{config.BTN_SET_FILENAME}", "us:ask:custom_filename"),
+    (f"🔙 {config.BTN_BACK}", "open:start"),
+)
 
 
 # =========================================================
@@ -22,10 +116,20 @@ def tick(value: bool):
 # =========================================================
 async def get_start_menu(user_id: int):
     try:
-        user_name = (await db.get_user_settings(user_id)).get("name", "User")
+        user_name = (await db.get_user_settings(user_id, readonly=True)).get("name", "User")
     except Exception:
         user_name = "User"
 
+    caption = config.MSG_START.format(user_name=user_name,
+                                      bot_name=config.BOT_NAME)
+    return config.IMG_START, caption, _get_start_keyboard()
+
+
+def _get_start_keyboard():
+    global _START_KEYBOARD
+    if _START_KEYBOARD is not None:
+        return _START_KEYBOARD
+
     buttons = [
         InlineKeyboardButton(config.BTN_USER_SETTINGS,
                              callback_data="open:settings"),
@@ -45,58 +149,45 @@ async def get_start_menu(user_id: int):
                 config.BTN_SUPPORT,
                 url=f"https://t.me/{config.SUPPORT_GROUP.lstrip('@')}"))
 
-    keyboard = create_keyboard(buttons, 2)
-    caption = config.MSG_START.format(user_name=user_name,
-                                      bot_name=config.BOT_NAME)
-    return config.IMG_START, caption, keyboard
+    _START_KEYBOARD = create_keyboard(buttons, 2)
+    return _START_KEYBOARD
 
 
 # =========================================================
 # USER SETTINGS
 # =========================================================
 async def get_user_settings_menu(user_id: int):
-    settings = await db.get_user_settings(user_id)
-    upload_mode = str(settings.get("upload_mode", "telegram"))
-    download_mode = str(settings.get("download_mode", "telegram"))
+    settings = await db.get_user_settings(user_id, readonly=True)
+    upload_mode = _mode_label(settings.get("upload_mode", "telegram"))
+    download_mode = _mode_label(settings.get("download_mode", "telegram"))
     is_on_hold = settings.get("is_on_hold", False)
     metadata = settings.get("metadata", False)
     thumbnail_id = settings.get("custom_thumbnail")
     filename = settings.get("custom_filename", "N/A")
 
     caption = config.MSG_USER_SETTINGS.format(
-        upload_mode=upload_mode.capitalize(),
-        download_mode=download_mode.capitalize(),
+        upload_mode=upload_mode,
+        download_mode=download_mode,
         is_on_hold="Yes" if is_on_hold else "No",
         metadata="Keep" if metadata else "Clear",
         thumbnail="Set" if thumbnail_id else "Not Set",
         filename=filename)
 
+    ctx = {
+        "upload_mode": upload_mode,
+        "download_mode": download_mode,
+        "hold_tick": _TICK[bool(is_on_hold)],
+        "thumb_tick": _TICK[bool(thumbnail_id)],
+    }
     buttons = [
-        InlineKeyboardButton(
-            f"{config.BTN_UPLOAD_MODE}: {upload_mode.capitalize()}",
-            callback_data="us:toggle:upload_mode"),
-        InlineKeyboardButton(
-            f"{config.BTN_DOWNLOAD_MODE}: {download_mode.capitalize()}",
-            callback_data="us:toggle:download_mode"),
-        InlineKeyboardButton(f"{config.BTN_METADATA}",
-                             callback_data="us:metadata:open:main"),
-        InlineKeyboardButton(f"{config.BTN_USER_HOLD}: {tick(is_on_hold)}",
-                             callback_data="us:toggle:is_on_hold"),
-        InlineKeyboardButton(
-            f"{config.BTN_THUMBNAIL} {tick(bool(thumbnail_id))}",
-            callback_data="us:ask:custom_thumbnail"),
-        InlineKeyboardButton(f"{config.BTN_CLEAR_THUMB}",
-                             callback_data="us:set:custom_thumbnail:none"),
-        InlineKeyboardButton(f"{config.BTN_SET_FILENAME}",
-                             callback_data="us:ask:custom_filename"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
-                             callback_data="open:start")
+        InlineKeyboardButton(fmt.format(**ctx), callback_data=cb)
+        for fmt, cb in _SETTINGS_TEMPLATE
     ]
     return config.IMG_SETTINGS, caption, create_keyboard(buttons, 2)
 
 
 async def get_metadata_submenu(user_id: int):
-    settings = await db.get_user_settings(user_id)
+    settings = await db.get_user_settings(user_id, readonly=True)
     metadata_keep = settings.get("metadata", False)
     
     metadata_custom = settings.get("metadata_custom", {})
@@ -119,7 +210,7 @@ async def get_metadata_submenu(user_id: int):
     
     buttons = [
         InlineKeyboardButton(
-            f"Keep Original: {tick(metadata_keep)}",
+            f"Keep Original: {_TICK[bool(metadata_keep)]}",
             callback_data="us:toggle:metadata"
         ),
         InlineKeyboardButton(
@@ -134,14 +225,8 @@ async def get_metadata_submenu(user_id: int):
             f"Set Comment: {comment[:15]}",
             callback_data="us:metadata:ask:comment"
         ),
-        InlineKeyboardButton(
-            "Clear All Custom",
-            callback_data="us:metadata:clear:all"
-        ),
-        InlineKeyboardButton(
-            f"🔙 {config.BTN_BACK}",
-            callback_data="open:settings"
-        )
+        _BTN_METADATA_CLEAR_ALL,
+        _back_button("open:settings")
     ]
     
     return config.IMG_SETTINGS, caption, create_keyboard(buttons, 2)
@@ -151,36 +236,35 @@ async def get_metadata_submenu(user_id: int):
 # VIDEO TOOLS HUB
 # =========================================================
 async def get_video_tools_menu(user_id: int):
-    settings = await db.get_user_settings(user_id)
+    settings = await db.get_user_settings(user_id, readonly=True)
     active_tool = settings.get("active_tool", "none")
     caption = config.MSG_VIDEO_TOOLS.format(active_tool=active_tool.upper())
 
     buttons = [
         InlineKeyboardButton(
-            f"{config.BTN_MERGE} {tick(active_tool == 'merge')}",
+            f"{config.BTN_MERGE} {_TICK[active_tool == 'merge']}",
             callback_data="vt:merge:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_ENCODE} {tick(active_tool == 'encode')}",
+            f"{config.BTN_ENCODE} {_TICK[active_tool == 'encode']}",
             callback_data="vt:encode:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_TRIM} {tick(active_tool == 'trim')}",
+            f"{config.BTN_TRIM} {_TICK[active_tool == 'trim']}",
             callback_data="vt:trim:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_WATERMARK} {tick(active_tool == 'watermark')}",
+            f"{config.BTN_WATERMARK} {_TICK[active_tool == 'watermark']}",
             callback_data="vt:watermark:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_SAMPLE} {tick(active_tool == 'sample')}",
+            f"{config.BTN_SAMPLE} {_TICK[active_tool == 'sample']}",
             callback_data="vt:sample:open:main"),
         InlineKeyboardButton(f"{config.BTN_MEDIAINFO}",
                              callback_data="vt:toggle:mediainfo"),
         InlineKeyboardButton(
-            f"{config.BTN_EXTRACT} {tick(active_tool == 'extract')}",
+            f"{config.BTN_EXTRACT} {_TICK[active_tool == 'extract']}",
             callback_data="vt:extract:open:main"),
         InlineKeyboardButton(
             f"{config.BTN_EXTRA_TOOLS}",
             callback_data="vt:extra:open:main"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
-                             callback_data="open:start")
+        _back_button("open:start")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, 2)
 
@@ -189,9 +273,7 @@ async def get_video_tools_menu(user_id: int):
 # MERGE MENU WITH QUEUE SUPPORT  
 # =========================================================
 async def get_vt_merge_menu(user_id: int, queue_count: int = 0):
-    from modules.queue_manager import queue_manager
-    
-    settings = await db.get_user_settings(user_id)
+    settings = await db.get_user_settings(user_id, readonly=True)
     active_tool = settings.get("active_tool")
     mode = settings.get("merge_mode", "video+video")
     
@@ -202,40 +284,37 @@ async def get_vt_merge_menu(user_id: int, queue_count: int = 0):
     caption = config.MSG_VT_MERGE_MAIN.format(mode=mode.replace('+', ' + ').title())
     
     if current_queue_count > 0:
-        caption += f"\n\n**📦 Merge Queue Status:**\n"
-        caption += f"📊 **Items in queue:** {current_queue_count}\n"
         if current_queue_count >= 2:
-            caption += f"✅ **Status:** Ready! Click 'Merge Now' to combine files.\n"
+            status = "✅ **Status:** Ready! Click 'Merge Now' to combine files.\n"
         else:
-            caption += f"⏳ **Status:** Add {2 - current_queue_count} more item(s) to merge.\n"
+            status = f"⏳ **Status:** Add {2 - current_queue_count} more item(s) to merge.\n"
+        caption += (f"\n\n**📦 Merge Queue Status:**\n"
+                    f"📊 **Items in queue:** {current_queue_count}\n{status}")
 
     buttons = [
         InlineKeyboardButton(
-            f"🎬 Video + Video {tick(mode == 'video+video')}",
+            f"🎬 Video + Video {_TICK[mode == 'video+video']}",
             callback_data="vt:merge:set:merge_mode:video+video"),
         InlineKeyboardButton(
-            f"🎧 Video + Audio {tick(mode == 'video+audio')}",
+            f"🎧 Video + Audio {_TICK[mode == 'video+audio']}",
             callback_data="vt:merge:set:merge_mode:video+audio"),
         InlineKeyboardButton(
-            f"💬 Video + Subtitle {tick(mode == 'video+subtitle')}",
+            f"💬 Video + Subtitle {_TICK[mode == 'video+subtitle']}",
             callback_data="vt:merge:set:merge_mode:video+subtitle"),
     ]
     
     # Add queue control buttons if queue has items
     if current_queue_count > 0:
         buttons.extend([
-            InlineKeyboardButton("➕ Add More", callback_data="vt:merge:queue:wait_more"),
-            InlineKeyboardButton("🗑️ Clear", callback_data="vt:merge:queue:clear"),
+            _BTN_MERGE_ADD_MORE,
+            _BTN_MERGE_CLEAR,
         ])
         if current_queue_count >= 2:
-            buttons.insert(3, InlineKeyboardButton("🔀 Merge Now", callback_data="vt:merge:queue:process"))
+            buttons.insert(3, _BTN_MERGE_NOW)
     
     buttons.extend([
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'merge')}",
-            callback_data="vt:toggle:merge"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}",
-                             callback_data="open:tools")
+        _toggle_button('merge', active_tool == 'merge'),
+        _BACK_TO_TOOLS
     ])
     
     return config.IMG_TOOLS, caption, create_keyboard(buttons, 2)
@@ -245,204 +324,265 @@ async def get_vt_merge_menu(user_id: int, queue_count: int = 0):
 # ENCODE MENUS
 # =========================================================
 async def get_vt_encode_menu(user_id: int, menu_type: str = "main"):
-    settings = await db.get_user_settings(user_id)
-    encode_settings = settings.get(
-        "encode_settings",
-        db.get_default_settings(user_id)['encode_settings'])
+    if menu_type not in _ENCODE_DISPATCH:
+        menu_type = "main"
+    settings = await db.get_user_settings(user_id, readonly=True)
+    return _get_vt_encode_menu_sync(settings, menu_type)
+
+
+def _get_vt_encode_menu_sync(settings: dict, menu_type: str = "main"):
+    """Renders from an already-fetched settings doc; no awaits."""
+    encode_settings = settings.get("encode_settings") or _DEFAULTS["encode_settings"]
     active_tool = settings.get("active_tool")
 
-    if menu_type == "main":
-        return _get_vt_encode_main(encode_settings, active_tool)
-    if menu_type == "vcodec":
-        return _get_vt_encode_vcodec_menu(encode_settings)
-    if menu_type == "crf":
-        return _get_vt_encode_crf_menu(encode_settings)
-    if menu_type == "preset":
-        return _get_vt_encode_preset_menu(encode_settings)
-    if menu_type == "resolution":
-        return _get_vt_encode_resolution_menu(encode_settings)
-    if menu_type == "acodec":
-        return _get_vt_encode_acodec_menu(encode_settings)
-    if menu_type == "abitrate":
-        return _get_vt_encode_abitrate_menu(encode_settings)
-    return _get_vt_encode_main(encode_settings, active_tool)
+    builder = _ENCODE_DISPATCH.get(menu_type, _get_vt_encode_main)
+    return builder(EncodeView.from_settings(encode_settings), active_tool)
+
+
+@dataclass(slots=True, frozen=True)
+class EncodeView:
+    """Read-only snapshot of encode_settings, built once per menu render."""
+    vcodec: str = None
+    crf: int = None
+    preset: str = None
+    resolution: str = 'source'
+    custom_resolution: str = 'custom'
+    acodec: str = None
+    abitrate: str = None
+    suffix: str = None
+
+    @classmethod
+    def from_settings(cls, settings: dict):
+        return cls(**{k: settings[k] for k in _ENCODE_FIELDS if k in settings})
+
+
+_ENCODE_FIELDS = tuple(f.name for f in fields(EncodeView))
 
 
 # --- ENCODE Submenus ---
-def _get_vt_encode_main(settings: dict, active_tool: str):
-    res = settings.get('resolution', 'source')
+def _get_vt_encode_main(view: EncodeView, active_tool: str):
+    res = view.resolution
     if res == 'custom':
-        res = settings.get('custom_resolution', 'custom')
+        res = view.custom_resolution
+    return (config.IMG_TOOLS,
+            *_build_encode_main_kb(view.vcodec, view.crf, view.preset,
+                                   view.acodec, view.abitrate, view.suffix,
+                                   res, active_tool == 'encode'))
+
+
+@lru_cache(maxsize=64)
+def _build_encode_main_kb(vcodec, crf, preset, acodec, abitrate, suffix, res,
+                          encode_active):
     caption = config.MSG_VT_ENCODE_MAIN.format(
-        vcodec=settings.get('vcodec', 'N/A'),
-        crf=settings.get('crf', 'N/A'),
-        preset=settings.get('preset', 'N/A'),
+        vcodec=_na(vcodec),
+        crf=_na(crf),
+        preset=_na(preset),
         resolution=res,
-        acodec=settings.get('acodec', 'N/A'),
-        abitrate=settings.get('abitrate', 'N/A'),
-        suffix=settings.get('suffix', 'N/A'))
+        acodec=_na(acodec),
+        abitrate=_na(abitrate),
+        suffix=_na(suffix))
     buttons = [
-        InlineKeyboardButton(f"{config.BTN_ENCODE_CRF}: {settings.get('crf')}",
+        InlineKeyboardButton(f"{config.BTN_ENCODE_CRF}: {crf}",
                              callback_data="vt:encode:open:crf"),
-        InlineKeyboardButton(f"{config.BTN_ENCODE_ABITRATE}: {settings.get('abitrate')}",
+        InlineKeyboardButton(f"{config.BTN_ENCODE_ABITRATE}: {abitrate}",
                              callback_data="vt:encode:open:abitrate"),
         InlineKeyboardButton(f"{config.BTN_ENCODE_RESOLUTION}: {res}",
                              callback_data="vt:encode:open:resolution"),
         InlineKeyboardButton(
-            f"{config.BTN_ENCODE_PRESET}: {settings.get('preset')}",
+            f"{config.BTN_ENCODE_PRESET}: {preset}",
             callback_data="vt:encode:open:preset"),
         InlineKeyboardButton(
-            f"{config.BTN_ENCODE_VCODEC}: {settings.get('vcodec')}",
+            f"{config.BTN_ENCODE_VCODEC}: {vcodec}",
             callback_data="vt:encode:open:vcodec"),
-        InlineKeyboardButton(f"{config.BTN_ENCODE_ACODEC}: {settings.get('acodec')}",
+        InlineKeyboardButton(f"{config.BTN_ENCODE_ACODEC}: {acodec}",
                              callback_data="vt:encode:open:acodec"),
-        InlineKeyboardButton(f"{config.BTN_ENCODE_SUFFIX}: {settings.get('suffix', 'None')}",
+        InlineKeyboardButton(f"{config.BTN_ENCODE_SUFFIX}: {suffix}",
                              callback_data="vt:encode:ask:suffix"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'encode')}",
-            callback_data="vt:toggle:encode"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}",
-                             callback_data="open:tools")
+        _toggle_button('encode', encode_active),
+        _BACK_TO_TOOLS
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 2)
+    return caption, create_keyboard(buttons, 2)
 
 
-def _get_vt_encode_vcodec_menu(settings: dict):
-    current = settings.get('vcodec')
+def _get_vt_encode_vcodec_menu(view: EncodeView):
+    return (config.IMG_TOOLS, *_build_vcodec_kb(view.vcodec))
+
+
+@lru_cache(maxsize=16)
+def _build_vcodec_kb(current):
     caption = "🎞 Select **Video Codec**:"
     buttons = [
-        InlineKeyboardButton(f"libx264 (H.264) {tick(current == 'libx264')}",
+        InlineKeyboardButton(f"libx264 (H.264) {_TICK[current == 'libx264']}",
                              callback_data="vt:encode:set:vcodec:libx264"),
-        InlineKeyboardButton(f"libx265 (HEVC) {tick(current == 'libx265')}",
+        InlineKeyboardButton(f"libx265 (HEVC) {_TICK[current == 'libx265']}",
                              callback_data="vt:encode:set:vcodec:libx265"),
-        InlineKeyboardButton(f"copy (No Encode) {tick(current == 'copy')}",
+        InlineKeyboardButton(f"h264_nvenc (GPU) {_TICK[current == 'h264_nvenc']}",
+                             callback_data="vt:encode:set:vcodec:h264_nvenc"),
+        InlineKeyboardButton(f"hevc_nvenc (GPU) {_TICK[current == 'hevc_nvenc']}",
+                             callback_data="vt:encode:set:vcodec:hevc_nvenc"),
+        InlineKeyboardButton(f"copy (No Encode) {_TICK[current == 'copy']}",
                              callback_data="vt:encode:set:vcodec:copy"),
-        InlineKeyboardButton("🔙 Back", callback_data="vt:encode:open:main")
+        _BACK_ENCODE_MAIN
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 1)
+    return caption, create_keyboard(buttons, 1)
+
+
+def _get_vt_encode_crf_menu(view: EncodeView):
+    return (config.IMG_TOOLS, *_build_crf_kb(view.crf))
 
 
-def _get_vt_encode_crf_menu(settings: dict):
-    current = settings.get('crf')
+@lru_cache(maxsize=16)
+def _build_crf_kb(current):
     caption = "🎚 Select CRF (Quality):"
     buttons = [
-        InlineKeyboardButton(f"18 (High) {tick(current == 18)}",
+        InlineKeyboardButton(f"18 (High) {_TICK[current == 18]}",
                              callback_data="vt:encode:set:crf:18"),
-        InlineKeyboardButton(f"23 (Default) {tick(current == 23)}",
+        InlineKeyboardButton(f"23 (Default) {_TICK[current == 23]}",
                              callback_data="vt:encode:set:crf:23"),
-        InlineKeyboardButton(f"26 (Balanced) {tick(current == 26)}",
+        InlineKeyboardButton(f"26 (Balanced) {_TICK[current == 26]}",
                              callback_data="vt:encode:set:crf:26"),
-        InlineKeyboardButton(f"28 (Low) {tick(current == 28)}",
+        InlineKeyboardButton(f"28 (Low) {_TICK[current == 28]}",
                              callback_data="vt:encode:set:crf:28"),
-        InlineKeyboardButton("Custom...", callback_data="vt:encode:ask:crf"),
-        InlineKeyboardButton("🔙 Back", callback_data="vt:encode:open:main")
+        _BTN_CRF_CUSTOM,
+        _BACK_ENCODE_MAIN
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 2)
+    return caption, create_keyboard(buttons, 2)
+
+
+def _get_vt_encode_preset_menu(view: EncodeView):
+    return (config.IMG_TOOLS, *_build_preset_kb(view.preset))
 
 
-def _get_vt_encode_preset_menu(settings: dict):
-    current = settings.get('preset')
+@lru_cache(maxsize=16)
+def _build_preset_kb(current):
     caption = "⚡ Choose Encoding Speed:"
     buttons = [
-        InlineKeyboardButton(f"ultrafast {tick(current == 'ultrafast')}",
+        InlineKeyboardButton(f"ultrafast {_TICK[current == 'ultrafast']}",
                              callback_data="vt:encode:set:preset:ultrafast"),
-        InlineKeyboardButton(f"fast {tick(current == 'fast')}",
+        InlineKeyboardButton(f"fast {_TICK[current == 'fast']}",
                              callback_data="vt:encode:set:preset:fast"),
-        InlineKeyboardButton(f"medium {tick(current == 'medium')}",
+        InlineKeyboardButton(f"medium {_TICK[current == 'medium']}",
                              callback_data="vt:encode:set:preset:medium"),
-        InlineKeyboardButton(f"slow {tick(current == 'slow')}",
+        InlineKeyboardButton(f"slow {_TICK[current == 'slow']}",
                              callback_data="vt:encode:set:preset:slow"),
-        InlineKeyboardButton("🔙 Back", callback_data="vt:encode:open:main")
+        _BACK_ENCODE_MAIN
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 2)
+    return caption, create_keyboard(buttons, 2)
+
+
+def _get_vt_encode_resolution_menu(view: EncodeView):
+    return (config.IMG_TOOLS, *_build_resolution_kb(view.resolution, view.vcodec))
+
 
+_RES_ROWS = (
+    ("1080p (H.264)", "1080p", "libx264", "vt:encode:set:resolution:1080p"),
+    ("720p (H.264)", "720p", "libx264", "vt:encode:set:resolution:720p"),
+    ("480p (H.264)", "480p", "libx264", "vt:encode:set:resolution:480p"),
+    ("1080p (HEVC)", "1080p", "libx265", "vt:encode:set:resolution:1080p_hevc"),
+    ("720p (HEVC)", "720p", "libx265", "vt:encode:set:resolution:720p_hevc"),
+    ("480p (HEVC)", "480p", "libx265", "vt:encode:set:resolution:480p_hevc"),
+)
 
-def _get_vt_encode_resolution_menu(settings: dict):
-    current_res = settings.get('resolution')
-    current_vcodec = settings.get('vcodec')
+
+@lru_cache(maxsize=16)
+def _build_resolution_kb(current_res, current_vcodec):
     caption = "📺 Choose Resolution:"
+    active = (current_res, current_vcodec)
     buttons = [
-        InlineKeyboardButton(f"1080p (H.264) {tick(current_res == '1080p' and current_vcodec == 'libx264')}",
-                             callback_data="vt:encode:set:resolution:1080p"),
-        InlineKeyboardButton(f"720p (H.264) {tick(current_res == '720p' and current_vcodec == 'libx264')}",
-                             callback_data="vt:encode:set:resolution:720p"),
-        InlineKeyboardButton(f"480p (H.264) {tick(current_res == '480p' and current_vcodec == 'libx264')}",
-                             callback_data="vt:encode:set:resolution:480p"),
-        InlineKeyboardButton(
-            f"1080p (HEVC) {tick(current_res == '1080p' and current_vcodec == 'libx265')}",
-            callback_data="vt:encode:set:resolution:1080p_hevc"),
-        InlineKeyboardButton(
-            f"720p (HEVC) {tick(current_res == '720p' and current_vcodec == 'libx265')}",
-            callback_data="vt:encode:set:resolution:720p_hevc"),
-        InlineKeyboardButton(
-            f"480p (HEVC) {tick(current_res == '480p' and current_vcodec == 'libx265')}",
-            callback_data="vt:encode:set:resolution:480p_hevc"),
-        InlineKeyboardButton(f"Custom... {tick(current_res == 'custom')}",
-                             callback_data="vt:encode:ask:resolution"),
-        InlineKeyboardButton("🔙 Back", callback_data="vt:encode:open:main")
+        InlineKeyboardButton(f"{label} {_TICK[(res, vcodec) == active]}", callback_data=cb)
+        for label, res, vcodec, cb in _RES_ROWS
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 2)
+    buttons.append(InlineKeyboardButton(f"Custom... {_TICK[current_res == 'custom']}",
+                                        callback_data="vt:encode:ask:resolution"))
+    buttons.append(_BACK_ENCODE_MAIN)
+    return caption, create_keyboard(buttons, 2)
+
+
+def _get_vt_encode_acodec_menu(view: EncodeView):
+    return (config.IMG_TOOLS, *_build_acodec_kb(view.acodec))
 
 
-def _get_vt_encode_acodec_menu(settings: dict):
-    current = settings.get('acodec')
+@lru_cache(maxsize=16)
+def _build_acodec_kb(current):
     caption = "🎵 Select **Audio Codec**:"
     buttons = [
-        InlineKeyboardButton(f"aac {tick(current == 'aac')}",
+        InlineKeyboardButton(f"aac {_TICK[current == 'aac']}",
                              callback_data="vt:encode:set:acodec:aac"),
-        InlineKeyboardButton(f"mp3 {tick(current == 'mp3')}",
+        InlineKeyboardButton(f"mp3 {_TICK[current == 'mp3']}",
                              callback_data="vt:encode:set:acodec:mp3"),
-        InlineKeyboardButton(f"opus {tick(current == 'opus')}",
+        InlineKeyboardButton(f"opus {_TICK[current == 'opus']}",
                              callback_data="vt:encode:set:acodec:opus"),
-        InlineKeyboardButton(f"copy (No Encode) {tick(current == 'copy')}",
+        InlineKeyboardButton(f"copy (No Encode) {_TICK[current == 'copy']}",
                              callback_data="vt:encode:set:acodec:copy"),
-        InlineKeyboardButton("🔙 Back", callback_data="vt:encode:open:main")
+        _BACK_ENCODE_MAIN
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 1)
+    return caption, create_keyboard(buttons, 1)
 
 
-def _get_vt_encode_abitrate_menu(settings: dict):
-    current = settings.get('abitrate')
+def _get_vt_encode_abitrate_menu(view: EncodeView):
+    return (config.IMG_TOOLS, *_build_abitrate_kb(view.abitrate))
+
+
+@lru_cache(maxsize=16)
+def _build_abitrate_kb(current):
     caption = "🎚 Select **Audio Bitrate**:"
     buttons = [
-        InlineKeyboardButton(f"64k {tick(current == '64k')}",
+        InlineKeyboardButton(f"64k {_TICK[current == '64k']}",
                              callback_data="vt:encode:set:abitrate:64k"),
-        InlineKeyboardButton(f"96k {tick(current == '96k')}",
+        InlineKeyboardButton(f"96k {_TICK[current == '96k']}",
                              callback_data="vt:encode:set:abitrate:96k"),
-        InlineKeyboardButton(f"128k {tick(current == '128k')}",
+        InlineKeyboardButton(f"128k {_TICK[current == '128k']}",
                              callback_data="vt:encode:set:abitrate:128k"),
-        InlineKeyboardButton(f"192k {tick(current == '192k')}",
+        InlineKeyboardButton(f"192k {_TICK[current == '192k']}",
                              callback_data="vt:encode:set:abitrate:192k"),
-        InlineKeyboardButton(f"256k {tick(current == '256k')}",
+        InlineKeyboardButton(f"256k {_TICK[current == '256k']}",
                              callback_data="vt:encode:set:abitrate:256k"),
-        InlineKeyboardButton("Custom...", callback_data="vt:encode:ask:abitrate"),
-        InlineKeyboardButton("🔙 Back", callback_data="vt:encode:open:main")
+        _BTN_ABITRATE_CUSTOM,
+        _BACK_ENCODE_MAIN
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 2)
+    return caption, create_keyboard(buttons, 2)
+
+
+# menu_type -> builder(view, active_tool); unknown types show the main panel
+_ENCODE_DISPATCH = {
+    "main": _get_vt_encode_main,
+    "vcodec": lambda s, a: _get_vt_encode_vcodec_menu(s),
+    "crf": lambda s, a: _get_vt_encode_crf_menu(s),
+    "preset": lambda s, a: _get_vt_encode_preset_menu(s),
+    "resolution": lambda s, a: _get_vt_encode_resolution_menu(s),
+    "acodec": lambda s, a: _get_vt_encode_acodec_menu(s),
+    "abitrate": lambda s, a: _get_vt_encode_abitrate_menu(s),
+}
 
 
 # =========================================================
 # TRIM MENU
 # =========================================================
 async def get_vt_trim_menu(user_id: int):
-    settings = await db.get_user_settings(user_id)
-    trim = settings.get("trim_settings",
-                        db.get_default_settings(user_id)['trim_settings'])
-    active_tool = settings.get("active_tool")
-    caption = config.MSG_VT_TRIM_MAIN.format(start=trim.get('start'),
-                                             end=trim.get('end'))
+    settings = await db.get_user_settings(user_id, readonly=True)
+    return _get_vt_trim_menu_sync(settings)
+
+
+def _get_vt_trim_menu_sync(settings: dict):
+    """Renders from an already-fetched settings doc; no awaits."""
+    trim = settings.get("trim_settings") or _DEFAULTS["trim_settings"]
+    return (config.IMG_TOOLS,
+            *_build_trim_kb(trim.get('start'), trim.get('end'),
+                            settings.get("active_tool") == 'trim'))
+
+
+@lru_cache(maxsize=64)
+def _build_trim_kb(start, end, trim_active):
+    caption = config.MSG_VT_TRIM_MAIN.format(start=start, end=end)
     buttons = [
-        InlineKeyboardButton(f"Start: {trim.get('start')}",
+        InlineKeyboardButton(f"Start: {start}",
                              callback_data="vt:trim:ask:start"),
-        InlineKeyboardButton(f"End: {trim.get('end')}",
+        InlineKeyboardButton(f"End: {end}",
                              callback_data="vt:trim:ask:end"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'trim')}",
-            callback_data="vt:toggle:trim"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}",
-                             callback_data="open:tools")
+        _toggle_button('trim', trim_active),
+        _BACK_TO_TOOLS
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, 1)
+    return caption, create_keyboard(buttons, 1)
 
 
 # ==================== WATERMARK & SAMPLE MENUS (UNCHANGED) ====================
@@ -455,152 +595,175 @@ async def get_vt_trim_menu(user_id: int):
 # --- 3.5 Watermark Menus ---
 async def get_vt_watermark_menu(user_id: int, menu_type: str = "main"):
     """Handles ALL watermark sub-menus."""
-    settings = await db.get_user_settings(user_id)
-    watermark_settings = settings.get(
-        "watermark_settings",
-        db.get_default_settings(user_id)['watermark_settings'])
-    active_tool = settings.get("active_tool")
+    if menu_type not in _WATERMARK_DISPATCH:
+        menu_type = "main"
+    settings = await db.get_user_settings(user_id, readonly=True)
+    return _get_vt_watermark_menu_sync(settings, menu_type)
 
-    if menu_type == "main":
-        return _get_vt_watermark_main(watermark_settings, active_tool)
-    if menu_type == "type":
-        return _get_vt_watermark_type_menu(watermark_settings)
-    if menu_type == "position":
-        return _get_vt_watermark_position_menu(watermark_settings)
 
-    return _get_vt_watermark_main(watermark_settings, active_tool)
+def _get_vt_watermark_menu_sync(settings: dict, menu_type: str = "main"):
+    """Renders from an already-fetched settings doc; no awaits."""
+    watermark_settings = settings.get("watermark_settings") or _DEFAULTS["watermark_settings"]
+    active_tool = settings.get("active_tool")
+
+    builder = _WATERMARK_DISPATCH.get(menu_type, _get_vt_watermark_main)
+    return builder(watermark_settings, active_tool)
 
 
 def _get_vt_watermark_main(settings: dict, active_tool: str):
     """Builds the main Watermark hub panel."""
-    text = settings.get('text', 'N/A')
-    if len(text) > 20: text = text[:20] + "..."
-    image = "Set" if settings.get('image_id') else "Not Set"
+    get = settings.get
+    wm_type = get('type', 'none')
+    position = get('position', 'N/A')
+    text = _short_text(get('text', 'N/A'))
+    image = "Set" if get('image_id') else "Not Set"
 
     caption = config.MSG_VT_WATERMARK_MAIN.format(
-        type=settings.get('type', 'none'),
+        type=wm_type,
         text=text,
         image=image,
-        position=settings.get('position', 'N/A'),
-        opacity=settings.get('opacity', 0.7))
+        position=position,
+        opacity=get('opacity', 0.7))
     buttons = [
         InlineKeyboardButton(
-            f"{config.BTN_WATERMARK_TYPE}: {settings.get('type')}",
+            f"{config.BTN_WATERMARK_TYPE}: {wm_type}",
             callback_data="vt:watermark:open:type"),
         InlineKeyboardButton(
-            f"{config.BTN_WATERMARK_POSITION}: {settings.get('position')}",
+            f"{config.BTN_WATERMARK_POSITION}: {position}",
             callback_data="vt:watermark:open:position"),
-        InlineKeyboardButton(f"{config.BTN_WATERMARK_TEXT}",
-                             callback_data="vt:watermark:ask:text"),
-        InlineKeyboardButton(f"{config.BTN_WATERMARK_IMAGE}",
-                             callback_data="vt:watermark:ask:image"),
+        _BTN_WATERMARK_TEXT,
+        _BTN_WATERMARK_IMAGE,
         # (Opacity can be added as another ask button)
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'watermark')}",
-            callback_data="vt:toggle:watermark"),
+        _toggle_button('watermark', active_tool == 'watermark'),
         # FIX 2: Corrected back button callback
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}",
-                             callback_data="open:tools")
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
 
 
 def _get_vt_watermark_type_menu(settings: dict):
     """Sub-menu for Watermark Type."""
-    current = settings.get('type')
+    return (config.IMG_TOOLS, *_build_watermark_type_kb(settings.get('type')))
+
+
+@lru_cache(maxsize=16)
+def _build_watermark_type_kb(current):
     caption = "Select a **Watermark Type**:"
     buttons = [
-        InlineKeyboardButton(f"Text {tick(current == 'text')}",
+        InlineKeyboardButton(f"Text {_TICK[current == 'text']}",
                              callback_data="vt:watermark:set:type:text"),
-        InlineKeyboardButton(f"Image {tick(current == 'image')}",
+        InlineKeyboardButton(f"Image {_TICK[current == 'image']}",
                              callback_data="vt:watermark:set:type:image"),
-        InlineKeyboardButton(f"None {tick(current == 'none')}",
+        InlineKeyboardButton(f"None {_TICK[current == 'none']}",
                              callback_data="vt:watermark:set:type:none"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
-                             callback_data="vt:watermark:open:main")
+        _back_button("vt:watermark:open:main")
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
+    return caption, create_keyboard(buttons, columns=1)
 
 
 def _get_vt_watermark_position_menu(settings: dict):
     """Sub-menu for Watermark Position."""
-    current = settings.get('position')
+    return (config.IMG_TOOLS, *_build_watermark_position_kb(settings.get('position')))
+
+
+@lru_cache(maxsize=16)
+def _build_watermark_position_kb(current):
     caption = config.MSG_VT_WATERMARK_POSITION_MENU
     buttons = [
         InlineKeyboardButton(
-            f"Top Left {tick(current == 'top_left')}",
+            f"Top Left {_TICK[current == 'top_left']}",
             callback_data="vt:watermark:set:position:top_left"),
         InlineKeyboardButton(
-            f"Top Right {tick(current == 'top_right')}",
+            f"Top Right {_TICK[current == 'top_right']}",
             callback_data="vt:watermark:set:position:top_right"),
         InlineKeyboardButton(
-            f"Bottom Left {tick(current == 'bottom_left')}",
+            f"Bottom Left {_TICK[current == 'bottom_left']}",
             callback_data="vt:watermark:set:position:bottom_left"),
         InlineKeyboardButton(
-            f"Bottom Right {tick(current == 'bottom_right')}",
+            f"Bottom Right {_TICK[current == 'bottom_right']}",
             callback_data="vt:watermark:set:position:bottom_right"),
-        InlineKeyboardButton(f"Center {tick(current == 'center')}",
+        InlineKeyboardButton(f"Center {_TICK[current == 'center']}",
                              callback_data="vt:watermark:set:position:center"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
-                             callback_data="vt:watermark:open:main")
+        _back_button("vt:watermark:open:main")
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
+    return caption, create_keyboard(buttons, columns=2)
+
+
+@lru_cache(maxsize=256)
+def _short_text(text: str, limit: int = 20) -> str:
+    """Display form of the watermark text, truncated once per distinct text."""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+_WATERMARK_DISPATCH = {
+    "main": _get_vt_watermark_main,
+    "type": lambda s, a: _get_vt_watermark_type_menu(s),
+    "position": lambda s, a: _get_vt_watermark_position_menu(s),
+}
 
 
 # --- 3.6 Sample Menus ---
 async def get_vt_sample_menu(user_id: int, menu_type: str = "main"):
     """Handles ALL sample sub-menus."""
-    settings = await db.get_user_settings(user_id)
-    sample_settings = settings.get(
-        "sample_settings",
-        db.get_default_settings(user_id)['sample_settings'])
-    active_tool = settings.get("active_tool")
+    if menu_type not in _SAMPLE_DISPATCH:
+        menu_type = "main"
+    settings = await db.get_user_settings(user_id, readonly=True)
+    return _get_vt_sample_menu_sync(settings, menu_type)
 
-    if menu_type == "main":
-        return _get_vt_sample_main(sample_settings, active_tool)
-    if menu_type == "from":
-        return _get_vt_sample_from_menu(sample_settings)
 
-    return _get_vt_sample_main(sample_settings, active_tool)
+def _get_vt_sample_menu_sync(settings: dict, menu_type: str = "main"):
+    """Renders from an already-fetched settings doc; no awaits."""
+    sample_settings = settings.get("sample_settings") or _DEFAULTS["sample_settings"]
+    active_tool = settings.get("active_tool")
+
+    builder = _SAMPLE_DISPATCH.get(menu_type, _get_vt_sample_main)
+    return builder(sample_settings, active_tool)
 
 
 def _get_vt_sample_main(settings: dict, active_tool: str):
     """Builds the main Sample hub panel."""
-    caption = config.MSG_VT_SAMPLE_MAIN.format(
-        duration=settings.get('duration', 30),
-        from_point=settings.get('from_point', 'start'))
+    duration = settings.get('duration', 30)
+    from_point = settings.get('from_point', 'start')
+    caption = config.MSG_VT_SAMPLE_MAIN.format(duration=duration,
+                                               from_point=from_point)
     buttons = [
         InlineKeyboardButton(
-            f"{config.BTN_SAMPLE_DURATION}: {settings.get('duration')}s",
+            f"{config.BTN_SAMPLE_DURATION}: {duration}s",
             callback_data="vt:sample:ask:duration"),
         InlineKeyboardButton(
-            f"{config.BTN_SAMPLE_FROM}: {settings.get('from_point')}",
+            f"{config.BTN_SAMPLE_FROM}: {from_point}",
             callback_data="vt:sample:open:from"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'sample')}",
-            callback_data="vt:toggle:sample"),
+        _toggle_button('sample', active_tool == 'sample'),
         # FIX 2: Corrected back button callback
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}",
-                             callback_data="open:tools")
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
 
 def _get_vt_sample_from_menu(settings: dict):
     """Sub-menu for Sample From."""
-    current = settings.get('from_point')
+    return (config.IMG_TOOLS, *_build_sample_from_kb(settings.get('from_point')))
+
+
+@lru_cache(maxsize=16)
+def _build_sample_from_kb(current):
     caption = config.MSG_VT_SAMPLE_FROM_MENU
     buttons = [
-        InlineKeyboardButton(f"Start {tick(current == 'start')}",
+        InlineKeyboardButton(f"Start {_TICK[current == 'start']}",
                              callback_data="vt:sample:set:from_point:start"),
-        InlineKeyboardButton(f"Middle {tick(current == 'middle')}",
+        InlineKeyboardButton(f"Middle {_TICK[current == 'middle']}",
                              callback_data="vt:sample:set:from_point:middle"),
-        InlineKeyboardButton(f"End {tick(current == 'end')}",
+        InlineKeyboardButton(f"End {_TICK[current == 'end']}",
                              callback_data="vt:sample:set:from_point:end"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
-                             callback_data="vt:sample:open:main")
+        _back_button("vt:sample:open:main")
     ]
-    return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
+    return caption, create_keyboard(buttons, columns=1)
+
+
+_SAMPLE_DISPATCH = {
+    "main": _get_vt_sample_main,
+    "from": lambda s, a: _get_vt_sample_from_menu(s),
+}
 
 
 # =========================================================
@@ -610,8 +773,8 @@ def _get_vt_sample_from_menu(settings: dict):
 # --- 3.7 Rotate Menu ---
 async def get_vt_rotate_menu(user_id: int, menu_type: str = "main"):
     """Handles rotate menu."""
-    settings = await db.get_user_settings(user_id)
-    rotate_settings = settings.get("rotate_settings", db.get_default_settings(user_id)['rotate_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    rotate_settings = settings.get("rotate_settings") or _DEFAULTS["rotate_settings"]
     active_tool = settings.get("active_tool")
     
     if menu_type == "main":
@@ -627,10 +790,8 @@ def _get_vt_rotate_main(settings: dict, active_tool: str):
         InlineKeyboardButton(
             f"{config.BTN_ROTATE_ANGLE}: {settings.get('angle')}°",
             callback_data="vt:rotate:open:angle"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'rotate')}",
-            callback_data="vt:toggle:rotate"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('rotate', active_tool == 'rotate'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -639,10 +800,10 @@ def _get_vt_rotate_angle_menu(settings: dict):
     current = settings.get('angle', 90)
     caption = config.MSG_VT_ROTATE_ANGLE_MENU
     buttons = [
-        InlineKeyboardButton(f"90° {tick(current == 90)}", callback_data="vt:rotate:set:angle:90"),
-        InlineKeyboardButton(f"180° {tick(current == 180)}", callback_data="vt:rotate:set:angle:180"),
-        InlineKeyboardButton(f"270° {tick(current == 270)}", callback_data="vt:rotate:set:angle:270"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:rotate:open:main")
+        _btn(f"90° {_TICK[current == 90]}", "vt:rotate:set:angle:90"),
+        _btn(f"180° {_TICK[current == 180]}", "vt:rotate:set:angle:180"),
+        _btn(f"270° {_TICK[current == 270]}", "vt:rotate:set:angle:270"),
+        _back_button("vt:rotate:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -650,8 +811,8 @@ def _get_vt_rotate_angle_menu(settings: dict):
 # --- 3.8 Flip Menu ---
 async def get_vt_flip_menu(user_id: int, menu_type: str = "main"):
     """Handles flip menu."""
-    settings = await db.get_user_settings(user_id)
-    flip_settings = settings.get("flip_settings", db.get_default_settings(user_id)['flip_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    flip_settings = settings.get("flip_settings") or _DEFAULTS["flip_settings"]
     active_tool = settings.get("active_tool")
     
     if menu_type == "main":
@@ -667,10 +828,8 @@ def _get_vt_flip_main(settings: dict, active_tool: str):
         InlineKeyboardButton(
             f"{config.BTN_FLIP_DIRECTION}: {settings.get('direction')}",
             callback_data="vt:flip:open:direction"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'flip')}",
-            callback_data="vt:toggle:flip"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('flip', active_tool == 'flip'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -679,11 +838,9 @@ def _get_vt_flip_direction_menu(settings: dict):
     current = settings.get('direction', 'horizontal')
     caption = config.MSG_VT_FLIP_DIRECTION_MENU
     buttons = [
-        InlineKeyboardButton(f"Horizontal {tick(current == 'horizontal')}", 
-                           callback_data="vt:flip:set:direction:horizontal"),
-        InlineKeyboardButton(f"Vertical {tick(current == 'vertical')}", 
-                           callback_data="vt:flip:set:direction:vertical"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:flip:open:main")
+        _btn(f"Horizontal {_TICK[current == 'horizontal']}", "vt:flip:set:direction:horizontal"),
+        _btn(f"Vertical {_TICK[current == 'vertical']}", "vt:flip:set:direction:vertical"),
+        _back_button("vt:flip:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -691,8 +848,8 @@ def _get_vt_flip_direction_menu(settings: dict):
 # --- 3.9 Speed Menu ---
 async def get_vt_speed_menu(user_id: int, menu_type: str = "main"):
     """Handles speed adjustment menu."""
-    settings = await db.get_user_settings(user_id)
-    speed_settings = settings.get("speed_settings", db.get_default_settings(user_id)['speed_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    speed_settings = settings.get("speed_settings") or _DEFAULTS["speed_settings"]
     active_tool = settings.get("active_tool")
     
     if menu_type == "main":
@@ -708,10 +865,8 @@ def _get_vt_speed_main(settings: dict, active_tool: str):
         InlineKeyboardButton(
             f"{config.BTN_SPEED_MULTIPLIER}: {settings.get('speed')}x",
             callback_data="vt:speed:open:multiplier"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'speed')}",
-            callback_data="vt:toggle:speed"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('speed', active_tool == 'speed'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -720,14 +875,14 @@ def _get_vt_speed_multiplier_menu(settings: dict):
     current = settings.get('speed', 1.0)
     caption = config.MSG_VT_SPEED_MENU
     buttons = [
-        InlineKeyboardButton(f"0.5x {tick(current == 0.5)}", callback_data="vt:speed:set:speed:0.5"),
-        InlineKeyboardButton(f"0.75x {tick(current == 0.75)}", callback_data="vt:speed:set:speed:0.75"),
-        InlineKeyboardButton(f"1.0x {tick(current == 1.0)}", callback_data="vt:speed:set:speed:1.0"),
-        InlineKeyboardButton(f"1.25x {tick(current == 1.25)}", callback_data="vt:speed:set:speed:1.25"),
-        InlineKeyboardButton(f"1.5x {tick(current == 1.5)}", callback_data="vt:speed:set:speed:1.5"),
-        InlineKeyboardButton(f"2.0x {tick(current == 2.0)}", callback_data="vt:speed:set:speed:2.0"),
-        InlineKeyboardButton(f"Custom...", callback_data="vt:speed:ask:speed"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:speed:open:main")
+        _btn(f"0.5x {_TICK[current == 0.5]}", "vt:speed:set:speed:0.5"),
+        _btn(f"0.75x {_TICK[current == 0.75]}", "vt:speed:set:speed:0.75"),
+        _btn(f"1.0x {_TICK[current == 1.0]}", "vt:speed:set:speed:1.0"),
+        _btn(f"1.25x {_TICK[current == 1.25]}", "vt:speed:set:speed:1.25"),
+        _btn(f"1.5x {_TICK[current == 1.5]}", "vt:speed:set:speed:1.5"),
+        _btn(f"2.0x {_TICK[current == 2.0]}", "vt:speed:set:speed:2.0"),
+        _BTN_SPEED_CUSTOM,
+        _back_button("vt:speed:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
 
@@ -735,8 +890,8 @@ def _get_vt_speed_multiplier_menu(settings: dict):
 # --- 3.10 Volume Menu ---
 async def get_vt_volume_menu(user_id: int, menu_type: str = "main"):
     """Handles volume adjustment menu."""
-    settings = await db.get_user_settings(user_id)
-    volume_settings = settings.get("volume_settings", db.get_default_settings(user_id)['volume_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    volume_settings = settings.get("volume_settings") or _DEFAULTS["volume_settings"]
     active_tool = settings.get("active_tool")
     
     if menu_type == "main":
@@ -752,10 +907,8 @@ def _get_vt_volume_main(settings: dict, active_tool: str):
         InlineKeyboardButton(
             f"{config.BTN_VOLUME_LEVEL}: {settings.get('volume')}%",
             callback_data="vt:volume:open:level"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'volume')}",
-            callback_data="vt:toggle:volume"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('volume', active_tool == 'volume'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -764,13 +917,13 @@ def _get_vt_volume_level_menu(settings: dict):
     current = settings.get('volume', 100)
     caption = config.MSG_VT_VOLUME_MENU
     buttons = [
-        InlineKeyboardButton(f"50% {tick(current == 50)}", callback_data="vt:volume:set:volume:50"),
-        InlineKeyboardButton(f"75% {tick(current == 75)}", callback_data="vt:volume:set:volume:75"),
-        InlineKeyboardButton(f"100% {tick(current == 100)}", callback_data="vt:volume:set:volume:100"),
-        InlineKeyboardButton(f"150% {tick(current == 150)}", callback_data="vt:volume:set:volume:150"),
-        InlineKeyboardButton(f"200% {tick(current == 200)}", callback_data="vt:volume:set:volume:200"),
-        InlineKeyboardButton(f"Custom...", callback_data="vt:volume:ask:volume"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:volume:open:main")
+        _btn(f"50% {_TICK[current == 50]}", "vt:volume:set:volume:50"),
+        _btn(f"75% {_TICK[current == 75]}", "vt:volume:set:volume:75"),
+        _btn(f"100% {_TICK[current == 100]}", "vt:volume:set:volume:100"),
+        _btn(f"150% {_TICK[current == 150]}", "vt:volume:set:volume:150"),
+        _btn(f"200% {_TICK[current == 200]}", "vt:volume:set:volume:200"),
+        _BTN_VOLUME_CUSTOM,
+        _back_button("vt:volume:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
 
@@ -778,8 +931,8 @@ def _get_vt_volume_level_menu(settings: dict):
 # --- 3.11 Crop Menu ---
 async def get_vt_crop_menu(user_id: int, menu_type: str = "main"):
     """Handles crop menu."""
-    settings = await db.get_user_settings(user_id)
-    crop_settings = settings.get("crop_settings", db.get_default_settings(user_id)['crop_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    crop_settings = settings.get("crop_settings") or _DEFAULTS["crop_settings"]
     active_tool = settings.get("active_tool")
     
     if menu_type == "main":
@@ -795,10 +948,8 @@ def _get_vt_crop_main(settings: dict, active_tool: str):
         InlineKeyboardButton(
             f"{config.BTN_CROP_ASPECT}: {settings.get('aspect_ratio')}",
             callback_data="vt:crop:open:aspect"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'crop')}",
-            callback_data="vt:toggle:crop"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('crop', active_tool == 'crop'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -807,11 +958,11 @@ def _get_vt_crop_aspect_menu(settings: dict):
     current = settings.get('aspect_ratio', '16:9')
     caption = config.MSG_VT_CROP_ASPECT_MENU
     buttons = [
-        InlineKeyboardButton(f"16:9 {tick(current == '16:9')}", callback_data="vt:crop:set:aspect_ratio:16:9"),
-        InlineKeyboardButton(f"4:3 {tick(current == '4:3')}", callback_data="vt:crop:set:aspect_ratio:4:3"),
-        InlineKeyboardButton(f"1:1 {tick(current == '1:1')}", callback_data="vt:crop:set:aspect_ratio:1:1"),
-        InlineKeyboardButton(f"9:16 {tick(current == '9:16')}", callback_data="vt:crop:set:aspect_ratio:9:16"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:crop:open:main")
+        _btn(f"16:9 {_TICK[current == '16:9']}", "vt:crop:set:aspect_ratio:16:9"),
+        _btn(f"4:3 {_TICK[current == '4:3']}", "vt:crop:set:aspect_ratio:4:3"),
+        _btn(f"1:1 {_TICK[current == '1:1']}", "vt:crop:set:aspect_ratio:1:1"),
+        _btn(f"9:16 {_TICK[current == '9:16']}", "vt:crop:set:aspect_ratio:9:16"),
+        _back_button("vt:crop:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
 
@@ -819,8 +970,8 @@ def _get_vt_crop_aspect_menu(settings: dict):
 # --- 3.12 GIF Converter Menu ---
 async def get_vt_gif_menu(user_id: int, menu_type: str = "main"):
     """Handles GIF converter menu."""
-    settings = await db.get_user_settings(user_id)
-    gif_settings = settings.get("gif_settings", db.get_default_settings(user_id)['gif_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    gif_settings = settings.get("gif_settings") or _DEFAULTS["gif_settings"]
     active_tool = settings.get("active_tool")
     
     if menu_type == "main":
@@ -849,10 +1000,8 @@ def _get_vt_gif_main(settings: dict, active_tool: str):
         InlineKeyboardButton(
             f"{config.BTN_GIF_SCALE}: {settings.get('scale')}p",
             callback_data="vt:gif:open:scale"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'gif')}",
-            callback_data="vt:toggle:gif"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('gif', active_tool == 'gif'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -861,12 +1010,12 @@ def _get_vt_gif_fps_menu(settings: dict):
     current = settings.get('fps', 10)
     caption = config.MSG_VT_GIF_FPS_MENU
     buttons = [
-        InlineKeyboardButton(f"10 {tick(current == 10)}", callback_data="vt:gif:set:fps:10"),
-        InlineKeyboardButton(f"15 {tick(current == 15)}", callback_data="vt:gif:set:fps:15"),
-        InlineKeyboardButton(f"20 {tick(current == 20)}", callback_data="vt:gif:set:fps:20"),
-        InlineKeyboardButton(f"25 {tick(current == 25)}", callback_data="vt:gif:set:fps:25"),
-        InlineKeyboardButton(f"Custom...", callback_data="vt:gif:ask:fps"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:gif:open:main")
+        _btn(f"10 {_TICK[current == 10]}", "vt:gif:set:fps:10"),
+        _btn(f"15 {_TICK[current == 15]}", "vt:gif:set:fps:15"),
+        _btn(f"20 {_TICK[current == 20]}", "vt:gif:set:fps:20"),
+        _btn(f"25 {_TICK[current == 25]}", "vt:gif:set:fps:25"),
+        _BTN_GIF_FPS_CUSTOM,
+        _back_button("vt:gif:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
 
@@ -875,10 +1024,10 @@ def _get_vt_gif_quality_menu(settings: dict):
     current = settings.get('quality', 'medium')
     caption = config.MSG_VT_GIF_QUALITY_MENU
     buttons = [
-        InlineKeyboardButton(f"Low {tick(current == 'low')}", callback_data="vt:gif:set:quality:low"),
-        InlineKeyboardButton(f"Medium {tick(current == 'medium')}", callback_data="vt:gif:set:quality:medium"),
-        InlineKeyboardButton(f"High {tick(current == 'high')}", callback_data="vt:gif:set:quality:high"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:gif:open:main")
+        _btn(f"Low {_TICK[current == 'low']}", "vt:gif:set:quality:low"),
+        _btn(f"Medium {_TICK[current == 'medium']}", "vt:gif:set:quality:medium"),
+        _btn(f"High {_TICK[current == 'high']}", "vt:gif:set:quality:high"),
+        _back_button("vt:gif:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -887,12 +1036,12 @@ def _get_vt_gif_scale_menu(settings: dict):
     current = settings.get('scale', 480)
     caption = config.MSG_VT_GIF_SCALE_MENU
     buttons = [
-        InlineKeyboardButton(f"240p {tick(current == 240)}", callback_data="vt:gif:set:scale:240"),
-        InlineKeyboardButton(f"360p {tick(current == 360)}", callback_data="vt:gif:set:scale:360"),
-        InlineKeyboardButton(f"480p {tick(current == 480)}", callback_data="vt:gif:set:scale:480"),
-        InlineKeyboardButton(f"720p {tick(current == 720)}", callback_data="vt:gif:set:scale:720"),
-        InlineKeyboardButton(f"Custom...", callback_data="vt:gif:ask:scale"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:gif:open:main")
+        _btn(f"240p {_TICK[current == 240]}", "vt:gif:set:scale:240"),
+        _btn(f"360p {_TICK[current == 360]}", "vt:gif:set:scale:360"),
+        _btn(f"480p {_TICK[current == 480]}", "vt:gif:set:scale:480"),
+        _btn(f"720p {_TICK[current == 720]}", "vt:gif:set:scale:720"),
+        _BTN_GIF_SCALE_CUSTOM,
+        _back_button("vt:gif:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
 
@@ -900,7 +1049,7 @@ def _get_vt_gif_scale_menu(settings: dict):
 # --- 3.13 Reverse Menu ---
 async def get_vt_reverse_menu(user_id: int, menu_type: str = "main"):
     """Handles reverse menu."""
-    settings = await db.get_user_settings(user_id)
+    settings = await db.get_user_settings(user_id, readonly=True)
     active_tool = settings.get("active_tool")
     return _get_vt_reverse_main(active_tool)
 
@@ -908,10 +1057,8 @@ def _get_vt_reverse_main(active_tool: str):
     """Main reverse panel."""
     caption = config.MSG_VT_REVERSE_MAIN
     buttons = [
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'reverse')}",
-            callback_data="vt:toggle:reverse"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('reverse', active_tool == 'reverse'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -919,8 +1066,8 @@ def _get_vt_reverse_main(active_tool: str):
 # --- 3.14 Extract Thumbnail Menu ---
 async def get_vt_extract_thumb_menu(user_id: int, menu_type: str = "main"):
     """Handles thumbnail extraction menu."""
-    settings = await db.get_user_settings(user_id)
-    thumb_settings = settings.get("extract_thumb_settings", db.get_default_settings(user_id)['extract_thumb_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    thumb_settings = settings.get("extract_thumb_settings") or _DEFAULTS["extract_thumb_settings"]
     active_tool = settings.get("active_tool")
     
     if menu_type == "main":
@@ -945,10 +1092,8 @@ def _get_vt_extract_thumb_main(settings: dict, active_tool: str):
         InlineKeyboardButton(
             f"{config.BTN_THUMB_COUNT}: {settings.get('count')}",
             callback_data="vt:extract_thumb:ask:count"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'extract_thumb')}",
-            callback_data="vt:toggle:extract_thumb"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('extract_thumb', active_tool == 'extract_thumb'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -957,11 +1102,9 @@ def _get_vt_extract_thumb_mode_menu(settings: dict):
     current = settings.get('mode', 'single')
     caption = config.MSG_VT_THUMB_MODE_MENU
     buttons = [
-        InlineKeyboardButton(f"Single {tick(current == 'single')}", 
-                           callback_data="vt:extract_thumb:set:mode:single"),
-        InlineKeyboardButton(f"Interval {tick(current == 'interval')}", 
-                           callback_data="vt:extract_thumb:set:mode:interval"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}", callback_data="vt:extract_thumb:open:main")
+        _btn(f"Single {_TICK[current == 'single']}", "vt:extract_thumb:set:mode:single"),
+        _btn(f"Interval {_TICK[current == 'interval']}", "vt:extract_thumb:set:mode:interval"),
+        _back_button("vt:extract_thumb:open:main")
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -971,8 +1114,8 @@ def _get_vt_extract_thumb_mode_menu(settings: dict):
 # =========================================================
 async def get_vt_extract_menu(user_id: int):
     """Handles the Extract submenu."""
-    settings = await db.get_user_settings(user_id)
-    extract_settings = settings.get("extract_settings", db.get_default_settings(user_id)['extract_settings'])
+    settings = await db.get_user_settings(user_id, readonly=True)
+    extract_settings = settings.get("extract_settings") or _DEFAULTS["extract_settings"]
     active_tool = settings.get("active_tool")
     
     mode = extract_settings.get('mode', 'video')
@@ -980,21 +1123,19 @@ async def get_vt_extract_menu(user_id: int):
     
     buttons = [
         InlineKeyboardButton(
-            f"{config.BTN_EXTRACT_VIDEO} {tick(mode == 'video')}",
+            f"{config.BTN_EXTRACT_VIDEO} {_TICK[mode == 'video']}",
             callback_data="vt:extract:set:mode:video"),
         InlineKeyboardButton(
-            f"{config.BTN_EXTRACT_AUDIO} {tick(mode == 'audio')}",
+            f"{config.BTN_EXTRACT_AUDIO} {_TICK[mode == 'audio']}",
             callback_data="vt:extract:set:mode:audio"),
         InlineKeyboardButton(
-            f"{config.BTN_EXTRACT_SUBTITLES} {tick(mode == 'subtitles')}",
+            f"{config.BTN_EXTRACT_SUBTITLES} {_TICK[mode == 'subtitles']}",
             callback_data="vt:extract:set:mode:subtitles"),
         InlineKeyboardButton(
-            f"{config.BTN_EXTRACT_THUMBNAILS} {tick(mode == 'thumbnails')}",
+            f"{config.BTN_EXTRACT_THUMBNAILS} {_TICK[mode == 'thumbnails']}",
             callback_data="vt:extract:set:mode:thumbnails"),
-        InlineKeyboardButton(
-            f"{config.BTN_ENABLE_TOOL} {tick(active_tool == 'extract')}",
-            callback_data="vt:toggle:extract"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _toggle_button('extract', active_tool == 'extract'),
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=1)
 
@@ -1004,34 +1145,34 @@ async def get_vt_extract_menu(user_id: int):
 # =========================================================
 async def get_vt_extra_menu(user_id: int):
     """Handles the Extra Tools submenu."""
-    settings = await db.get_user_settings(user_id)
+    settings = await db.get_user_settings(user_id, readonly=True)
     active_tool = settings.get("active_tool", "none")
     
     caption = config.MSG_VT_EXTRA_TOOLS_MAIN
     
     buttons = [
         InlineKeyboardButton(
-            f"{config.BTN_ROTATE} {tick(active_tool == 'rotate')}",
+            f"{config.BTN_ROTATE} {_TICK[active_tool == 'rotate']}",
             callback_data="vt:rotate:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_FLIP} {tick(active_tool == 'flip')}",
+            f"{config.BTN_FLIP} {_TICK[active_tool == 'flip']}",
             callback_data="vt:flip:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_SPEED} {tick(active_tool == 'speed')}",
+            f"{config.BTN_SPEED} {_TICK[active_tool == 'speed']}",
             callback_data="vt:speed:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_VOLUME} {tick(active_tool == 'volume')}",
+            f"{config.BTN_VOLUME} {_TICK[active_tool == 'volume']}",
             callback_data="vt:volume:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_CROP} {tick(active_tool == 'crop')}",
+            f"{config.BTN_CROP} {_TICK[active_tool == 'crop']}",
             callback_data="vt:crop:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_GIF} {tick(active_tool == 'gif')}",
+            f"{config.BTN_GIF} {_TICK[active_tool == 'gif']}",
             callback_data="vt:gif:open:main"),
         InlineKeyboardButton(
-            f"{config.BTN_REVERSE} {tick(active_tool == 'reverse')}",
+            f"{config.BTN_REVERSE} {_TICK[active_tool == 'reverse']}",
             callback_data="vt:reverse:open:main"),
-        InlineKeyboardButton(f"🔙 {config.BTN_VT_BACK}", callback_data="open:tools")
+        _BACK_TO_TOOLS
     ]
     return config.IMG_TOOLS, caption, create_keyboard(buttons, columns=2)
 
@@ -1061,8 +1202,7 @@ async def get_admin_menu():
                              callback_data="admin:broadcast"),
         InlineKeyboardButton(config.BTN_ADMIN_RESTART,
                              callback_data="admin:restart"),
-        InlineKeyboardButton(f"🔙 {config.BTN_BACK}",
-                             callback_data="open:start")
+        _back_button("open:start")
     ]
 
     keyboard = create_keyboard(buttons, 2)
@@ -17,6 +17,7 @@ from config import config
 from modules.utils import get_human_readable_size, get_progress_bar, format_duration
 from modules.log_manager import update_task_log
 from modules.database import db
+from modules.progress_ui import ProgressUI
 from pyrogram.errors import FloodWait, MessageNotModified
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,7 @@ class GofileUploader:
         self.token = config.GOFILE_TOKEN
         self.cancel_markup = cancel_markup
         self.last_update = 0
+        self.last_progress_hash = None
 
     async def get_server(self, session):
         """Selects optimal GoFile server."""
@@ -95,8 +97,6 @@ class GofileUploader:
             return
         self.last_update = now
 
-        from modules.progress_ui import ProgressUI
-        
         percentage = (current / total) * 100 if total > 0 else 0
         elapsed = now - start_time
         speed = current / elapsed if elapsed > 0 else 0
@@ -104,7 +104,8 @@ class GofileUploader:
 
         user = self.status_message.from_user
         
-        message_text = ProgressUI.format_progress_message(
+        message_text, self.last_progress_hash = ProgressUI.format_progress_message_if_changed(
+            self.last_progress_hash,
             title=filename,
             status="Upload to GoFile",
             processed=current,
@@ -121,7 +122,8 @@ class GofileUploader:
         )
 
         try:
-            await self.status_message.edit_text(message_text, reply_markup=self.cancel_markup)
+            if message_text:
+                await self.status_message.edit_text(message_text, reply_markup=self.cancel_markup)
         except MessageNotModified:
             pass
         except FloodWait as fw:
@@ -154,9 +156,10 @@ async def upload_to_telegram(
 
     start_time = time.time()
     last_update = 0
+    last_hash = None
 
     async def progress(current, total):
-        nonlocal last_update
+        nonlocal last_update, last_hash
         if not await db.is_user_task_running(user.id):
             raise asyncio.CancelledError("Upload cancelled")
         now = time.time()
@@ -164,14 +167,13 @@ async def upload_to_telegram(
             return
         last_update = now
 
-        from modules.progress_ui import ProgressUI
-        
         percentage = (current / total) * 100 if total > 0 else 0
         elapsed = now - start_time
         speed = current / elapsed if elapsed else 0
         eta = (total - current) / speed if speed > 0 else 0
 
-        message_text = ProgressUI.format_progress_message(
+        message_text, last_hash = ProgressUI.format_progress_message_if_changed(
+            last_hash,
             title=filename,
             status="Upload to Telegram",
             processed=current,
@@ -188,7 +190,8 @@ async def upload_to_telegram(
         )
 
         try:
-            await status_message.edit_text(message_text, reply_markup=cancel_markup)
+            if message_text:
+                await status_message.edit_text(message_text, reply_markup=cancel_markup)
         except MessageNotModified:
             pass
         except FloodWait as fw:
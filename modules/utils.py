@@ -15,13 +15,61 @@ import subprocess
 import re
 import uuid
 import json
+import atexit
 import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Tuple, List
 from pathlib import Path
+from contextlib import asynccontextmanager
 from config import config
 
+# orjson parses ffprobe output several times faster; fall back to json
+try:
+    import orjson
+    ORJSON_INSTALLED = True
+except ImportError:
+    orjson = None
+    ORJSON_INSTALLED = False
+
 logger = logging.getLogger(__name__)
 
+# Resolved once so every spawn skips the PATH search
+FFMPEG_BIN = shutil.which("ffmpeg") or "/usr/bin/ffmpeg"
+FFPROBE_BIN = shutil.which("ffprobe") or "/usr/bin/ffprobe"
+
+# ffmpeg/ffprobe only need these from the bot's environment; dropping the
+# rest keeps execve small and keeps BOT_TOKEN/MONGO_URI out of children.
+_SUBPROCESS_ENV_KEYS = ("PATH", "LD_LIBRARY_PATH", "HOME", "TMPDIR", "LANG",
+                        "LC_ALL", "TZ")
+_SUBPROCESS_ENV_PREFIXES = ("FONTCONFIG_", "LIBVA_", "CUDA_", "NVIDIA_")
+SUBPROCESS_ENV = {
+    k: v
+    for k, v in os.environ.items()
+    if k in _SUBPROCESS_ENV_KEYS or k.startswith(_SUBPROCESS_ENV_PREFIXES)
+}
+
+# Metadata work (ffprobe, stat) gets its own threads so a burst of tasks
+# can't starve the default executor that uploads/copies also use.
+PROBE_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ffprobe")
+atexit.register(PROBE_POOL.shutdown, wait=False)
+
+
+async def run_probe(func, *args):
+    """Run a blocking metadata call (get_video_info, os.stat) on PROBE_POOL."""
+    return await asyncio.get_running_loop().run_in_executor(
+        PROBE_POOL, func, *args)
+
+
+def json_loads(data):
+    """Parse JSON bytes/str with orjson when available, else stdlib json."""
+    if ORJSON_INSTALLED:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 # ======================================================
 #               PROCESS MANAGEMENT (ASYNC)
 # ======================================================
@@ -32,21 +80,35 @@ class ProcessManager:
 
     def __init__(self):
         self.active_processes: Dict[str, Dict[str, Any]] = {}
+        # processes stopped through kill_process_async; their non-zero exit
+        # is a cancel, not a failure worth retrying
+        self._killed: "weakref.WeakSet[asyncio.subprocess.Process]" = (
+            weakref.WeakSet())
 
     async def start_process_async(
             self,
             task_id: str,
             command: list,
             user_id: int,
-            cwd: Optional[str] = None) -> asyncio.subprocess.Process:
-        """Start subprocess asynchronously with process group handling."""
+            cwd: Optional[str] = None,
+            env: Optional[Dict[str, str]] = None,
+            owner_id: Optional[str] = None) -> asyncio.subprocess.Process:
+        """
+        Start subprocess asynchronously with process group handling.
+        `owner_id` is the task a derived id (a pass, a retry, a seek) belongs
+        to, so cancelling the task reaches every process it started.
+        """
         try:
             process = await asyncio.create_subprocess_exec(
                 *command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                stdin=asyncio.subprocess.PIPE,
+                # nothing is ever written to ffmpeg's stdin; DEVNULL avoids
+                # holding an unused pipe per process in the bot
+                stdin=asyncio.subprocess.DEVNULL,
                 cwd=cwd,
+                env=env,
+                close_fds=True,
                 preexec_fn=os.setsid)
             pgid = os.getpgid(process.pid)
             self.active_processes[task_id] = {
@@ -54,6 +116,7 @@ class ProcessManager:
                 "pid": process.pid,
                 "pgid": pgid,
                 "user_id": user_id,
+                "owner": owner_id or task_id,
                 "command": " ".join(command),
                 "start_time": time.time()
             }
@@ -73,6 +136,7 @@ class ProcessManager:
             return False
         proc = self.active_processes[task_id]["process"]
         pgid = self.active_processes[task_id]["pgid"]
+        self._killed.add(proc)
         try:
             os.killpg(pgid, signal.SIGTERM)
             for _ in range(int(timeout * 10)):
@@ -94,9 +158,32 @@ class ProcessManager:
             logger.error(f"Process kill error ({pgid}): {e}")
             return False
 
+    def was_killed(self, process: asyncio.subprocess.Process) -> bool:
+        """True if `process` was stopped by kill_process_async."""
+        return process in self._killed
+
     def get_process_info(self, task_id: str) -> Optional[Dict[str, Any]]:
         return self.active_processes.get(task_id)
 
+    def task_process_ids(self, task_id: str) -> List[str]:
+        """Ids of all running processes started by task `task_id`."""
+        return [
+            t for t, p in self.active_processes.items()
+            if p.get("owner", t) == task_id
+        ]
+
+    def get_task_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Info of any running process started by task `task_id`."""
+        ids = self.task_process_ids(task_id)
+        return self.active_processes.get(ids[0]) if ids else None
+
+    async def kill_task_async(self, task_id: str) -> bool:
+        """Kill every process started by task `task_id`."""
+        results = await asyncio.gather(
+            *(self.kill_process_async(t)
+              for t in self.task_process_ids(task_id)))
+        return any(results)
+
     async def unregister_process(self, task_id: str):
         """Unregister process after completion."""
         self.active_processes.pop(task_id, None)
@@ -144,9 +231,14 @@ class FFmpegProgressParser:
         if not match or not total:
             return None
         cur = self.time_to_seconds(*match.groups())
-        progress = min(1.0, cur / total)
         speed_match = self.SPEED_PATTERN.search(line)
         speed_val = speed_match.group(1) if speed_match else "1.0"
+        return self.build_progress(cur, total, speed_val)
+
+    @staticmethod
+    def build_progress(cur: float, total: float,
+                       speed_val: str) -> Dict[str, Any]:
+        progress = min(1.0, cur / total)
         eta = 0
         try:
             s = float(speed_val)
@@ -164,72 +256,231 @@ class FFmpegProgressParser:
             "eta": format_duration(eta)
         }
 
-# --- START OF FIXED FUNCTION ---
+# Shared cap on concurrently running ffmpeg processes across all tasks;
+# created lazily so config is validated before the limit is read.
+_ffmpeg_slots: Optional[asyncio.Semaphore] = None
+FFMPEG_QUEUE_PING_S = 30
+
+
+def _get_ffmpeg_slots() -> asyncio.Semaphore:
+    global _ffmpeg_slots
+    if _ffmpeg_slots is None:
+        limit = int(getattr(config, "MAX_CONCURRENT_FFMPEG", 0) or 0)
+        if limit <= 0:
+            limit = max(1, (os.cpu_count() or 2) // 2)
+        _ffmpeg_slots = asyncio.Semaphore(limit)
+    return _ffmpeg_slots
+
+
+# owning task_id -> (seconds spent waiting for a slot, monotonic_ts the
+# current wait began, number of its runs still waiting). Concurrent runs of
+# one task share the entry, so overlapping waits count once. The task
+# watchdog leaves queue time out of a task's time budget; it pops the entry
+# when the task ends.
+ffmpeg_queue_time: Dict[str, tuple] = {}
+
+
+def queued_seconds(task_id: str) -> float:
+    """Total time `task_id` has spent waiting for ffmpeg slots, so far."""
+    total, since, waiting = ffmpeg_queue_time.get(task_id, (0.0, None, 0))
+    return total + time.monotonic() - since if waiting else total
+
+
+def _mark_queued(task_id: str, delta: int) -> None:
+    """Bank the wait so far and add `delta` to the task's waiting runs."""
+    waiting = ffmpeg_queue_time.get(task_id, (0.0, None, 0))[2]
+    ffmpeg_queue_time[task_id] = (queued_seconds(task_id), time.monotonic(),
+                                  waiting + delta)
+
+
+@asynccontextmanager
+async def ffmpeg_slot(progress_callback=None, task_id: Optional[str] = None):
+    """Hold one ffmpeg concurrency slot; pings progress_callback while queued."""
+    slots = _get_ffmpeg_slots()
+    queued = task_id is not None and slots.locked()
+    if queued:
+        _mark_queued(task_id, 1)
+    try:
+        if slots.locked() and progress_callback:
+            await progress_callback(stage="Queued")
+        while True:
+            try:
+                await asyncio.wait_for(slots.acquire(), FFMPEG_QUEUE_PING_S)
+                break
+            except asyncio.TimeoutError:
+                # keeps the task watchdog from treating the wait as a stall
+                if progress_callback:
+                    await progress_callback(stage="Queued")
+    finally:
+        if queued:
+            _mark_queued(task_id, -1)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
 async def run_ffmpeg_with_progress(command,
-                                     task_id,
-                                     user_id,
-                                     progress_callback=None) -> Tuple[bool, str]:
+                                   task_id,
+                                   user_id,
+                                   progress_callback=None,
+                                   owner_id=None) -> Tuple[bool, str]:
+    """
+    Run FFmpeg once a concurrency slot is free, parsing its progress.
+    `task_id` names this process; when it is a derived id (a pass, a retry,
+    one of several concurrent seeks) `owner_id` is the task it belongs to.
+    """
+    async with ffmpeg_slot(progress_callback, owner_id or task_id):
+        return await _run_ffmpeg_with_progress(command, task_id, user_id,
+                                               progress_callback, owner_id)
+
+
+# Leading text of the error from a run that was cancelled or killed rather
+# than one that failed; callers must not retry it with a fallback command.
+FFMPEG_CANCELLED = "Cancelled"
+
+
+def ffmpeg_cancelled(stderr: str) -> bool:
+    """True if a run_ffmpeg_with_progress error means the run was stopped."""
+    return stderr.startswith(FFMPEG_CANCELLED)
+
+
+# owning task_id -> monotonic_ts of the last output chunk from any of its
+# ffmpeg processes.
+# The task watchdog reads this, so a run counts as alive whenever ffmpeg is
+# writing, whether or not a percentage can be computed. Owner pops it.
+ffmpeg_activity: Dict[str, float] = {}
+
+# Machine-readable `-progress` key=value output; out_time_ms is in
+# microseconds just like out_time_us (long-standing ffmpeg quirk).
+_PROGRESS_RE = re.compile(rb"^(out_time_us|out_time_ms|speed|progress)=(\S*)",
+                          re.MULTILINE)
+
+
+def _concat_entries(list_file: str) -> List[str]:
+    """Paths named by `file '...'` lines of an ffmpeg concat list."""
+    paths = []
+    try:
+        with open(list_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line.startswith("file "):
+                    continue
+                path = line[5:].strip()
+                if len(path) >= 2 and path[0] == path[-1] == "'":
+                    path = path[1:-1].replace("'\\''", "'")
+                paths.append(path)
+    except OSError:
+        return []
+    return paths
+
+
+def _input_duration(command) -> Optional[float]:
+    """
+    Duration of the first `-i` input, from the cached ffprobe result. For a
+    `-f concat` list it is the sum of the listed files; None if any is unknown.
+    """
+    try:
+        i = command.index("-i")
+        source = command[i + 1]
+    except (ValueError, IndexError):
+        return None
+    head = command[:i]
+    if "-f" in head and head[head.index("-f") + 1:][:1] == ["concat"]:
+        paths = _concat_entries(source)
+        total = 0.0
+        for path in paths:
+            info = get_video_info(path)
+            if not info or not info.get("duration"):
+                return None
+            total += info["duration"]
+        return total or None
+    info = get_video_info(source)
+    return info.get("duration") if info else None
+
+
+# --- START OF FIXED FUNCTION ---
+async def _run_ffmpeg_with_progress(command,
+                                    task_id,
+                                    user_id,
+                                    progress_callback=None,
+                                    owner_id=None) -> Tuple[bool, str]:
     """Run FFmpeg command and parse progress asynchronously."""
-    parser = FFmpegProgressParser()
-    total = None
+    owner = owner_id or task_id
     stderr_lines = []
     process = None
-    last_update = 0
     stderr_text = ""  # Initialize stderr_text
 
-    try:
-        process = await process_manager.start_process_async(
-            task_id, command, user_id)
-
-        # 'async for' को 'while True' + 'readline' से बदलें
-        # ताकि 'Separator not found' एरर को हैंडल किया जा सके
+    if command and command[0] == "ffmpeg":
+        # builders use the bare name; spawn the resolved binary instead
+        if "-progress" in command:
+            command = [FFMPEG_BIN, *command[1:]]
+        else:
+            command = [
+                FFMPEG_BIN, "-progress", "pipe:1", "-nostats", "-loglevel",
+                "error", *command[1:]
+            ]
+
+    async def _read_progress(total):
+        last_update = 0.0
+        pending = b""
+        cur, speed_val = None, "1.0"
         while True:
-            try:
-                # 'readline' 'ValueError' फेंक सकता है अगर बफर लिमिट पार हो जाए
-                raw = await process.stderr.readline()
-
-            except ValueError as e:
-                # यह 'Separator is not found...' एरर को पकड़ता है
-                logger.warning(
-                    f"FFmpeg output buffer limit hit (likely a crash): {e}")
-                # क्रैश लॉग को पकड़ने के लिए बाकी बफर को पढ़ने का प्रयास करें
-                try:
-                    remaining_output = await process.stderr.read(
-                        1024 * 1024)  # 1MB तक पढ़ें
-                    stderr_lines.append(
-                        remaining_output.decode("utf-8", "ignore"))
-                except:
-                    pass  # यदि बाकी को पढ़ने में विफल रहता है तो अनदेखा करें
-
-                # --- SYNTAX ERROR FIX ---
-                # Pehle variable banayein taaki f-string error na aaye
-                pre_crash_output = "\n".join(stderr_lines[-20:])
-                logger.error(f"FFmpeg (pre-crash) output: {pre_crash_output}")
-                # --- END FIX ---
-
-                break  # लूप से बाहर निकलें, प्रोसेस शायद बंद हो गया है
-
-            if not raw:
-                # स्ट्रीम का अंत
+            chunk = await process.stdout.read(65536)
+            if not chunk:
                 break
+            ffmpeg_activity[owner] = time.monotonic()
+            if not progress_callback:
+                continue  # drain so ffmpeg never blocks on a full pipe
+            # keep a partial trailing line for the next chunk
+            chunk, _, pending = (pending + chunk).rpartition(b"\n")
+            for key, value in _PROGRESS_RE.findall(chunk):
+                if key in (b"out_time_us", b"out_time_ms"):
+                    if value.isdigit():
+                        cur = int(value) / 1_000_000
+                elif key == b"speed" and value.endswith(b"x"):
+                    speed_val = value[:-1].decode()
+            now = time.monotonic()
+            if now - last_update < config.PROCESS_POLL_INTERVAL_S:
+                continue
+            if cur is not None and total:
+                await progress_callback(
+                    stage="Processing",
+                    **FFmpegProgressParser.build_progress(
+                        cur, total, speed_val))
+            else:
+                # no duration (live input, failed probe): still report that
+                # ffmpeg is alive so the task watchdog sees a heartbeat
+                await progress_callback(stage="Processing",
+                                        progress=0,
+                                        processed_time=format_duration(cur or 0),
+                                        speed=f"{speed_val}x")
+            last_update = now
+
+    async def _read_stderr():
+        # read() has no line-length limit, unlike readline()
+        while True:
+            chunk = await process.stderr.read(65536)
+            if not chunk:
+                break
+            ffmpeg_activity[owner] = time.monotonic()
+            stderr_lines.extend(
+                chunk.decode("utf-8", "ignore").splitlines())
 
-            line = raw.decode("utf-8", "ignore").strip()
-            stderr_lines.append(line)
-
-            if total is None:
-                total = parser.parse_duration(line)
-
-            if total and "time=" in line:
-                info = parser.parse_progress(line, total)
-                if info and progress_callback:
-                    now = time.time()
-                    if now - last_update >= config.PROCESS_POLL_INTERVAL_S:
-                        await progress_callback(stage="Processing", **info)
-                        last_update = now
+    try:
+        total = await run_probe(_input_duration, command)
+        process = await process_manager.start_process_async(
+            task_id, command, user_id, env=SUBPROCESS_ENV, owner_id=owner)
+        ffmpeg_activity[owner] = time.monotonic()
+        await asyncio.gather(_read_progress(total), _read_stderr())
 
         rc = await process.wait()
         stderr_text = "\n".join(stderr_lines)
 
+        if rc != 0 and (rc < 0 or process_manager.was_killed(process)):
+            logger.info(f"FFmpeg for {task_id} was stopped (rc={rc})")
+            return False, f"{FFMPEG_CANCELLED}\n\n--- FFmpeg Output ---\n{stderr_text}"
+
         # यदि FFmpeg विफल होता है तो stderr की अंतिम 20 लाइनें लॉग करें
         if rc != 0:
             logger.warning(
@@ -243,7 +494,7 @@ async def run_ffmpeg_with_progress(command,
         if process:
             await process_manager.kill_process_async(task_id)
         # एरर के साथ stderr टेक्स्ट भी लौटाएँ
-        return False, f"Cancelled\n\n--- FFmpeg Output ---\n{stderr_text}"
+        return False, f"{FFMPEG_CANCELLED}\n\n--- FFmpeg Output ---\n{stderr_text}"
 
     except Exception as e:
         # यह सबसे महत्वपूर्ण फिक्स है:
@@ -266,22 +517,51 @@ async def run_ffmpeg_with_progress(command,
 # ======================================================
 
 
+# (path, mtime_ns, size) -> parsed info, so each file version is probed once
+_video_info_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_video_info_lock = threading.Lock()
+VIDEO_INFO_CACHE_SIZE = 256
+
+
 def get_video_info(file_path: str) -> Optional[Dict[str, Any]]:
-    """Get detailed info of video using ffprobe."""
+    """Get detailed info of video using ffprobe (memoized per file version)."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    with _video_info_lock:
+        info = _video_info_cache.get(key)
+        if info is not None:
+            _video_info_cache.move_to_end(key)
+            return dict(info)
+    info = _probe_video_info(file_path)
+    if info is not None:
+        with _video_info_lock:
+            _video_info_cache[key] = info
+            while len(_video_info_cache) > VIDEO_INFO_CACHE_SIZE:
+                _video_info_cache.popitem(last=False)
+        info = dict(info)
+    return info
+
+
+def _probe_video_info(file_path: str) -> Optional[Dict[str, Any]]:
+    """Run ffprobe and summarize the first video/audio streams."""
     try:
         if not os.path.exists(file_path):
             return None
         cmd = [
-            "ffprobe", "-v", "quiet", "-print_format", "json", "-show_format",
-            "-show_streams", file_path
+            FFPROBE_BIN, "-v", "quiet", "-print_format", "json",
+            "-show_format", "-show_streams", file_path
         ]
         result = subprocess.run(cmd,
+                                env=SUBPROCESS_ENV,
                                 stdout=subprocess.PIPE,
                                 stderr=subprocess.PIPE,
                                 timeout=30)
         if result.returncode != 0:
             return None
-        data = json.loads(result.stdout.decode("utf-8"))
+        data = json_loads(result.stdout)
         fmt = data.get("format", {})
         video, audio = None, None
         for s in data.get("streams", []):
@@ -313,9 +593,45 @@ def get_video_info(file_path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _copy_file_range(src: str, dst: str) -> bool:
+    """In-kernel copy (reflink on btrfs/xfs); False if unsupported here."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(),
+                                            min(remaining, 1 << 30))
+                if copied == 0:
+                    break
+                remaining -= copied
+        if remaining > 0:
+            return False
+        shutil.copystat(src, dst)
+        return True
+    except OSError:
+        return False
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """Hardlink src to dst, falling back to a copy across filesystems."""
+    try:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except OSError:
+        # copy2 already uses sendfile on Linux; copy_file_range avoids even
+        # that page-cache round trip and can share extents on CoW filesystems
+        if not _copy_file_range(src, dst):
+            shutil.copy2(src, dst)
+    return dst
+
+
 def cleanup_files(*paths):
     """Delete multiple files safely."""
     for path in paths:
+        _created_temp_dirs.discard(path)
         try:
             if path and os.path.exists(path):
                 if os.path.isfile(path):
@@ -351,10 +667,31 @@ def format_duration(seconds: float) -> str:
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
+# Task temp folders already created, so repeat lookups skip makedirs;
+# cleanup_files() forgets a folder once it is deleted.
+_created_temp_dirs = set()
+MAX_TRACKED_TEMP_DIRS = 4096
+
+
+def temp_dir_path(task_id: str) -> str:
+    """Return the temp folder path for a task without creating it."""
+    return os.path.join(config.DOWNLOAD_DIR, "TEMP", task_id)
+
+
+def get_temp_dir(task_id: str) -> str:
+    """Return (and create) the temp folder for a task."""
+    folder = temp_dir_path(task_id)
+    if folder not in _created_temp_dirs:
+        os.makedirs(folder, exist_ok=True)
+        if len(_created_temp_dirs) >= MAX_TRACKED_TEMP_DIRS:
+            _created_temp_dirs.clear()
+        _created_temp_dirs.add(folder)
+    return folder
+
+
 def get_temp_filename(task_id: str, ext: str) -> str:
     """Return unique temp filename per task."""
-    folder = os.path.join(config.DOWNLOAD_DIR, "TEMP", task_id)
-    os.makedirs(folder, exist_ok=True)
+    folder = get_temp_dir(task_id)
     if not ext.startswith("."):
         ext = "." + ext
     return os.path.join(folder, f"output_{uuid.uuid4().hex[:8]}{ext}")
@@ -388,6 +725,26 @@ def validate_video_file(path: str) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
+def escape_filter_arg(value: str) -> str:
+    """
+    Escape a value for a -vf option: first for the filter's key=value
+    parser, then for the filtergraph parser (ffmpeg-filters "Notes on
+    filtergraph escaping").
+    """
+    value = re.sub(r"([\\':])", r"\\\1", value)
+    return re.sub(r"([\\'\[\],;])", r"\\\1", value)
+
+
+def write_drawtext_file(text: str, path: str) -> str:
+    """
+    Write watermark text for drawtext's textfile= option and return the
+    escaped option fragment. Keeps user text out of the filtergraph.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return f"textfile={escape_filter_arg(path)}:expansion=none"
+
+
 def parse_time_input(t: str) -> Optional[float]:
     """Convert 00:00:00 / MM:SS / seconds → float seconds."""
     try:
@@ -436,9 +793,11 @@ def check_video_compatibility(
 # ======================================================
 
 __all__ = [
-    "process_manager", "ProcessManager", "FFmpegProgressParser",
-    "run_ffmpeg_with_progress", "get_video_info", "cleanup_files",
+    "json_loads", "process_manager", "ProcessManager", "FFmpegProgressParser",
+    "ffmpeg_slot", "FFMPEG_CANCELLED", "ffmpeg_cancelled", "ffmpeg_activity", "ffmpeg_queue_time", "queued_seconds", "run_ffmpeg_with_progress", "run_probe", "get_video_info", "link_or_copy",
+    "cleanup_files",
     "get_human_readable_size", "get_progress_bar", "format_duration",
-    "get_temp_filename", "is_valid_url", "validate_video_file",
-    "parse_time_input", "check_video_compatibility"
+    "temp_dir_path", "get_temp_dir", "get_temp_filename", "is_valid_url", "validate_video_file",
+    "escape_filter_arg", "write_drawtext_file", "parse_time_input",
+    "check_video_compatibility"
 ]
@@ -0,0 +1,97 @@
+# tests/test_ffmpeg_progress.py
+# ffmpeg progress parsing and the task watchdog; needs ffmpeg/ffprobe on PATH
+
+import asyncio
+import os
+import shutil
+import subprocess
+from functools import partial
+
+import pytest
+
+pytest.importorskip("pyrogram")
+pytestmark = pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+    reason="ffmpeg/ffprobe not installed")
+
+from config import config  # noqa: E402
+from modules import processor, utils  # noqa: E402
+import modules.ffmpeg_tools as ffmpeg_tools  # noqa: E402
+
+
+def _make_clip(path, seconds):
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-f", "lavfi", "-i",
+        f"testsrc=size=64x64:rate=10:duration={seconds}", "-c:v", "libx264",
+        "-y", path
+    ],
+                   check=True)
+
+
+@pytest.fixture
+def clips(tmp_path):
+    paths = [str(tmp_path / f"clip_{i}.mp4") for i in range(2)]
+    for path in paths:
+        _make_clip(path, 3)
+    return paths
+
+
+def test_concat_list_duration_is_summed(tmp_path, clips):
+    list_file = tmp_path / "list.txt"
+    list_file.write_text("".join(f"file '{p}'\n" for p in clips))
+    cmd = ["ffmpeg", "-f", "concat", "-safe", "0", "-i", str(list_file), "out.mp4"]
+    assert utils._input_duration(cmd) == pytest.approx(6.0, abs=0.5)
+
+
+def test_concat_merge_outlives_stall_window(tmp_path, clips, monkeypatch):
+    monkeypatch.setattr(config, "TASK_STALL_TIMEOUT_SEC", 1)
+    monkeypatch.setattr(config, "PROCESS_POLL_INTERVAL_S", 0.2)
+    monkeypatch.setattr(processor, "WATCHDOG_POLL_S", 0.2)
+    # -re reads at native rate, so the 6s merge spans several stall windows
+    real_run = ffmpeg_tools.run_ffmpeg_with_progress
+
+    async def realtime(cmd, *args, **kwargs):
+        return await real_run([cmd[0], "-re", *cmd[1:]], *args, **kwargs)
+
+    monkeypatch.setattr(ffmpeg_tools, "run_ffmpeg_with_progress", realtime)
+    # duration-less input: the heartbeat must not depend on a known total
+    monkeypatch.setattr(utils, "_input_duration", lambda command: None)
+
+    class _Status:
+
+        async def edit_text(self, text):
+            pass
+
+    task_id = "test_concat_stall"
+    cb = partial(processor._progress_callback, task_id, _Status(), 0, None)
+    output = str(tmp_path / "merged.mp4")
+    ok, err = asyncio.run(
+        processor._run_with_watchdog(
+            task_id,
+            ffmpeg_tools.merge_videos_simple(clips, output, task_id, 0, cb),
+            60))
+    assert ok, err
+    assert os.path.getsize(output) > 0
+
+
+def test_watchdog_counts_ffmpeg_output_as_activity(tmp_path, clips,
+                                                  monkeypatch):
+    monkeypatch.setattr(config, "TASK_STALL_TIMEOUT_SEC", 1)
+    monkeypatch.setattr(processor, "WATCHDOG_POLL_S", 0.2)
+    real_run = ffmpeg_tools.run_ffmpeg_with_progress
+
+    async def realtime(cmd, *args, **kwargs):
+        return await real_run([cmd[0], "-re", *cmd[1:]], *args, **kwargs)
+
+    monkeypatch.setattr(ffmpeg_tools, "run_ffmpeg_with_progress", realtime)
+
+    # no progress callback at all: only ffmpeg's own output keeps it alive
+    task_id = "test_ffmpeg_activity"
+    output = str(tmp_path / "merged.mp4")
+    ok, err = asyncio.run(
+        processor._run_with_watchdog(
+            task_id,
+            ffmpeg_tools.merge_videos_simple(clips, output, task_id, 0),
+            60))
+    assert ok, err
+    assert task_id not in utils.ffmpeg_activity
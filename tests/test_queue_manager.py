@@ -0,0 +1,26 @@
+# tests/test_queue_manager.py
+# Merge queue bounds
+
+import pytest
+
+pytest.importorskip("pyrogram")
+
+from modules.queue_manager import MAX_QUEUE_ITEMS, QueueManager  # noqa: E402
+
+
+def _file(n):
+    return {"filename": f"clip_{n}.mp4", "file_size": 1024}
+
+
+def test_full_queue_refuses_new_files():
+    qm = QueueManager()
+    for n in range(1, MAX_QUEUE_ITEMS + 1):
+        assert qm.add_to_queue(7, _file(n)) == n
+
+    assert qm.add_to_queue(7, _file(MAX_QUEUE_ITEMS + 1)) is None
+
+    queue = qm.get_queue(7)
+    assert len(queue) == MAX_QUEUE_ITEMS
+    assert queue[0]["filename"] == "clip_1.mp4"
+    assert queue[-1]["filename"] == f"clip_{MAX_QUEUE_ITEMS}.mp4"
+    assert queue[0]["_line"].startswith("1. clip_1.mp4")